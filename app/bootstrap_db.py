@@ -10,8 +10,22 @@ def run_sql_file(path: str):
             conn.execute(text(stmt))
 
 
-if __name__ == "__main__":
+def main():
+    from .partitions import EMBEDDINGS, ensure_partitions, ensure_search_chunks_fk, is_partitioned
+
     run_sql_file("schema.sql")
     if Path("seed.sql").exists():
         run_sql_file("seed.sql")
+    created = ensure_partitions()
+    if created:
+        print(f"partitions created: {', '.join(created)}")
+    with engine.begin() as conn:
+        if ensure_search_chunks_fk(conn):
+            print("search_chunks -> embeddings foreign key created")
+        if not is_partitioned(conn, EMBEDDINGS):
+            print("embeddings is not partitioned yet: run `uv run partitions migrate`")
     print("DB bootstrap done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# app/cache.py
+"""
+요청 합치기(single-flight) + 짧은 응답 캐시 + 코퍼스 세대(generation) 카운터.
+
+    payload = SEARCH_FLIGHT.do(key, lambda: run_search(...))   # 동시에 같은 key면 1회만 실행
+    SEARCH_CACHE.set(key, payload)                             # 현재 세대로 저장
+    SEARCH_CACHE.get(key)                                      # 세대가 바뀌었거나 TTL 지나면 None
+
+- 라우터는 동기 함수(스레드풀)라 threading 기반이다.
+- 세대는 이 프로세스에서 commit/upload가 끝날 때마다 bump_generation()으로 올린다.
+  다른 워커/오프라인 작업(centroids, dedupe-cluster)의 변경은 TTL 만큼만 늦게 반영된다.
+- 질의 임베딩(EMBED_CACHE)은 코퍼스와 무관하므로 세대를 보지 않고 TTL/LRU로만 만료된다.
+  float32 array로 보관하고(list[float]의 약 1/8) 개수와 총 바이트(QUERY_EMBEDDING_CACHE_MAX_MB) 중 작은 쪽으로 자른다.
+"""
+from __future__ import annotations
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .metrics import CACHE_HITS, CACHE_MISSES, SINGLEFLIGHT_SHARED
+from .settings import settings
+
+__all__ = [
+    "SingleFlight",
+    "TTLCache",
+    "VectorCache",
+    "generation",
+    "bump_generation",
+    "EMBED_FLIGHT",
+    "SEARCH_FLIGHT",
+    "SEARCH_CACHE",
+    "EMBED_CACHE",
+]
+
+# ---------- 코퍼스 세대 ----------
+_generation = 0
+_gen_lock = threading.Lock()
+
+
+def generation() -> int:
+    return _generation
+
+
+def bump_generation() -> int:
+    """코퍼스가 바뀌었음을 알린다 (이전 세대 캐시 항목은 더 이상 적중하지 않음)."""
+    global _generation
+    with _gen_lock:
+        _generation += 1
+        return _generation
+
+
+# ---------- single-flight ----------
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """같은 key로 동시에 들어온 호출은 먼저 온 1건의 결과(또는 예외)를 함께 받는다."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            SINGLEFLIGHT_SHARED.inc(flight=self.name)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+# ---------- 응답 캐시 ----------
+class TTLCache:
+    """세대 + TTL로 무효화되는 LRU 캐시 (generational=False면 TTL만)."""
+
+    def __init__(
+        self, name: str, ttl: float, max_entries: int, generational: bool = True
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.generational = generational
+        self._items: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            item = self._items.get(key)
+            if (
+                item is None
+                or item[0] < time.monotonic()
+                or (self.generational and item[1] != _generation)
+            ):
+                if item is not None:
+                    del self._items[key]
+                CACHE_MISSES.inc(cache=self.name)
+                return None
+            self._items.move_to_end(key)
+        CACHE_HITS.inc(cache=self.name)
+        return item[2]
+
+    def set(self, key: Hashable, value: Any, gen: Optional[int] = None) -> None:
+        """gen: 값을 계산하기 시작한 시점의 세대 (계산 중 commit이 있었으면 바로 무효)."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._items[key] = (
+                time.monotonic() + self.ttl,
+                _generation if gen is None else gen,
+                value,
+            )
+            self._items.move_to_end(key)
+            limit = self._limit(value)
+            while len(self._items) > limit:
+                self._items.popitem(last=False)
+
+    def _limit(self, value: Any) -> int:
+        return self.max_entries
+
+
+class VectorCache(TTLCache):
+    """벡터 전용 TTL/LRU 캐시 (세대 없음). float32 array로 보관하고 총 바이트로도 자른다."""
+
+    def __init__(self, name: str, ttl: float, max_entries: int, max_bytes: int) -> None:
+        super().__init__(name, ttl, max_entries, generational=False)
+        self.max_bytes = max_bytes
+
+    def set(self, key: Hashable, value: Any, gen: Optional[int] = None) -> None:
+        # pgvector도 float32로 저장하므로 정밀도 손실 없음
+        super().set(key, array("f", value), gen)
+
+    def _limit(self, value: Any) -> int:
+        return min(self.max_entries, self.max_bytes // max(1, len(value) * value.itemsize))
+
+
+EMBED_FLIGHT = SingleFlight("query_embedding")
+SEARCH_FLIGHT = SingleFlight("search")
+SEARCH_CACHE = TTLCache(
+    "search_response", settings.search_cache_ttl_seconds, settings.search_cache_max_entries
+)
+EMBED_CACHE = VectorCache(
+    "query_embedding",
+    settings.query_embedding_cache_ttl_seconds,
+    settings.query_embedding_cache_max_entries,
+    int(settings.query_embedding_cache_max_mb * 1024 * 1024),
+)
@@ -0,0 +1,106 @@
+# app/centroids.py
+"""
+문항 단위 대표 벡터(centroid) 관리.
+
+question_embeddings 에 문항별로 청크 벡터 평균(L2 정규화) 1개를 둔다.
+  - 커밋/업로드 시 바뀐 문항만 refresh_question_centroids()로 증분 갱신
+  - 기존 데이터/누락분은 백필:  uv run centroids [--batch 1000] [--model ...]
+
+두 단계 검색(search mode="two_stage")의 1단계 후보 탐색에 쓰인다.
+"""
+from __future__ import annotations
+import argparse
+import time
+from typing import Dict, Iterable, Optional
+
+from .db import engine, sql
+from .settings import settings
+
+__all__ = ["refresh_question_centroids", "backfill_question_centroids"]
+
+_UPSERT_SQL = """
+    INSERT INTO question_embeddings (question_id, model, embedding, chunks, updated_at, tenant_id)
+    SELECT question_id, model, l2_normalize(AVG(embedding)), COUNT(*), now(), MAX(tenant_id)
+    FROM embeddings
+    WHERE question_id = ANY(:qids) AND model = :model
+    GROUP BY question_id, model
+    ON CONFLICT (question_id, model) DO UPDATE
+    SET embedding = EXCLUDED.embedding,
+        chunks = EXCLUDED.chunks,
+        updated_at = EXCLUDED.updated_at,
+        tenant_id = EXCLUDED.tenant_id
+"""
+
+# 청크가 모두 사라진 문항의 centroid 정리 (문항 삭제는 CASCADE)
+_PRUNE_SQL = """
+    DELETE FROM question_embeddings qe
+    WHERE qe.question_id = ANY(:qids) AND qe.model = :model
+      AND NOT EXISTS (
+          SELECT 1 FROM embeddings e
+          WHERE e.question_id = qe.question_id AND e.model = qe.model
+      )
+"""
+
+
+def refresh_question_centroids(
+    conn, question_ids: Iterable[int], model: Optional[str] = None
+) -> int:
+    """주어진 문항들의 centroid를 embeddings에서 다시 계산. 갱신된 행 수를 반환."""
+    qids = sorted(set(question_ids))
+    if not qids:
+        return 0
+    params = {"qids": qids, "model": model or settings.embedding_model}
+    n = conn.execute(sql(_UPSERT_SQL), params).rowcount
+    conn.execute(sql(_PRUNE_SQL), params)
+    return n
+
+
+def backfill_question_centroids(
+    model: Optional[str] = None, batch: int = 1000, only_missing: bool = True
+) -> Dict[str, float]:
+    """question_id 순서로 batch개씩 centroid 계산 (배치마다 커밋)."""
+    model = model or settings.embedding_model
+    missing = (
+        """
+          AND NOT EXISTS (
+              SELECT 1 FROM question_embeddings qe
+              WHERE qe.question_id = e.question_id AND qe.model = e.model
+          )
+        """
+        if only_missing
+        else ""
+    )
+    next_qids_sql = f"""
+        SELECT DISTINCT e.question_id FROM embeddings e
+        WHERE e.model = :model AND e.question_id > :after
+        {missing}
+        ORDER BY e.question_id
+        LIMIT :n
+    """
+    t0 = time.perf_counter()
+    done = 0
+    after = 0
+    while True:
+        with engine.begin() as conn:
+            qids = conn.execute(
+                sql(next_qids_sql), {"model": model, "after": after, "n": batch}
+            ).scalars().all()
+            if not qids:
+                break
+            done += refresh_question_centroids(conn, qids, model)
+        after = qids[-1]
+        print(f"  {done} questions", flush=True)
+    return {"questions": done, "seconds": round(time.perf_counter() - t0, 2)}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="문항 centroid 백필 (question_embeddings)")
+    ap.add_argument("--model", default=None, help="기본: EMBEDDING_MODEL")
+    ap.add_argument("--batch", type=int, default=1000, help="트랜잭션당 문항 수")
+    ap.add_argument("--all", action="store_true", help="이미 있는 centroid도 다시 계산")
+    args = ap.parse_args()
+    print(backfill_question_centroids(args.model, args.batch, only_missing=not args.all))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,92 @@
 # app/cli.py
 import sys
 import subprocess
-import uvicorn
+
+# 모듈 import는 각 명령 안에서 (짧은 CLI가 uvicorn/openai import 비용을 내지 않게)
 
 
 def api():
+    # 개발용 (reload). 운영은 serve
+    import uvicorn
+
     uvicorn.run("app.main:app", reload=True, host="127.0.0.1", port=8000)
 
 
+def serve():
+    # 운영용: 멀티 워커, uvloop/httptools, reload 없음 (인자는 app.server 참고)
+    from app.server import main
+
+    main()
+
+
 def db():
-    # import 시 실행되게 되어 있으면 이걸로 충분
-    import app.bootstrap_db  # noqa: F401
+    # schema.sql + seed.sql 적용 후 설정 모델 파티션 생성
+    from app.bootstrap_db import main
+
+    main()
+
+
+def centroids():
+    # 문항 centroid 백필 (인자는 app.centroids 참고)
+    from app.centroids import main
+
+    main()
+
+
+def minhash():
+    # 근사 중복 색인 백필 (인자는 app.near_dup 참고)
+    from app.near_dup import main
+
+    main()
+
+
+def dedupe_cluster():
+    # 의미 중복 클러스터링 (인자는 app.dedupe_cluster 참고)
+    from app.dedupe_cluster import main
+
+    main()
+
+
+def search_chunks():
+    # 검색 read model 백필 (인자는 app.read_model 참고)
+    from app.read_model import main
+
+    main()
+
+
+def partitions():
+    # 파티션 생성/온라인 전환/이전 모델 삭제 (인자는 app.partitions 참고)
+    from app.partitions import main
+
+    main()
+
+
+def tenants():
+    # 테넌트 생성/한도/전용 인덱스 (인자는 app.tenants 참고)
+    from app.tenants import main
+
+    main()
+
+
+def usage():
+    # OpenAI 사용량 요약 / 임베딩 비용·시간 예측 (인자는 app.usage 참고)
+    from app.usage import main
+
+    main()
+
+
+def export():
+    # 코퍼스 내보내기 (인자는 app.export 참고)
+    from app.export import main
+
+    main()
+
+
+def profile_startup():
+    # import 시간 프로파일 (인자는 app.startup_profile 참고)
+    from app.startup_profile import main
+
+    main()
 
 
 def ui():
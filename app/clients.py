@@ -0,0 +1,66 @@
+# app/clients.py
+"""
+공유 외부 클라이언트 (지연 생성, 프로세스당 1개).
+
+    def search(req, client=Depends(get_openai)): ...   # 라우터 (DI)
+    get_openai().embeddings.create(...)                 # 라우터 밖
+
+- openai SDK는 import만으로 수백 ms가 걸려 첫 사용 시점에 import + 생성한다.
+  /healthz, /metrics 와 짧은 CLI(centroids, minhash, export …)는 이 비용을 내지 않는다.
+- 모든 라우터가 같은 클라이언트(= 같은 HTTP 커넥션 풀)를 쓴다.
+- 테스트/벤치에서는 app.dependency_overrides[get_openai] 로 교체한다.
+- get_async_openai(): 이벤트 루프에서 직접 await하는 경로(/search/live)용.
+  태스크를 취소하면 진행 중인 HTTP 요청도 끊긴다.
+"""
+from __future__ import annotations
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from .settings import settings
+
+if TYPE_CHECKING:  # pragma: no cover
+    from openai import AsyncOpenAI, OpenAI
+
+__all__ = ["get_openai", "get_async_openai", "close_clients"]
+
+_openai: Optional["OpenAI"] = None
+_async_openai: Optional["AsyncOpenAI"] = None
+_lock = threading.Lock()
+
+
+def get_openai() -> "OpenAI":
+    global _openai
+    if _openai is None:
+        with _lock:
+            if _openai is None:
+                from openai import OpenAI
+
+                _openai = OpenAI(
+                    api_key=settings.openai_api_key, base_url=settings.openai_base_url
+                )
+    return _openai
+
+
+def get_async_openai() -> "AsyncOpenAI":
+    global _async_openai
+    if _async_openai is None:
+        with _lock:
+            if _async_openai is None:
+                from openai import AsyncOpenAI
+
+                _async_openai = AsyncOpenAI(
+                    api_key=settings.openai_api_key, base_url=settings.openai_base_url
+                )
+    return _async_openai
+
+
+async def close_clients() -> None:
+    """워커 종료 시 커넥션 풀 정리."""
+    global _openai, _async_openai
+    with _lock:
+        sync_client, async_client = _openai, _async_openai
+        _openai = _async_openai = None
+    if sync_client is not None:
+        sync_client.close()
+    if async_client is not None:
+        await async_client.close()
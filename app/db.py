@@ -1,7 +1,234 @@
-from sqlalchemy import create_engine
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Any, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
+from sqlalchemy.sql.elements import TextClause
 
 from .settings import settings
+from .tracing import install_db_hooks
+
+
+# ---------- 커넥션 풀 ----------
+class _PoolStats:
+    """풀 대기 시간 누적 (checkout 시 커넥션을 얻기까지 걸린 시간)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+pool_stats = _PoolStats()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool + checkout 대기 시간 측정."""
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            pool_stats.record(time.perf_counter() - t0, timed_out=True)
+            raise
+        pool_stats.record(time.perf_counter() - t0)
+        return conn
+
+
+def _pool_size() -> int:
+    # 명시값이 없으면 DB 커넥션 예산을 워커 수로 나눠 워커당 풀 크기 결정
+    if settings.db_pool_size is not None:
+        return settings.db_pool_size
+    return max(2, settings.db_max_connections // max(1, settings.web_concurrency))
+
+
+def _engine_kwargs() -> dict:
+    kwargs: dict = {
+        "future": True,
+        "query_cache_size": settings.db_statement_cache_size,
+    }
+    if settings.db_pgbouncer:
+        # PgBouncer(transaction pooling)가 풀링을 담당 → 앱 쪽 풀/세션 상태 없음
+        kwargs["poolclass"] = NullPool
+        return kwargs
+    kwargs.update(
+        poolclass=TimedQueuePool,
+        pool_size=_pool_size(),
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    return kwargs
+
+
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+SessionLocal = sessionmaker(autoflush=False, autocommit=False, future=True)  # 엔진 생성 시 bind
+
+
+def get_engine() -> Engine:
+    """
+    엔진은 첫 사용 시 만든다 (get_openai와 같은 방식). import만 하는 경로
+    (CLI --help, 앱 import, 오프라인 스크립트)는 드라이버 로드/풀 구성 비용을 내지 않는다.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                eng = create_engine(settings.database_url, **_engine_kwargs())
+                install_db_hooks(eng)
+                SessionLocal.configure(bind=eng)
+                _engine = eng
+    return _engine
+
+
+class _LazyEngine:
+    """`from .db import engine` 호환용: 속성 접근(engine.begin() 등) 시 get_engine()에 위임."""
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_engine(), name)
+
+    def __repr__(self) -> str:
+        return repr(get_engine()) if _engine is not None else "<engine (not created)>"
+
+
+engine = _LazyEngine()
+
+
+def pool_metrics() -> dict:
+    """풀 사용률/대기 시간 스냅샷 (healthz, /metrics 용)."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    size = pool.size()
+    checked_out = pool.checkedout()
+    capacity = size + max(0, pool._max_overflow)
+    return {
+        "pool": type(pool).__name__,
+        "size": size,
+        "max_overflow": pool._max_overflow,
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "utilization": round(checked_out / capacity, 4) if capacity else 0.0,
+        "checkouts": pool_stats.checkouts,
+        "timeouts": pool_stats.timeouts,
+        "wait_seconds_total": round(pool_stats.wait_seconds_total, 6),
+        "wait_seconds_max": round(pool_stats.wait_seconds_max, 6),
+    }
+
+
+# ---------- SQL 문 캐시 ----------
+@lru_cache(maxsize=512)
+def sql(stmt: str) -> TextClause:
+    """
+    text() 캐시. 같은 SQL 문자열이면 같은 TextClause를 재사용해
+    매 요청마다 바인드 파라미터 파싱을 반복하지 않고,
+    SQLAlchemy 컴파일 캐시(query_cache_size)도 그대로 적중시킨다.
+    """
+    return text(stmt)
+
+
+# ---------- 취소 가능한 쿼리 ----------
+class QueryCancelled(Exception):
+    """CancellableQuery.cancel()로 중단됨."""
+
+
+_cancel_engine: Optional[Engine] = None
+
+
+def _get_cancel_engine() -> Engine:
+    """
+    취소 신호 전용 엔진 (NullPool). 풀이 고갈된 상황에서도 취소가 풀 대기에
+    막히지 않도록 요청마다 새 커넥션을 연다.
+    """
+    global _cancel_engine
+    if _cancel_engine is None:
+        with _engine_lock:
+            if _cancel_engine is None:
+                _cancel_engine = create_engine(
+                    settings.database_url, future=True, poolclass=NullPool
+                )
+    return _cancel_engine
+
+
+class CancellableQuery:
+    """
+    다른 스레드에서 중단할 수 있는 1회성 조회.
+
+        q = CancellableQuery(timeout_ms=3000)
+        rows = q.run(stmt, params)   # 워커 스레드 (취소되면 QueryCancelled)
+        q.cancel()                   # 다른 스레드: 실행 중이면 pg_cancel_backend
+
+    - 실행 전에 취소되면 쿼리를 보내지 않는다.
+    - cancel()은 락 밖에서, 풀이 아닌 별도 커넥션으로 신호를 보낸다
+      (락을 쥔 채 풀을 기다리면 run()의 finally와 교착).
+    - 실행 중에는 SET LOCAL application_name으로 백엔드에 표식을 달고, 취소는 그 표식이
+      붙은 active 백엔드에만 보낸다. 그 사이 커넥션이 풀로 반납되면 표식이 트랜잭션과
+      함께 사라지므로 다른 요청의 쿼리를 취소하지 않는다.
+    - SET LOCAL statement_timeout은 신호가 유실돼도 남는 상한.
+    """
+
+    def __init__(self, timeout_ms: int) -> None:
+        self.timeout_ms = int(timeout_ms)
+        self._tag = f"cq-{uuid.uuid4().hex}"
+        self._pid: int | None = None
+        self._cancelled = False
+        self._lock = threading.Lock()
+
+    def run(self, stmt: TextClause, params: dict) -> list:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {self.timeout_ms}")
+            conn.exec_driver_sql(f"SET LOCAL application_name = '{self._tag}'")
+            pid = conn.exec_driver_sql("SELECT pg_backend_pid()").scalar()
+            with self._lock:
+                if self._cancelled:
+                    raise QueryCancelled()
+                self._pid = pid
+            try:
+                return conn.execute(stmt, params).mappings().all()
+            except DBAPIError as e:
+                if self._cancelled:
+                    raise QueryCancelled() from e
+                raise
+            finally:
+                with self._lock:
+                    self._pid = None
 
-engine = create_engine(settings.database_url, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    def cancel(self) -> bool:
+        """실행 중인 쿼리에 취소 신호를 보냈으면 True."""
+        with self._lock:
+            self._cancelled = True
+            pid = self._pid
+        if pid is None:
+            return False
+        with _get_cancel_engine().connect() as conn:
+            sent = conn.execute(
+                sql(
+                    "SELECT pg_cancel_backend(pid) FROM pg_stat_activity "
+                    "WHERE pid = :pid AND application_name = :tag AND state = 'active'"
+                ),
+                {"pid": pid, "tag": self._tag},
+            ).scalar()
+        return bool(sent)
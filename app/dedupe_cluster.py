@@ -0,0 +1,182 @@
+# app/dedupe_cluster.py
+"""
+의미 중복 클러스터링 (오프라인 배치).
+
+    uv run dedupe-cluster [--threshold 0.08] [--neighbors 10] [--batch 500]
+
+문항 centroid(question_embeddings)에 대해
+  1) batch개 문항씩 ANN 이웃 k개를 SQL(LATERAL)로 조회 → 코사인 거리 threshold 이하만 간선
+  2) 간선을 union-find로 합쳐 연결 요소 = 클러스터 (벡터는 파이썬으로 가져오지 않는다)
+  3) 클러스터 centroid에 가장 가까운 문항을 대표로 기록
+결과는 question_clusters / question_cluster_members 를 한 트랜잭션에서 교체한다.
+크기 1(중복 없음) 문항은 기록하지 않으며, /search 의 collapse는 이를 단독 클러스터로 취급한다.
+"""
+from __future__ import annotations
+import argparse
+import time
+from typing import Dict, List, Optional
+
+from .db import engine, sql
+from .settings import settings
+
+__all__ = ["build_clusters"]
+
+_NEIGHBORS_SQL = """
+    SELECT s.question_id, n.question_id
+    FROM question_embeddings s
+    CROSS JOIN LATERAL (
+        SELECT qe.question_id, qe.embedding <=> s.embedding AS dist
+        FROM question_embeddings qe
+        WHERE qe.model = :model AND qe.question_id <> s.question_id
+        ORDER BY qe.embedding <=> s.embedding
+        LIMIT :k
+    ) n
+    WHERE s.model = :model AND s.question_id = ANY(:qids) AND n.dist <= :thr
+"""
+
+# 클러스터 centroid와의 거리 → 대표 문항(가장 가까운 문항)
+_REPRESENTATIVE_SQL = [
+    """
+    WITH c AS (
+        SELECT m.cluster_id, l2_normalize(AVG(qe.embedding)) AS cvec
+        FROM question_cluster_members m
+        JOIN question_embeddings qe ON qe.question_id = m.question_id AND qe.model = :model
+        GROUP BY m.cluster_id
+    )
+    UPDATE question_cluster_members m
+    SET distance = qe.embedding <=> c.cvec
+    FROM c, question_embeddings qe
+    WHERE m.cluster_id = c.cluster_id
+      AND qe.question_id = m.question_id AND qe.model = :model
+    """,
+    """
+    UPDATE question_clusters k
+    SET representative_id = (
+        SELECT m.question_id FROM question_cluster_members m
+        WHERE m.cluster_id = k.id
+        ORDER BY m.distance, m.question_id
+        LIMIT 1
+    )
+    """,
+]
+
+
+class _UnionFind:
+    def __init__(self) -> None:
+        self.parent: Dict[int, int] = {}
+
+    def find(self, x: int) -> int:
+        root = x
+        while self.parent.get(root, root) != root:
+            root = self.parent[root]
+        while x != root:  # 경로 압축
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # 작은 id를 루트로 → 클러스터 id = 최소 question_id (재실행해도 안정적)
+            self.parent[max(ra, rb)] = min(ra, rb)
+            self.parent.setdefault(min(ra, rb), min(ra, rb))
+
+
+def build_clusters(
+    threshold: float = 0.08,
+    neighbors: int = 10,
+    batch: int = 500,
+    model: Optional[str] = None,
+) -> Dict[str, float]:
+    """클러스터 재계산 후 테이블 교체. 통계를 반환."""
+    model = model or settings.embedding_model
+    t0 = time.perf_counter()
+    uf = _UnionFind()
+    scanned = edges = 0
+    after = 0
+    with engine.connect() as conn:
+        while True:
+            qids = conn.execute(
+                sql(
+                    """
+                    SELECT question_id FROM question_embeddings
+                    WHERE model = :model AND question_id > :after
+                    ORDER BY question_id
+                    LIMIT :n
+                """
+                ),
+                {"model": model, "after": after, "n": batch},
+            ).scalars().all()
+            if not qids:
+                break
+            for a, b in conn.execute(
+                sql(_NEIGHBORS_SQL),
+                {"qids": qids, "model": model, "k": neighbors, "thr": threshold},
+            ):
+                uf.union(a, b)
+                edges += 1
+            scanned += len(qids)
+            after = qids[-1]
+            print(f"  {scanned} questions, {edges} edges", flush=True)
+
+    members: Dict[int, List[int]] = {}
+    for qid in list(uf.parent):
+        members.setdefault(uf.find(qid), []).append(qid)
+    clusters = {cid: qs for cid, qs in members.items() if len(qs) > 1}
+
+    with engine.begin() as conn:
+        conn.execute(sql("DELETE FROM question_clusters"))  # members는 CASCADE
+        if clusters:
+            conn.execute(
+                sql(
+                    """
+                    INSERT INTO question_clusters (id, model, size, threshold)
+                    SELECT id, :model, size, :thr
+                    FROM unnest(CAST(:ids AS int[]), CAST(:sizes AS int[])) AS t(id, size)
+                """
+                ),
+                {
+                    "ids": list(clusters),
+                    "sizes": [len(qs) for qs in clusters.values()],
+                    "model": model,
+                    "thr": threshold,
+                },
+            )
+            conn.execute(
+                sql(
+                    """
+                    INSERT INTO question_cluster_members (question_id, cluster_id)
+                    SELECT * FROM unnest(CAST(:qids AS int[]), CAST(:cids AS int[]))
+                """
+                ),
+                {
+                    "qids": [q for qs in clusters.values() for q in qs],
+                    "cids": [cid for cid, qs in clusters.items() for _ in qs],
+                },
+            )
+            for stmt in _REPRESENTATIVE_SQL:
+                conn.execute(sql(stmt), {"model": model})
+
+    clustered = sum(len(qs) for qs in clusters.values())
+    return {
+        "questions": scanned,
+        "edges": edges,
+        "clusters": len(clusters),
+        "clustered_questions": clustered,
+        "redundant_questions": clustered - len(clusters),  # 대표 외 구성원 수
+        "largest_cluster": max((len(qs) for qs in clusters.values()), default=0),
+        "seconds": round(time.perf_counter() - t0, 2),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="문항 의미 중복 클러스터링")
+    ap.add_argument("--threshold", type=float, default=0.08, help="코사인 거리 상한 (유사도 0.92)")
+    ap.add_argument("--neighbors", type=int, default=10, help="문항당 ANN 이웃 수")
+    ap.add_argument("--batch", type=int, default=500, help="조회당 문항 수")
+    ap.add_argument("--model", default=None, help="기본: EMBEDDING_MODEL")
+    args = ap.parse_args()
+    print(build_clusters(args.threshold, args.neighbors, args.batch, args.model))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+# app/export.py
+"""
+코퍼스 내보내기 (NDJSON / Parquet 스트리밍).
+
+    uv run export --kind chunks --format parquet --vectors -o corpus.parquet
+    GET /export?kind=chunks&format=ndjson&vectors=true
+
+- API는 요청 테넌트(X-Tenant)의 데이터만, CLI는 --tenant가 없으면 전체를 내보낸다.
+
+- 서버 측 커서(psycopg2 named cursor, stream_results + yield_per)로 batch 행씩만 읽는다.
+- batch마다 바로 내보내므로 (NDJSON은 줄 묶음, Parquet은 row group 하나)
+  코퍼스 크기와 무관하게 메모리는 batch 크기만큼만 쓴다.
+- 벡터(pgvector 텍스트 "[0.1,...]")는 JSON 배열과 같은 형식이라 NDJSON에는 파싱 없이 그대로 붙인다.
+- Parquet은 pyarrow(선택 의존성)가 필요하다.
+- 스트리밍 동안 커넥션 1개를 점유하므로 대량 내보내기는 CLI 사용을 권장.
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+
+from .db import engine, sql
+from .responses import encode
+from .settings import settings
+
+__all__ = ["KINDS", "FORMATS", "iter_rows", "iter_ndjson", "iter_parquet", "export_stream"]
+
+KINDS = ("questions", "chunks")
+FORMATS = ("ndjson", "parquet")
+NDJSON = "application/x-ndjson"
+PARQUET = "application/vnd.apache.parquet"
+
+# 필터는 "NULL이면 통과" 형태 → 조합과 무관하게 문장 하나 (문장 캐시 재사용)
+_FILTERS = """
+      AND (CAST(:tenant AS int) IS NULL OR q.tenant_id = :tenant)
+      AND (CAST(:company AS text) IS NULL OR c.name ILIKE :company)
+      AND (CAST(:job AS text) IS NULL OR j.name ILIKE :job)
+      AND (CAST(:ymin AS int) IS NULL OR q.year >= :ymin)
+      AND (CAST(:ymax AS int) IS NULL OR q.year <= :ymax)
+"""
+
+_QUESTIONS_SQL = f"""
+    SELECT
+        q.id AS question_id, q.title, q.content, c.name AS company, j.name AS job,
+        q.year, q.document_id, CAST(q.created_at AS text) AS created_at
+    FROM questions q
+    LEFT JOIN companies c ON c.id = q.company_id
+    LEFT JOIN jobs j ON j.id = q.job_id
+    WHERE TRUE
+    {_FILTERS}
+    ORDER BY q.id
+"""
+
+_CHUNKS_SQL = f"""
+    SELECT
+        e.question_id, e.chunk_id, e.chunk_text, e.chunk_hash, e.model,
+        q.title, c.name AS company, j.name AS job, q.year
+        {{vector_col}}
+    FROM embeddings e
+    JOIN questions q ON q.id = e.question_id
+    LEFT JOIN companies c ON c.id = q.company_id
+    LEFT JOIN jobs j ON j.id = q.job_id
+    WHERE e.model = :model
+    {_FILTERS}
+    ORDER BY e.question_id, e.chunk_id
+"""
+
+
+def _query(kind: str, vectors: bool) -> str:
+    if kind == "questions":
+        return _QUESTIONS_SQL
+    return _CHUNKS_SQL.format(
+        vector_col=", CAST(e.embedding AS text) AS embedding" if vectors else ""
+    )
+
+
+def iter_rows(
+    kind: str = "chunks",
+    vectors: bool = False,
+    company: Optional[str] = None,
+    job: Optional[str] = None,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    tenant_id: Optional[int] = None,
+    batch: int = 1000,
+) -> Iterator[List[Dict[str, Any]]]:
+    """서버 측 커서로 batch 행씩 dict 목록을 yield (벡터는 텍스트 그대로). tenant_id=None이면 전체."""
+    params = {
+        "tenant": tenant_id,
+        "company": f"%{company}%" if company else None,
+        "job": f"%{job}%" if job else None,
+        "ymin": year_min,
+        "ymax": year_max,
+        "model": settings.embedding_model,
+    }
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch).execute(
+            sql(_query(kind, vectors)), params
+        )
+        for part in result.mappings().partitions():
+            yield [dict(r) for r in part]
+
+
+def iter_ndjson(batches: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    for rows in batches:
+        lines = []
+        for row in rows:
+            vec = row.pop("embedding", None)
+            line = encode(row)
+            if vec is not None:
+                line = line[:-1] + b',"embedding":' + vec.encode("ascii") + b"}"
+            lines.append(line)
+        yield b"\n".join(lines) + b"\n"
+
+
+class _Drain:
+    """ParquetWriter 출력 버퍼. row group이 써질 때마다 비워서 내보낸다."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self.parts: List[bytes] = []
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        out, self.parts = b"".join(self.parts), []
+        return out
+
+
+def _arrow_schema(kind: str, vectors: bool):
+    import pyarrow as pa
+
+    if kind == "questions":
+        fields = [
+            ("question_id", pa.int32()),
+            ("title", pa.string()),
+            ("content", pa.string()),
+            ("company", pa.string()),
+            ("job", pa.string()),
+            ("year", pa.int32()),
+            ("document_id", pa.int32()),
+            ("created_at", pa.string()),
+        ]
+    else:
+        fields = [
+            ("question_id", pa.int32()),
+            ("chunk_id", pa.int32()),
+            ("chunk_text", pa.string()),
+            ("chunk_hash", pa.string()),
+            ("model", pa.string()),
+            ("title", pa.string()),
+            ("company", pa.string()),
+            ("job", pa.string()),
+            ("year", pa.int32()),
+        ]
+        if vectors:
+            fields.append(("embedding", pa.list_(pa.float32())))
+    return pa.schema(fields)
+
+
+def iter_parquet(batches: Iterator[List[Dict[str, Any]]], schema) -> Iterator[bytes]:
+    """batch마다 row group 1개. 결과가 0행이어도 유효한 (빈) Parquet 파일이 나온다."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _Drain()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for rows in batches:
+            for row in rows:
+                if row.get("embedding") is not None:
+                    row["embedding"] = json.loads(row["embedding"])
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+def export_stream(fmt: str, **kwargs: Any) -> Iterator[bytes]:
+    batches = iter_rows(**kwargs)
+    if fmt == "parquet":
+        schema = _arrow_schema(kwargs.get("kind", "chunks"), kwargs.get("vectors", False))
+        return iter_parquet(batches, schema)
+    return iter_ndjson(batches)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="코퍼스 내보내기 (NDJSON/Parquet)")
+    ap.add_argument("--kind", choices=KINDS, default="chunks")
+    ap.add_argument("--format", choices=FORMATS, default="ndjson")
+    ap.add_argument("--vectors", action="store_true", help="chunks: 임베딩 벡터 포함")
+    ap.add_argument("--company")
+    ap.add_argument("--job")
+    ap.add_argument("--year-min", type=int)
+    ap.add_argument("--year-max", type=int)
+    ap.add_argument("--tenant", help="테넌트 slug (기본: 전체)")
+    ap.add_argument("--batch", type=int, default=1000, help="커서 fetch 단위 (= Parquet row group)")
+    ap.add_argument("-o", "--out", default="-", help="출력 파일 (기본: stdout)")
+    args = ap.parse_args()
+
+    tenant_id = None
+    if args.tenant:
+        from .tenants import TENANTS
+
+        tenant = TENANTS.get(args.tenant)
+        if tenant is None:
+            raise SystemExit(f"unknown tenant: {args.tenant}")
+        tenant_id = tenant.id
+
+    stream = export_stream(
+        args.format,
+        kind=args.kind,
+        vectors=args.vectors,
+        company=args.company,
+        job=args.job,
+        year_min=args.year_min,
+        year_max=args.year_max,
+        tenant_id=tenant_id,
+        batch=args.batch,
+    )
+    out = sys.stdout.buffer if args.out == "-" else open(args.out, "wb")
+    try:
+        for data in stream:
+            out.write(data)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
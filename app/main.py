@@ -1,9 +1,36 @@
-from fastapi import FastAPI
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from .metrics import HTTP_SECONDS
+from .tracing import start_trace
 from .settings import settings
-from .routers import health, upload, search, draft, upload_md
+from .routers import health, upload, search, search_live, draft, upload_md, metrics, export, usage
+
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # 워커별 초기화/정리 (uv run serve는 워커마다 이 앱을 새로 import)
+    if settings.server_warmup:
+        from .server import warm_worker
+
+        await run_in_threadpool(warm_worker)
+    yield
+    from .clients import close_clients
+    from .db import engine
+    from .usage import flush_usage
+
+    await close_clients()
+    await run_in_threadpool(flush_usage)  # 장부에 남은 사용량 기록 (엔진 정리 전)
+    engine.dispose()
 
-app = FastAPI(title="jargis API", version="0.1.0")
+
+app = FastAPI(title="jargis API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -13,10 +40,56 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (선택): 검색/배치/내보내기처럼 큰 응답용. min_size 미만은 그대로 보낸다.
+if settings.response_compression == "br":
+    try:
+        from brotli_asgi import BrotliMiddleware
+
+        app.add_middleware(
+            BrotliMiddleware,
+            minimum_size=settings.response_compression_min_size,
+            gzip_fallback=True,  # Accept-Encoding에 br이 없으면 gzip
+        )
+    except ImportError:
+        logging.getLogger(__name__).warning("brotli-asgi 미설치 → gzip으로 대체")
+        app.add_middleware(GZipMiddleware, minimum_size=settings.response_compression_min_size)
+elif settings.response_compression == "gzip":
+    app.add_middleware(GZipMiddleware, minimum_size=settings.response_compression_min_size)
+
 app.include_router(health.router, prefix="")
 app.include_router(upload.router, prefix="")
 app.include_router(search.router, prefix="")
+app.include_router(search_live.router, prefix="")
 app.include_router(draft.router, prefix="")
 app.include_router(upload_md.router, prefix="")
+app.include_router(metrics.router, prefix="")
+app.include_router(export.router, prefix="")
+app.include_router(usage.router, prefix="")
+
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    t0 = time.perf_counter()
+    status = 500
+    with start_trace(
+        f"{request.method} {request.url.path}",
+        request.headers.get("traceparent"),
+        **{"http.method": request.method, "http.target": request.url.path},
+    ) as sp:
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            # 경로 파라미터로 카디널리티가 늘지 않게 라우트 템플릿 사용
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            sp.set("http.route", route)
+            sp.set("http.status_code", status)
+            HTTP_SECONDS.observe(
+                time.perf_counter() - t0,
+                method=request.method,
+                route=route,
+                status=str(status),
+            )
 
 # TODO: upload/search/draft 라우터 추가 예정
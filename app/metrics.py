@@ -0,0 +1,215 @@
+# app/metrics.py
+"""
+가벼운 인프로세스 메트릭 (Prometheus 텍스트 포맷 노출).
+외부 의존성 없이 Counter / Histogram만 지원한다.
+
+    with timed("search", "embed"):
+        ...
+    OPENAI_TOKENS.inc(emb.usage.total_tokens, endpoint="search", kind="embedding")
+"""
+from __future__ import annotations
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from .tracing import span
+
+__all__ = [
+    "Counter",
+    "Histogram",
+    "REGISTRY",
+    "STAGE_SECONDS",
+    "HTTP_SECONDS",
+    "OPENAI_TOKENS",
+    "OPENAI_BATCH_SIZE",
+    "CACHE_HITS",
+    "CACHE_MISSES",
+    "ROWS_SCANNED",
+    "SINGLEFLIGHT_SHARED",
+    "SEARCH_CANCELLED",
+    "TENANT_REJECTED",
+    "USAGE_DROPPED",
+    "timed",
+    "render_prometheus",
+]
+
+# 기본 버킷 (초): 1ms ~ 30s
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labels)
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, doc, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        if not amount:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_fmt_labels(self.labels, k)} {v}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        doc: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * (len(self.buckets) + 2)
+            row[idx] += 1
+            row[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines: List[str] = []
+        for key, row in items:
+            cum = 0
+            for bound, n in zip(self.buckets, row):
+                cum += n
+                le = _fmt_labels(self.labels, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cum}")
+            cum += row[len(self.buckets)]
+            inf = _fmt_labels(self.labels, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {cum}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labels, key)} {row[-1]}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labels, key)} {cum}")
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+
+STAGE_SECONDS = Histogram(
+    "jargis_stage_seconds",
+    "엔드포인트 내부 단계별 소요 시간 (embed, db, rerank, serialize, llm, parse)",
+    labels=("endpoint", "stage"),
+)
+HTTP_SECONDS = Histogram(
+    "jargis_http_request_seconds",
+    "HTTP 요청 전체 소요 시간",
+    labels=("method", "route", "status"),
+)
+OPENAI_TOKENS = Counter(
+    "jargis_openai_tokens_total",
+    "OpenAI 사용 토큰 수",
+    labels=("endpoint", "kind"),
+)
+OPENAI_BATCH_SIZE = Histogram(
+    "jargis_openai_batch_size",
+    "OpenAI 임베딩 호출당 입력 개수",
+    labels=("endpoint",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048),
+)
+CACHE_HITS = Counter("jargis_cache_hits_total", "캐시 적중 수", labels=("cache",))
+CACHE_MISSES = Counter("jargis_cache_misses_total", "캐시 미스 수", labels=("cache",))
+ROWS_SCANNED = Counter(
+    "jargis_rows_scanned_total",
+    "엔드포인트가 DB에서 읽어온 행 수",
+    labels=("endpoint",),
+)
+SINGLEFLIGHT_SHARED = Counter(
+    "jargis_singleflight_shared_total",
+    "진행 중인 동일 요청의 결과를 공유받은 호출 수",
+    labels=("flight",),
+)
+SEARCH_CANCELLED = Counter(
+    "jargis_search_cancelled_total",
+    "입력 중 검색(/search/live)에서 새 입력 때문에 중단된 작업 수",
+    labels=("stage",),
+)
+TENANT_REJECTED = Counter(
+    "jargis_tenant_rejected_total",
+    "테넌트 한도(요청률/일일 임베딩 토큰) 초과로 거절한 요청 수",
+    labels=("tenant", "reason"),
+)
+
+USAGE_DROPPED = Counter(
+    "jargis_usage_dropped_total",
+    "기록하지 못한 OpenAI 사용량 장부 이벤트 수 (큐 포화/DB 오류)",
+    labels=("reason",),
+)
+
+
+@contextmanager
+def timed(endpoint: str, stage: str, **attrs: Any) -> Iterator[Any]:
+    """
+    with 블록 소요 시간을 STAGE_SECONDS에 기록 (예외가 나도 기록)하고,
+    같은 구간을 "<endpoint>.<stage>" span으로 남긴다. span을 yield 한다.
+    """
+    t0 = time.perf_counter()
+    try:
+        with span(f"{endpoint}.{stage}", **attrs) as sp:
+            yield sp
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - t0, endpoint=endpoint, stage=stage)
+
+
+def render_prometheus(extra_gauges: Dict[str, float] | None = None) -> str:
+    """등록된 메트릭 + 추가 게이지를 Prometheus 텍스트 포맷으로."""
+    lines: List[str] = []
+    for m in REGISTRY:
+        lines.append(f"# HELP {m.name} {m.doc}")
+        lines.append(f"# TYPE {m.name} {m.kind}")
+        lines.extend(m.render())
+    for name, value in (extra_gauges or {}).items():
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
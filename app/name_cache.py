@@ -0,0 +1,127 @@
+# app/name_cache.py
+"""
+companies / jobs 의 normalized_name → id 인프로세스 캐시.
+
+    cid = COMPANIES.get_or_create(conn, "LG CNS")   # 캐시 적중 시 DB 접근 없음
+    cid = COMPANIES.lookup(conn, normalize_name(name))  # 조회만 (없으면 None)
+
+- 첫 사용 시 테이블 전체(수백~수천 행)를 한 번에 적재 (warmup)
+- 미스일 때만 INSERT ... ON CONFLICT DO NOTHING → 없으면 SELECT 폴백
+  (DO UPDATE와 달리 이미 있는 이름에 행 잠금/새 튜플 버전을 만들지 않는다)
+- 새로 INSERT한 id는 그 트랜잭션이 롤백될 수 있으므로 캐시하지 않고 키를 무효화한다.
+  다음 조회의 SELECT 폴백이 커밋된 값을 캐시한다.
+행 삭제 경로가 없으므로 캐시된 id는 만료 없이 유지한다 (워커 프로세스마다 별도 캐시).
+"""
+from __future__ import annotations
+import threading
+from typing import Dict, Optional
+
+from .db import engine, sql
+from .metrics import CACHE_HITS, CACHE_MISSES
+from .utils.normalization import normalize_name
+
+__all__ = ["NameIdCache", "COMPANIES", "JOBS"]
+
+
+class NameIdCache:
+    def __init__(self, table: str) -> None:
+        if table not in ("companies", "jobs"):
+            raise ValueError(f"unsupported table: {table}")
+        self.table = table
+        self._ids: Dict[str, int] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._insert_sql = f"""
+            INSERT INTO {table}(name, normalized_name)
+            VALUES (:n, :nn)
+            ON CONFLICT DO NOTHING
+            RETURNING id
+        """
+        # name UNIQUE 충돌(normalized_name 없는 예전 행)도 찾도록 name으로도 조회
+        self._select_sql = f"""
+            SELECT id FROM {table}
+            WHERE normalized_name = :nn OR name = :n
+            ORDER BY (normalized_name = :nn) DESC NULLS LAST, id
+            LIMIT 1
+        """
+
+    def warmup(self, conn=None) -> int:
+        """테이블 전체를 한 번에 적재. 적재한 행 수를 반환."""
+        with self._lock:
+            if self._loaded:
+                return len(self._ids)
+            if conn is None:
+                with engine.connect() as c:
+                    rows = c.execute(self._warmup_stmt()).fetchall()
+            else:
+                rows = conn.execute(self._warmup_stmt()).fetchall()
+            self._ids.update({r[0]: r[1] for r in rows})
+            self._loaded = True
+            return len(self._ids)
+
+    def _warmup_stmt(self):
+        return sql(
+            f"SELECT normalized_name, id FROM {self.table} WHERE normalized_name IS NOT NULL"
+        )
+
+    def _cached(self, norm: str, conn) -> Optional[int]:
+        if not self._loaded:
+            self.warmup(conn)
+        cid = self._ids.get(norm)
+        if cid is not None:
+            CACHE_HITS.inc(cache=self.table)
+        else:
+            CACHE_MISSES.inc(cache=self.table)
+        return cid
+
+    def lookup(self, conn, norm: str, name: Optional[str] = None) -> Optional[int]:
+        """
+        normalized_name으로 id 조회. 캐시 미스면 SELECT 후 (있으면) 캐시.
+        conn이 None이면 미스일 때만 커넥션을 잡는다.
+        """
+        if not norm:
+            return None
+        cid = self._cached(norm, conn)
+        if cid is None:
+            params = {"nn": norm, "n": name or norm}
+            if conn is None:
+                with engine.connect() as c:
+                    cid = c.execute(sql(self._select_sql), params).scalar()
+            else:
+                cid = conn.execute(sql(self._select_sql), params).scalar()
+            if cid is not None:
+                self._ids[norm] = cid
+        return cid
+
+    def get_or_create(self, conn, name: str) -> Optional[int]:
+        """이름 → id. 없으면 INSERT (ON CONFLICT DO NOTHING) 후 SELECT 폴백."""
+        norm = normalize_name(name)
+        if not norm:
+            # Unknown 처리 (NULL 허용 시 None 반환)
+            return None
+        cid = self._cached(norm, conn)
+        if cid is not None:
+            return cid
+        params = {"n": name.strip(), "nn": norm}
+        row = conn.execute(sql(self._insert_sql), params).first()
+        if row:
+            self.invalidate(norm)  # 커밋 전이라 캐시하지 않음
+            return row[0]
+        # 이미 있음 (동시 삽입 포함) → 커밋된 행이므로 캐시
+        cid = conn.execute(sql(self._select_sql), params).scalar()
+        if cid is not None:
+            self._ids[norm] = cid
+        return cid
+
+    def invalidate(self, norm: Optional[str] = None) -> None:
+        """키 하나(또는 전체) 무효화. 전체 무효화 시 다음 사용 때 다시 warmup."""
+        with self._lock:
+            if norm is None:
+                self._ids.clear()
+                self._loaded = False
+            else:
+                self._ids.pop(norm, None)
+
+
+COMPANIES = NameIdCache("companies")
+JOBS = NameIdCache("jobs")
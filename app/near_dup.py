@@ -0,0 +1,161 @@
+# app/near_dup.py
+"""
+근사 중복 답변 색인 (MinHash + LSH 밴드 테이블).
+
+  - question_minhash   : 문항별 MinHash 서명 (BIGINT[128])
+  - question_lsh_bands : (band, bucket) → question_id  (PK 인덱스로 조회)
+
+커밋/업로드 시 index_question_signatures()로 갱신하고, preview는
+find_near_duplicates()로 밴드 충돌 후보만 가져와 서명 비교로 Jaccard를 추정한다.
+기존 데이터 백필:  uv run minhash [--batch 1000]
+"""
+from __future__ import annotations
+import argparse
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .db import engine, sql
+from .settings import settings
+from .utils.minhash import estimate_jaccard, lsh_buckets, minhash_signature
+
+__all__ = ["index_question_signatures", "find_near_duplicates", "backfill_signatures"]
+
+_UPSERT_SIG_SQL = """
+    INSERT INTO question_minhash (question_id, signature, updated_at)
+    VALUES (:qid, :sig, now())
+    ON CONFLICT (question_id) DO UPDATE
+    SET signature = EXCLUDED.signature, updated_at = EXCLUDED.updated_at
+"""
+
+_INSERT_BANDS_SQL = """
+    INSERT INTO question_lsh_bands (band, bucket, question_id)
+    SELECT * FROM unnest(CAST(:bands AS smallint[]), CAST(:buckets AS bigint[]), CAST(:qids AS int[]))
+    ON CONFLICT DO NOTHING
+"""
+
+# 섹션별 밴드 키를 한 번에 넘겨 충돌 후보 + 서명을 가져온다
+_CANDIDATES_SQL = """
+    SELECT DISTINCT k.idx, m.question_id, m.signature
+    FROM unnest(CAST(:idxs AS int[]), CAST(:bands AS smallint[]), CAST(:buckets AS bigint[]))
+         AS k(idx, band, bucket)
+    JOIN question_lsh_bands b ON b.band = k.band AND b.bucket = k.bucket
+    JOIN question_minhash m ON m.question_id = b.question_id
+    JOIN questions q ON q.id = m.question_id
+    WHERE CAST(:tenant AS int) IS NULL OR q.tenant_id = :tenant
+"""
+
+
+def index_question_signatures(conn, items: Iterable[Tuple[int, str]]) -> int:
+    """(question_id, 답변 텍스트) 목록의 서명/밴드를 교체. 색인된 문항 수를 반환."""
+    items = list(items)
+    if not items:
+        return 0
+    qids = [qid for qid, _ in items]
+    conn.execute(sql("DELETE FROM question_lsh_bands WHERE question_id = ANY(:qids)"), {"qids": qids})
+    sig_rows = []
+    bands: List[int] = []
+    buckets: List[int] = []
+    band_qids: List[int] = []
+    empty: List[int] = []
+    for qid, text in items:
+        sig = minhash_signature(text)
+        if sig is None:
+            empty.append(qid)
+            continue
+        sig_rows.append({"qid": qid, "sig": sig})
+        for band, bucket in lsh_buckets(sig):
+            bands.append(band)
+            buckets.append(bucket)
+            band_qids.append(qid)
+    if empty:
+        conn.execute(sql("DELETE FROM question_minhash WHERE question_id = ANY(:qids)"), {"qids": empty})
+    if sig_rows:
+        conn.execute(sql(_UPSERT_SIG_SQL), sig_rows)
+        conn.execute(
+            sql(_INSERT_BANDS_SQL), {"bands": bands, "buckets": buckets, "qids": band_qids}
+        )
+    return len(sig_rows)
+
+
+def find_near_duplicates(
+    conn,
+    sigs: Sequence[Optional[List[int]]],
+    threshold: Optional[float] = None,
+    limit: int = 5,
+    tenant_id: Optional[int] = None,
+) -> List[List[Tuple[int, float]]]:
+    """서명별 [(question_id, jaccard 추정치)] (threshold 이상, 높은 순 limit개). tenant_id면 그 테넌트 문항만."""
+    threshold = settings.near_dup_threshold if threshold is None else threshold
+    out: List[List[Tuple[int, float]]] = [[] for _ in sigs]
+    idxs: List[int] = []
+    bands: List[int] = []
+    buckets: List[int] = []
+    for i, sig in enumerate(sigs):
+        if sig is None:
+            continue
+        for band, bucket in lsh_buckets(sig):
+            idxs.append(i)
+            bands.append(band)
+            buckets.append(bucket)
+    if not idxs:
+        return out
+    rows = conn.execute(
+        sql(_CANDIDATES_SQL),
+        {"idxs": idxs, "bands": bands, "buckets": buckets, "tenant": tenant_id},
+    ).fetchall()
+    for idx, qid, other in rows:
+        j = estimate_jaccard(sigs[idx], other)
+        if j >= threshold:
+            out[idx].append((qid, j))
+    for hits in out:
+        hits.sort(key=lambda t: (-t[1], t[0]))
+        del hits[limit:]
+    return out
+
+
+def backfill_signatures(batch: int = 1000, only_missing: bool = True) -> Dict[str, float]:
+    """
+    question_id 순서로 batch개씩 서명 계산 (배치마다 커밋).
+    답변 원문은 저장된 청크를 순서대로 이어 복원한다 (정규화에서 공백은 무시됨).
+    """
+    missing = (
+        "AND NOT EXISTS (SELECT 1 FROM question_minhash m WHERE m.question_id = e.question_id)"
+        if only_missing
+        else ""
+    )
+    next_sql = f"""
+        SELECT e.question_id, string_agg(e.chunk_text, ' ' ORDER BY e.chunk_id)
+        FROM embeddings e
+        WHERE e.model = :model AND e.question_id > :after
+        {missing}
+        GROUP BY e.question_id
+        ORDER BY e.question_id
+        LIMIT :n
+    """
+    t0 = time.perf_counter()
+    done = 0
+    after = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                sql(next_sql),
+                {"model": settings.embedding_model, "after": after, "n": batch},
+            ).fetchall()
+            if not rows:
+                break
+            done += index_question_signatures(conn, [(r[0], r[1]) for r in rows])
+        after = rows[-1][0]
+        print(f"  {done} questions", flush=True)
+    return {"questions": done, "seconds": round(time.perf_counter() - t0, 2)}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="문항 MinHash/LSH 색인 백필")
+    ap.add_argument("--batch", type=int, default=1000, help="트랜잭션당 문항 수")
+    ap.add_argument("--all", action="store_true", help="이미 있는 서명도 다시 계산")
+    args = ap.parse_args()
+    print(backfill_signatures(args.batch, only_missing=not args.all))
+
+
+if __name__ == "__main__":
+    main()
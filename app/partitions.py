@@ -0,0 +1,598 @@
+# app/partitions.py
+"""
+embeddings / search_chunks 선언적 파티셔닝.
+
+  embeddings      LIST (model)                  재임베딩 후 이전 모델은 파티션째 DROP (DELETE/VACUUM 없음)
+  search_chunks   LIST (model) → RANGE (year)   모델/연도 필터 검색은 해당 파티션의 인덱스만 스캔
+
+파티션 이름: <테이블>_m_<모델 slug>, 연도는 <…>_y2024 / <…>_ydefault (NULL·범위 밖 연도),
+목록에 없는 모델은 <테이블>_default. 인덱스는 부모에 선언돼 있어 새 파티션에도 자동으로 생긴다.
+
+    uv run partitions ensure [--model M]        # 모델(+연도) 파티션 생성 (uv run db가 설정 모델로 호출)
+    uv run partitions migrate [--batch N]       # 기존 비파티션 테이블 → 파티션 테이블 (온라인)
+    uv run partitions drop-model --model M      # 이전 모델 파티션 삭제
+    uv run partitions status
+
+migrate는 테이블마다: 새 파티션 테이블(<t>_p) 생성 + 기존 테이블에 미러 트리거
+→ 키 범위 배치 복사 (원본 행 FOR SHARE, 쓰기는 계속 받음) → 짧은 잠금 안에서 이름 교체.
+기존 테이블은 <t>_legacy로 남는다 (--drop-legacy로 삭제).
+"""
+from __future__ import annotations
+import argparse
+import datetime as dt
+import re
+import time
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy.exc import OperationalError
+
+from .db import engine, sql
+from .read_model import refresh_search_chunks
+from .settings import settings
+from .tenants import ann_index_definition, ann_index_name
+from .utils.hashing import short_hash
+
+__all__ = [
+    "partition_name",
+    "is_partitioned",
+    "ensure_partitions",
+    "drop_model_partitions",
+    "migrate_online",
+    "create_index_online",
+    "ensure_search_chunks_fk",
+]
+
+EMBEDDINGS = "embeddings"
+SEARCH_CHUNKS = "search_chunks"
+
+_NEW = "_p"  # 마이그레이션 중인 새 테이블/인덱스 이름 접미사
+_LEGACY = "_legacy"
+
+
+# ---------- 이름/카탈로그 ----------
+def _slug(model: str) -> str:
+    # 식별자 63자 안에서 충돌 없게: 읽을 수 있는 접두 + 원문 해시
+    base = re.sub(r"[^a-z0-9]+", "_", model.lower()).strip("_")[:24]
+    return f"{base}_{short_hash(model, 6)}"
+
+
+def partition_name(table: str, model: str, year: Optional[int | str] = None) -> str:
+    name = f"{table}_m_{_slug(model)}"
+    return name if year is None else f"{name}_y{year}"
+
+
+def _literal(value: str) -> str:
+    # 파티션 경계는 바인드 파라미터를 받지 않는다
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _exists(conn, name: str) -> bool:
+    return bool(conn.execute(sql("SELECT to_regclass(:n) IS NOT NULL"), {"n": name}).scalar())
+
+
+def is_partitioned(conn, table: str) -> bool:
+    return bool(
+        conn.execute(
+            sql("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:n)"), {"n": table}
+        ).scalar()
+    )
+
+
+def _years() -> List[int]:
+    last = dt.date.today().year + settings.partition_years_ahead
+    return list(range(settings.partition_year_from, last + 1))
+
+
+# ---------- 파티션 생성 ----------
+def _take_from_default(conn, parent: str, default: str, where: str) -> Optional[str]:
+    """
+    default 파티션에 이미 들어간 해당 값의 행을 임시 테이블로 뺀다
+    (그대로 두면 CREATE TABLE ... PARTITION OF 가 실패). 뺀 행이 없으면 None.
+    """
+    if not _exists(conn, default):
+        return None
+    held = f"_held_{short_hash(default + where, 8)}"
+    conn.exec_driver_sql(f"CREATE TEMP TABLE {held} (LIKE {parent}) ON COMMIT DROP")
+    moved = conn.exec_driver_sql(
+        f"WITH d AS (DELETE FROM {default} WHERE {where} RETURNING *) "
+        f"INSERT INTO {held} SELECT * FROM d"
+    ).rowcount
+    if moved:
+        return held
+    conn.exec_driver_sql(f"DROP TABLE {held}")
+    return None
+
+
+def _put_back(conn, parent: str, held: Optional[str], returning: Optional[str] = None) -> list:
+    if held is None:
+        return []
+    stmt = f"INSERT INTO {parent} SELECT * FROM {held}"
+    if returning:
+        rows = conn.exec_driver_sql(f"{stmt} RETURNING {returning}").scalars().all()
+    else:
+        conn.exec_driver_sql(stmt)
+        rows = []
+    conn.exec_driver_sql(f"DROP TABLE {held}")
+    return rows
+
+
+def _ensure_embeddings(conn, parent: str, model: str) -> List[str]:
+    created = []
+    default = f"{EMBEDDINGS}_default"
+    if not _exists(conn, default):
+        conn.exec_driver_sql(f"CREATE TABLE {default} PARTITION OF {parent} DEFAULT")
+        created.append(default)
+    name = partition_name(EMBEDDINGS, model)
+    if not _exists(conn, name):
+        lit = _literal(model)
+        held = _take_from_default(conn, parent, default, f"model = {lit}")
+        conn.exec_driver_sql(f"CREATE TABLE {name} PARTITION OF {parent} FOR VALUES IN ({lit})")
+        qids = _put_back(conn, parent, held, returning="question_id")
+        if qids and _exists(conn, SEARCH_CHUNKS):
+            # default에서 뺄 때 FK(ON DELETE CASCADE)로 지워진 read model 행 복구
+            refresh_search_chunks(conn, qids)
+        created.append(name)
+    return created
+
+
+def _ensure_search_chunks(conn, parent: str, model: str, years: Sequence[int]) -> List[str]:
+    created = []
+    default = f"{SEARCH_CHUNKS}_default"
+    if not _exists(conn, default):
+        conn.exec_driver_sql(f"CREATE TABLE {default} PARTITION OF {parent} DEFAULT")
+        created.append(default)
+    name = partition_name(SEARCH_CHUNKS, model)
+    ydefault = partition_name(SEARCH_CHUNKS, model, "default")
+    held = None
+    if not _exists(conn, name):
+        lit = _literal(model)
+        held = _take_from_default(conn, parent, default, f"model = {lit}")
+        conn.exec_driver_sql(
+            f"CREATE TABLE {name} PARTITION OF {parent} FOR VALUES IN ({lit}) PARTITION BY RANGE (year)"
+        )
+        conn.exec_driver_sql(f"CREATE TABLE {ydefault} PARTITION OF {name} DEFAULT")
+        created += [name, ydefault]
+    for y in years:
+        yname = partition_name(SEARCH_CHUNKS, model, y)
+        if _exists(conn, yname):
+            continue
+        held_y = _take_from_default(conn, name, ydefault, f"year >= {y} AND year < {y + 1}")
+        conn.exec_driver_sql(
+            f"CREATE TABLE {yname} PARTITION OF {name} FOR VALUES FROM ({y}) TO ({y + 1})"
+        )
+        _put_back(conn, name, held_y)
+        created.append(yname)
+    _put_back(conn, parent, held)
+    return created
+
+
+def _ensure_all(conn, model: str, suffix: str = "") -> List[str]:
+    created = []
+    if is_partitioned(conn, EMBEDDINGS + suffix):
+        created += _ensure_embeddings(conn, EMBEDDINGS + suffix, model)
+    if is_partitioned(conn, SEARCH_CHUNKS + suffix):
+        created += _ensure_search_chunks(conn, SEARCH_CHUNKS + suffix, model, _years())
+    return created
+
+
+def ensure_partitions(model: Optional[str] = None) -> List[str]:
+    """
+    모델 파티션(+ search_chunks 연도 하위 파티션)을 만든다. 새로 만든 테이블 이름을 반환.
+    부모 테이블을 잠깐 ACCESS EXCLUSIVE로 잠그므로 모델 추가/연초에만 돌린다.
+    """
+    with engine.begin() as conn:
+        return _ensure_all(conn, model or settings.embedding_model)
+
+
+# ---------- 이전 모델 삭제 ----------
+def drop_model_partitions(model: str) -> Dict[str, int]:
+    """모델의 read model·centroid·임베딩을 지운다. 파티션이면 DROP, 나머지(default/비파티션)는 DELETE."""
+    out: Dict[str, int] = {}
+    m = {"m": model}
+    with engine.begin() as conn:
+        # read model 먼저: embeddings 파티션은 참조하는 행이 남아 있으면 DETACH되지 않는다
+        name = partition_name(SEARCH_CHUNKS, model)
+        if _exists(conn, name):
+            conn.exec_driver_sql(f"DROP TABLE {name}")
+            out["search_chunks_partition_dropped"] = 1
+        out["search_chunks_deleted"] = conn.execute(
+            sql("DELETE FROM search_chunks WHERE model = :m"), m
+        ).rowcount
+        out["centroids_deleted"] = conn.execute(
+            sql("DELETE FROM question_embeddings WHERE model = :m"), m
+        ).rowcount
+        name = partition_name(EMBEDDINGS, model)
+        if _exists(conn, name):
+            conn.exec_driver_sql(f"ALTER TABLE {EMBEDDINGS} DETACH PARTITION {name}")
+            conn.exec_driver_sql(f"DROP TABLE {name}")
+            out["embeddings_partition_dropped"] = 1
+        out["embeddings_deleted"] = conn.execute(
+            sql("DELETE FROM embeddings WHERE model = :m"), m
+        ).rowcount
+    return out
+
+
+# ---------- search_chunks → embeddings FK ----------
+_SEARCH_CHUNKS_FK = "search_chunks_embedding_model_fkey"
+
+
+def ensure_search_chunks_fk(conn) -> bool:
+    """
+    search_chunks (embedding_id, model) → embeddings (id, model) FK가 없으면 만든다.
+    embeddings가 파티션 테이블((id, model) 기본 키)이 된 뒤에만 가능 → 아니면 건너뛰고 False.
+    """
+    if not _exists(conn, SEARCH_CHUNKS) or not is_partitioned(conn, EMBEDDINGS):
+        return False
+    has_fk = conn.execute(
+        sql(
+            """
+            SELECT 1 FROM pg_constraint
+            WHERE contype = 'f' AND conrelid = to_regclass(:sc) AND confrelid = to_regclass(:e)
+            """
+        ),
+        {"sc": SEARCH_CHUNKS, "e": EMBEDDINGS},
+    ).scalar()
+    if has_fk:
+        return False
+    conn.exec_driver_sql(
+        f"ALTER TABLE {SEARCH_CHUNKS} ADD CONSTRAINT {_SEARCH_CHUNKS_FK} "
+        f"FOREIGN KEY (embedding_id, model) REFERENCES {EMBEDDINGS} (id, model) ON DELETE CASCADE"
+    )
+    return True
+
+
+# ---------- 온라인 마이그레이션 ----------
+# {t}: 새 테이블 이름, {s}: 인덱스/제약 이름 접미사 (교체 시 떼어낸다)
+# 벡터/트라이그램 인덱스는 복사 전에 만든다 (hnsw·gin은 데이터 없이 만들어도 된다)
+_SPECS: Dict[str, Dict] = {
+    EMBEDDINGS: {
+        "create": [
+            """
+            CREATE TABLE {t} (
+                LIKE embeddings INCLUDING DEFAULTS,
+                CONSTRAINT embeddings_pkey{s} PRIMARY KEY (id, model),
+                FOREIGN KEY (question_id) REFERENCES questions (id) ON DELETE CASCADE
+            ) PARTITION BY LIST (model)
+            """,
+            "CREATE UNIQUE INDEX ux_embedding_chunk_identity{s} ON {t} (question_id, chunk_hash, model)",
+            "CREATE INDEX idx_embeddings_qid{s} ON {t} (question_id)",
+            "CREATE INDEX idx_embeddings_chunk_trgm{s} ON {t} USING gin (chunk_text gin_trgm_ops)",
+        ],
+        "key": ("id", "model"),
+        "range": "id",
+        # 트리거가 먼저 넣은 최신 행을 배치가 덮지 않게
+        "on_conflict": "ON CONFLICT DO NOTHING",
+    },
+    SEARCH_CHUNKS: {
+        "create": [
+            """
+            CREATE TABLE {t} (
+                LIKE search_chunks INCLUDING DEFAULTS,
+                FOREIGN KEY (embedding_id, model) REFERENCES embeddings (id, model) ON DELETE CASCADE
+            ) PARTITION BY LIST (model)
+            """,
+            "CREATE INDEX idx_search_chunks_qid{s} ON {t} (question_id)",
+            "CREATE INDEX idx_search_chunks_embedding{s} ON {t} (embedding_id)",
+        ],
+        "key": ("embedding_id",),
+        "range": "embedding_id",
+        # 유일 키 없음: read model은 갱신 없이 삭제+삽입만 하므로 NOT EXISTS로 충분
+        "on_conflict": "",
+    },
+}
+
+
+def _create_vector_indexes(conn, new: str, has_tenant: bool) -> None:
+    # 테넌트 열이 있으면 schema.sql과 같은 구성 (tenant btree + 전용 테넌트별 partial hnsw)
+    if not has_tenant:
+        conn.exec_driver_sql(
+            f"CREATE INDEX idx_search_chunks_cosine{_NEW} ON {new} USING hnsw (embedding vector_cosine_ops)"
+        )
+        return
+    conn.exec_driver_sql(f"CREATE INDEX idx_search_chunks_tenant{_NEW} ON {new} (tenant_id)")
+    for tid in conn.execute(sql("SELECT id FROM tenants WHERE dedicated_index")).scalars().all():
+        conn.exec_driver_sql(f"CREATE INDEX {ann_index_name(tid)}{_NEW} ON {new} {ann_index_definition(tid)}")
+
+
+def _columns(conn, table: str) -> List[str]:
+    return conn.execute(
+        sql(
+            """
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = :t
+            ORDER BY ordinal_position
+            """
+        ),
+        {"t": table},
+    ).scalars().all()
+
+
+def _indexes(conn, table: str) -> List[str]:
+    return conn.execute(
+        sql("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :t"),
+        {"t": table},
+    ).scalars().all()
+
+
+def _has_trigger(conn, table: str, trigger: str) -> bool:
+    return bool(
+        conn.execute(
+            sql("SELECT 1 FROM pg_trigger WHERE tgrelid = to_regclass(:t) AND tgname = :g"),
+            {"t": table, "g": trigger},
+        ).scalar()
+    )
+
+
+def _mirror_sql(table: str, new: str, cols: Sequence[str], spec: Dict) -> str:
+    col_list = ", ".join(cols)
+    values = ", ".join(f"NEW.{c}" for c in cols)
+    match = " AND ".join(f"{c} = OLD.{c}" for c in spec["key"])
+    return f"""
+        CREATE OR REPLACE FUNCTION {table}_mirror() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                DELETE FROM {new} WHERE {match};
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                INSERT INTO {new} ({col_list}) VALUES ({values}) {spec["on_conflict"]};
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """
+
+
+def _prepare(table: str, new: str, spec: Dict) -> List[str]:
+    """새 파티션 테이블 + 파티션 + 미러 트리거를 한 트랜잭션에. 중단 후 재실행이면 그대로 이어간다."""
+    with engine.begin() as conn:
+        cols = _columns(conn, table)
+        if _exists(conn, new):
+            if not _has_trigger(conn, table, f"{table}_mirror"):
+                raise SystemExit(f"{new}가 있지만 미러 트리거가 없음 — 확인 후 DROP TABLE {new} CASCADE")
+            return cols
+        for stmt in spec["create"]:
+            conn.exec_driver_sql(stmt.format(t=new, s=_NEW))
+        if table == SEARCH_CHUNKS:
+            _create_vector_indexes(conn, new, "tenant_id" in cols)
+        models = set(conn.execute(sql(f"SELECT DISTINCT model FROM {table}")).scalars().all())
+        for model in sorted(models | {settings.embedding_model}):
+            _ensure_all(conn, model, suffix=_NEW)
+        conn.exec_driver_sql(_mirror_sql(table, new, cols, spec))
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER {table}_mirror AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {table}_mirror()"
+        )
+    return cols
+
+
+def _copy(table: str, new: str, cols: Sequence[str], spec: Dict, batch: int) -> int:
+    col_list = ", ".join(cols)
+    rng = spec["range"]
+    dedupe = (
+        ""
+        if spec["on_conflict"]
+        else " AND NOT EXISTS (SELECT 1 FROM {new} n WHERE "
+        + " AND ".join(f"n.{c} = src.{c}" for c in spec["key"])
+        + ")"
+    ).format(new=new)
+    # FOR SHARE: 복사 중인 행의 UPDATE/DELETE는 이 배치가 끝난 뒤 트리거가 새 테이블에 반영한다
+    copy_sql = f"""
+        INSERT INTO {new} ({col_list})
+        SELECT {col_list} FROM {table} src
+        WHERE src.{rng} > :after AND src.{rng} <= :upto{dedupe}
+        FOR SHARE OF src
+        {spec["on_conflict"]}
+    """
+    with engine.connect() as conn:
+        hi = conn.execute(sql(f"SELECT COALESCE(max({rng}), 0) FROM {table}")).scalar()
+    # 시작 이후 들어온 행(키 > hi)은 트리거가 옮긴다
+    rows = 0
+    after = 0
+    while after < hi:
+        upto = after + batch
+        with engine.begin() as conn:
+            rows += conn.execute(sql(copy_sql), {"after": after, "upto": upto}).rowcount
+        after = upto
+        print(f"  {table}: {min(after, hi)}/{hi} ({rows} rows)", flush=True)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"ANALYZE {new}")
+    return rows
+
+
+def _swap(conn, table: str, new: str, legacy: str) -> None:
+    conn.exec_driver_sql(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+    conn.exec_driver_sql(f"DROP TRIGGER {table}_mirror ON {table}")
+    conn.exec_driver_sql(f"DROP FUNCTION {table}_mirror()")
+    for idx in _indexes(conn, table):
+        conn.exec_driver_sql(f"ALTER INDEX {idx} RENAME TO {idx[:56]}{_LEGACY}")
+    conn.exec_driver_sql(f"ALTER TABLE {table} RENAME TO {legacy}")
+    conn.exec_driver_sql(f"ALTER TABLE {new} RENAME TO {table}")
+    for idx in _indexes(conn, table):
+        if idx.endswith(_NEW):
+            conn.exec_driver_sql(f"ALTER INDEX {idx} RENAME TO {idx[: -len(_NEW)]}")
+
+    if table == EMBEDDINGS:
+        seq = conn.execute(sql("SELECT pg_get_serial_sequence(:t, 'id')"), {"t": legacy}).scalar()
+        if seq:
+            conn.exec_driver_sql(f"ALTER SEQUENCE {seq} OWNED BY {EMBEDDINGS}.id")
+        # 아직 비파티션인 search_chunks의 FK를 새 embeddings로 (검증은 잠금 밖에서)
+        fks = conn.execute(
+            sql(
+                """
+                SELECT conname FROM pg_constraint
+                WHERE contype = 'f' AND conrelid = to_regclass(:sc) AND confrelid = to_regclass(:legacy)
+                """
+            ),
+            {"sc": SEARCH_CHUNKS, "legacy": legacy},
+        ).scalars().all()
+        for fk in fks:
+            conn.exec_driver_sql(f"ALTER TABLE {SEARCH_CHUNKS} DROP CONSTRAINT {fk}")
+        if fks:
+            conn.exec_driver_sql(
+                f"ALTER TABLE {SEARCH_CHUNKS} ADD CONSTRAINT {_SEARCH_CHUNKS_FK} "
+                f"FOREIGN KEY (embedding_id, model) REFERENCES {EMBEDDINGS} (id, model) "
+                f"ON DELETE CASCADE NOT VALID"
+            )
+
+
+def _cutover(table: str, new: str, legacy: str, attempts: int = 5) -> None:
+    # 긴 읽기 뒤에서 잠금을 기다리며 모든 쿼리를 줄 세우지 않도록 lock_timeout 후 재시도
+    for attempt in range(1, attempts + 1):
+        try:
+            with engine.begin() as conn:
+                conn.exec_driver_sql("SET LOCAL lock_timeout = '3s'")
+                _swap(conn, table, new, legacy)
+            return
+        except OperationalError as e:
+            if attempt == attempts:
+                raise
+            print(f"  {table}: 잠금 대기 초과, 재시도 ({attempt}/{attempts}): {e.orig}", flush=True)
+            time.sleep(attempt)
+
+
+def migrate_online(table: str, batch: int = 5000, drop_legacy: bool = False) -> Dict[str, object]:
+    """비파티션 table을 같은 이름의 파티션 테이블로 옮긴다. 이미 파티션이면 건너뜀."""
+    spec = _SPECS[table]
+    new, legacy = table + _NEW, table + _LEGACY
+    with engine.connect() as conn:
+        if not _exists(conn, table) or is_partitioned(conn, table):
+            return {"table": table, "skipped": True}
+        if _exists(conn, legacy):
+            raise SystemExit(f"{legacy}가 이미 있음 — 이전 마이그레이션 결과를 정리한 뒤 다시 실행")
+        if table == SEARCH_CHUNKS and not is_partitioned(conn, EMBEDDINGS):
+            raise SystemExit("embeddings를 먼저 옮겨야 함 (FK가 embeddings (id, model)을 참조)")
+
+    t0 = time.perf_counter()
+    cols = _prepare(table, new, spec)
+    rows = _copy(table, new, cols, spec, batch)
+    t_copy = time.perf_counter()
+    _cutover(table, new, legacy)
+    t_swap = time.perf_counter()
+
+    if table == EMBEDDINGS:
+        with engine.begin() as conn:
+            if _exists(conn, SEARCH_CHUNKS) and not is_partitioned(conn, SEARCH_CHUNKS):
+                conn.exec_driver_sql(
+                    f"ALTER TABLE {SEARCH_CHUNKS} VALIDATE CONSTRAINT {_SEARCH_CHUNKS_FK}"
+                )
+            else:
+                # 부트스트랩 때 embeddings가 비파티션이라 FK 없이 만들어진 파티션 search_chunks
+                ensure_search_chunks_fk(conn)
+    if drop_legacy:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"DROP TABLE {legacy}")
+    return {
+        "table": table,
+        "rows_copied": rows,
+        "copy_seconds": round(t_copy - t0, 2),
+        "swap_seconds": round(t_swap - t_copy, 3),
+        "legacy": None if drop_legacy else legacy,
+    }
+
+
+# ---------- 온라인 인덱스 생성 ----------
+def _children(conn, table: str) -> List[str]:
+    return conn.execute(
+        sql(
+            """
+            SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(:t)
+            ORDER BY c.relname
+            """
+        ),
+        {"t": table},
+    ).scalars().all()
+
+
+def _index_tree(conn, name: str, table: str, definition: str) -> None:
+    if not is_partitioned(conn, table):
+        conn.exec_driver_sql(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}")
+        return
+    conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY {table} {definition}")
+    for child in _children(conn, table):
+        child_idx = f"{child[:48]}_{short_hash(name + child, 8)}"
+        _index_tree(conn, child_idx, child, definition)
+        attached = conn.execute(
+            sql(
+                "SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(:c) AND inhparent = to_regclass(:p)"
+            ),
+            {"c": child_idx, "p": name},
+        ).scalar()
+        if not attached:
+            conn.exec_driver_sql(f"ALTER INDEX {name} ATTACH PARTITION {child_idx}")
+
+
+def create_index_online(name: str, table: str, definition: str) -> None:
+    """
+    쓰기를 막지 않고 인덱스 생성. CREATE INDEX CONCURRENTLY는 파티션 테이블에 쓸 수 없으므로
+    부모에는 ON ONLY(빈 인덱스)를 만들고 리프마다 CONCURRENTLY로 만든 뒤 ATTACH한다
+    (모든 파티션이 붙으면 부모 인덱스가 유효해지고, 이후 새 파티션에는 자동으로 생긴다).
+    definition: ON <table> 뒤 부분, 예) "USING hnsw (embedding vector_cosine_ops) WHERE tenant_id = 3"
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        _index_tree(conn, name, table, definition)
+
+
+# ---------- 상태 ----------
+def status() -> List[Dict[str, object]]:
+    with engine.connect() as conn:
+        rows = conn.execute(
+            sql(
+                """
+                WITH RECURSIVE tree AS (
+                    SELECT c.oid, c.relname::text AS name, 0 AS depth, c.relname::text AS root
+                    FROM pg_class c
+                    WHERE c.oid IN (to_regclass('embeddings'), to_regclass('search_chunks'))
+                    UNION ALL
+                    SELECT c.oid, c.relname::text, t.depth + 1, t.root
+                    FROM pg_inherits i
+                    JOIN tree t ON t.oid = i.inhparent
+                    JOIN pg_class c ON c.oid = i.inhrelid
+                )
+                SELECT t.root, t.depth, t.name, c.relkind::text AS kind,
+                       pg_get_expr(c.relpartbound, c.oid) AS bound,
+                       GREATEST(c.reltuples, 0)::bigint AS rows_est,
+                       pg_total_relation_size(c.oid) AS bytes
+                FROM tree t JOIN pg_class c ON c.oid = t.oid
+                ORDER BY t.root, t.name
+                """
+            )
+        ).mappings().all()
+    return [dict(r) for r in rows]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="embeddings / search_chunks 파티션 관리")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("ensure", help="모델(+연도) 파티션 생성")
+    p.add_argument("--model", default=None, help="기본: EMBEDDING_MODEL")
+    p = sub.add_parser("migrate", help="비파티션 테이블을 온라인으로 옮김")
+    p.add_argument("--batch", type=int, default=5000, help="트랜잭션당 키 범위")
+    p.add_argument("--drop-legacy", action="store_true", help="교체 후 <t>_legacy 삭제")
+    p = sub.add_parser("drop-model", help="이전 모델 파티션 삭제")
+    p.add_argument("--model", required=True)
+    p.add_argument("--force", action="store_true", help="현재 EMBEDDING_MODEL도 허용")
+    sub.add_parser("status", help="파티션 목록/행 수 추정/크기")
+    args = ap.parse_args()
+
+    if args.cmd == "ensure":
+        created = ensure_partitions(args.model)
+        print({"created": created})
+    elif args.cmd == "migrate":
+        for table in (EMBEDDINGS, SEARCH_CHUNKS):
+            print(migrate_online(table, args.batch, args.drop_legacy))
+    elif args.cmd == "drop-model":
+        if args.model == settings.embedding_model and not args.force:
+            raise SystemExit("현재 EMBEDDING_MODEL의 파티션은 --force 없이 지우지 않음")
+        print(drop_model_partitions(args.model))
+    else:
+        for r in status():
+            indent = "  " * r["depth"]
+            print(
+                f"{indent}{r['name']:<{60 - len(indent)}s} {r['kind']} "
+                f"{r['rows_est']:>10d} {r['bytes'] / 1e6:>9.1f}MB  {r['bound'] or ''}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# app/preview_store.py
+"""
+Markdown 프리뷰 세션 저장소 (인프로세스, TTL + LRU 용량 제한).
+
+preview가 파싱 결과(섹션)를 여기에 두고 토큰을 돌려주면,
+commit은 토큰과 사용자가 고친 부분(edits)만 보낸다 → 문서가 두 번 전송/파싱/해시되지 않는다.
+원문은 메모리에 두지 않고 업로드를 읽으며 임시 파일(spool_path)에 써 둔다 → 세션의 raw_path.
+세션이 만료/축출/대체/pop되면 그 파일도 지운다.
+
+    path = spool_path()                     # preview: 업로드 조각을 이 파일에 기록
+    token = PREVIEW_SESSIONS.put({..., "raw_path": path}, size=raw_bytes + section_bytes)
+    session = PREVIEW_SESSIONS.get(token)   # 만료/축출되었으면 None
+
+- 같은 테넌트가 같은 content_hash로 다시 프리뷰하면 이전 세션을 대체한다.
+- 항목 수(PREVIEW_SESSION_MAX_ENTRIES)나 총 바이트(PREVIEW_SESSION_MAX_BYTES)를 넘으면
+  가장 오래 쓰이지 않은 세션부터 축출한다.
+- 워커 프로세스마다 별도 저장소다. WEB_CONCURRENCY > 1 이면 preview/commit이
+  같은 워커로 가도록(스티키 세션) 하거나, 만료 응답(410) 시 프리뷰를 다시 실행한다.
+"""
+from __future__ import annotations
+import os
+import secrets
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .metrics import CACHE_HITS, CACHE_MISSES
+from .settings import settings
+
+__all__ = ["PreviewStore", "PREVIEW_SESSIONS", "spool_path", "discard_spool"]
+
+
+def spool_path() -> str:
+    """프리뷰 원문을 쓸 새 임시 파일 경로 (파일은 만들어진 상태)."""
+    fd, path = tempfile.mkstemp(prefix="jargis-preview-", suffix=".md", dir=settings.preview_spool_dir)
+    os.close(fd)
+    return path
+
+
+def discard_spool(path: Optional[str]) -> None:
+    if path:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+class PreviewStore:
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # token -> (만료 시각, 크기, 세션)
+        self._items: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._by_hash: Dict[Tuple[Any, str], str] = {}  # (tenant_id, content_hash) -> token
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, session: Dict[str, Any], size: int) -> str:
+        token = secrets.token_urlsafe(24)
+        with self._lock:
+            key = self._key(session)
+            old = self._by_hash.get(key)
+            if old is not None:
+                self._drop(old)
+            self._items[token] = (time.monotonic() + self.ttl, size, session)
+            self._by_hash[key] = token
+            self._bytes += size
+            self._evict()
+        return token
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._items.get(token)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    self._drop(token)
+                CACHE_MISSES.inc(cache="preview_session")
+                return None
+            self._items.move_to_end(token)
+            CACHE_HITS.inc(cache="preview_session")
+            return item[2]
+
+    def pop(self, token: str) -> None:
+        with self._lock:
+            self._drop(token)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"sessions": len(self._items), "bytes": self._bytes}
+
+    @staticmethod
+    def _key(session: Dict[str, Any]) -> Tuple[Any, str]:
+        return (session.get("tenant_id"), session["content_hash"])
+
+    def _drop(self, token: str) -> None:
+        item = self._items.pop(token, None)
+        if item is None:
+            return
+        self._bytes -= item[1]
+        discard_spool(item[2].get("raw_path"))
+        key = self._key(item[2])
+        if self._by_hash.get(key) == token:
+            del self._by_hash[key]
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for token in [t for t, (exp, _, _) in self._items.items() if exp < now]:
+            self._drop(token)
+        while self._items and (
+            len(self._items) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            self._drop(next(iter(self._items)))
+
+
+PREVIEW_SESSIONS = PreviewStore(
+    settings.preview_session_ttl_seconds,
+    settings.preview_session_max_entries,
+    settings.preview_session_max_bytes,
+)
@@ -0,0 +1,92 @@
+# app/read_model.py
+"""
+검색 read model (search_chunks) 관리.
+
+embeddings ⋈ questions ⋈ companies ⋈ jobs 결과를 청크당 1행으로 둔다
+(벡터, 스니펫, 제목, 회사/직무 id와 이름, 연도).
+  - 커밋/업로드 시 바뀐 문항만 refresh_search_chunks()로 증분 갱신 (같은 트랜잭션)
+  - 청크/문항 삭제는 embeddings FK(ON DELETE CASCADE)로 따라 지워진다
+  - 기존 데이터/누락분은 백필:  uv run search-chunks [--batch 1000] [--all]
+
+/search, /search/batch, /questions/{id}/similar 는 이 테이블만 ANN 스캔한다.
+"""
+from __future__ import annotations
+import argparse
+import time
+from typing import Dict, Iterable
+
+from .db import engine, sql
+
+__all__ = ["refresh_search_chunks", "backfill_search_chunks"]
+
+_DELETE_SQL = "DELETE FROM search_chunks WHERE question_id = ANY(:qids)"
+
+_INSERT_SQL = """
+    INSERT INTO search_chunks (
+        embedding_id, question_id, chunk_id, model, embedding, snippet,
+        title, company_id, job_id, year, company, job, tenant_id, updated_at
+    )
+    SELECT
+        e.id, e.question_id, e.chunk_id, e.model, e.embedding, LEFT(e.chunk_text, 240),
+        q.title, q.company_id, q.job_id, q.year, c.name, j.name, q.tenant_id, now()
+    FROM embeddings e
+    JOIN questions q ON q.id = e.question_id
+    LEFT JOIN companies c ON c.id = q.company_id
+    LEFT JOIN jobs j ON j.id = q.job_id
+    WHERE e.question_id = ANY(:qids)
+"""
+
+
+def refresh_search_chunks(conn, question_ids: Iterable[int]) -> int:
+    """주어진 문항들의 read model 행을 다시 만든다 (모든 모델). 삽입된 행 수를 반환."""
+    qids = sorted(set(question_ids))
+    if not qids:
+        return 0
+    conn.execute(sql(_DELETE_SQL), {"qids": qids})
+    return conn.execute(sql(_INSERT_SQL), {"qids": qids}).rowcount
+
+
+def backfill_search_chunks(batch: int = 1000, only_missing: bool = True) -> Dict[str, float]:
+    """question_id 순서로 batch개씩 다시 만든다 (배치마다 커밋)."""
+    missing = (
+        """
+          AND NOT EXISTS (
+              SELECT 1 FROM search_chunks s WHERE s.embedding_id = e.id
+          )
+        """
+        if only_missing
+        else ""
+    )
+    next_qids_sql = f"""
+        SELECT DISTINCT e.question_id FROM embeddings e
+        WHERE e.question_id > :after
+        {missing}
+        ORDER BY e.question_id
+        LIMIT :n
+    """
+    t0 = time.perf_counter()
+    rows = 0
+    after = 0
+    while True:
+        with engine.begin() as conn:
+            qids = conn.execute(sql(next_qids_sql), {"after": after, "n": batch}).scalars().all()
+            if not qids:
+                break
+            rows += refresh_search_chunks(conn, qids)
+        after = qids[-1]
+        print(f"  {rows} chunks", flush=True)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE search_chunks")
+    return {"chunks": rows, "seconds": round(time.perf_counter() - t0, 2)}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="검색 read model 백필 (search_chunks)")
+    ap.add_argument("--batch", type=int, default=1000, help="트랜잭션당 문항 수")
+    ap.add_argument("--all", action="store_true", help="이미 있는 행도 다시 만듦 (메타 변경 반영)")
+    args = ap.parse_args()
+    print(backfill_search_chunks(args.batch, only_missing=not args.all))
+
+
+if __name__ == "__main__":
+    main()
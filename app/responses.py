@@ -0,0 +1,52 @@
+# app/responses.py
+"""
+응답 직렬화 / 콘텐츠 협상.
+
+    return render(request, {"hits": hits, "model": model})
+
+- Accept: application/x-msgpack → MessagePack (msgpack 설치 시, 아니면 JSON)
+- 그 외 → JSON (orjson 설치 시 orjson, 아니면 표준 json)
+검색처럼 DB 행을 그대로 내보내는 경로에서 Pydantic 모델 생성/검증을 건너뛰기 위한 것.
+응답 스키마 문서화는 라우터의 response_model이 그대로 담당한다.
+"""
+from __future__ import annotations
+import json
+from typing import Any
+
+from fastapi import Request, Response
+
+__all__ = ["MSGPACK", "JSON", "wants_msgpack", "encode", "render"]
+
+try:  # 선택 의존성: 기본 JSON 직렬화기
+    import orjson
+except Exception:  # pragma: no cover - orjson 미설치 환경
+    orjson = None
+
+try:  # 선택 의존성: Accept 협상으로만 사용
+    import msgpack
+except Exception:  # pragma: no cover - msgpack 미설치 환경
+    msgpack = None
+
+MSGPACK = "application/x-msgpack"
+JSON = "application/json"
+
+
+def wants_msgpack(request: Request) -> bool:
+    return msgpack is not None and MSGPACK in request.headers.get("accept", "")
+
+
+def encode(payload: Any, media_type: str = JSON) -> bytes:
+    if media_type == MSGPACK:
+        return msgpack.packb(payload, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def render(request: Request, payload: Any) -> Response:
+    media_type = MSGPACK if wants_msgpack(request) else JSON
+    return Response(
+        content=encode(payload, media_type),
+        media_type=media_type,
+        headers={"Vary": "Accept"},
+    )
@@ -1,13 +1,16 @@
 # app/routers/draft.py
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from sqlalchemy import text
 from ..db import engine
+from ..metrics import ROWS_SCANNED, timed
 from ..settings import settings
-from openai import OpenAI
+from ..tracing import set_openai_usage
+from ..clients import get_openai
+from ..tenants import Tenant, current_tenant
+from ..usage import CHAT, record_usage
 
-client = OpenAI(api_key=settings.openai_api_key)
 router = APIRouter()
 
 
@@ -25,19 +28,31 @@ class DraftResponse(BaseModel):
 
 # ---------- 엔드포인트 ----------
 @router.post("/draft", response_model=DraftResponse)
-def draft(req: DraftRequest):
-    # 1) 관련 청크 가져오기
+def draft(
+    req: DraftRequest,
+    client=Depends(get_openai),
+    tenant: Tenant = Depends(current_tenant),
+):
+    # 1) 관련 청크 가져오기 (다른 테넌트 문항이면 없는 것과 같게 404)
+    #    모델별로 같은 청크가 따로 저장되므로 현재 모델 행만 (중복 방지)
     sql = """
         SELECT chunk_text
         FROM embeddings
-        WHERE question_id = :qid
+        WHERE question_id = :qid AND tenant_id = :tenant AND model = :model
         ORDER BY chunk_id ASC
         LIMIT :topk
     """
-    with engine.connect() as conn:
+    with timed("draft", "db"), engine.connect() as conn:
         rows = conn.execute(
-            text(sql), {"qid": req.question_id, "topk": req.top_k}
+            text(sql),
+            {
+                "qid": req.question_id,
+                "tenant": tenant.id,
+                "model": settings.embedding_model,
+                "topk": req.top_k,
+            },
         ).fetchall()
+    ROWS_SCANNED.inc(len(rows), endpoint="draft")
 
     if not rows:
         raise HTTPException(
@@ -50,32 +65,47 @@ def draft(req: DraftRequest):
 
     # 2) GPT 호출
     try:
-        completion = client.chat.completions.create(
-            model="gpt-4o-mini",  # 빠르고 저렴한 모델 (필요시 교체 가능)
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant that drafts Korean job application answers.",
-                },
-                {
-                    "role": "user",
-                    "content": f"""
+        with timed(
+            "draft",
+            "llm",
+            **{"openai.model": "gpt-4o-mini", "draft.context_chunks": len(context_chunks)},
+        ) as sp:
+            completion = client.chat.completions.create(
+                model="gpt-4o-mini",  # 빠르고 저렴한 모델 (필요시 교체 가능)
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a helpful assistant that drafts Korean job application answers.",
+                    },
+                    {
+                        "role": "user",
+                        "content": f"""
 다음 자기소개서 문항 관련 내용을 참고해 주세요:
 
 {context}
 
 이 문항에 대해 300자 내외의 한국어 초안을 작성해 주세요.
                 """,
-                },
-            ],
-            max_tokens=400,
-            temperature=0.7,
-        )
+                    },
+                ],
+                max_tokens=400,
+                temperature=0.7,
+            )
+            set_openai_usage(sp, completion.usage)
         draft_text = completion.choices[0].message.content.strip()
     except Exception as e:
         raise HTTPException(
             status_code=502, detail=f"OpenAI draft generation error: {e}"
         )
+    if completion.usage:
+        record_usage(
+            "draft",
+            CHAT,
+            "gpt-4o-mini",
+            tenant.id,
+            prompt_tokens=completion.usage.prompt_tokens,
+            completion_tokens=completion.usage.completion_tokens,
+        )
 
     return DraftResponse(
         question_id=req.question_id,
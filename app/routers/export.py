@@ -0,0 +1,52 @@
+# app/routers/export.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from ..export import FORMATS, KINDS, NDJSON, PARQUET, export_stream
+from ..tenants import Tenant, current_tenant
+
+router = APIRouter()
+
+
+@router.get("/export")
+def export(
+    kind: str = Query("chunks", description="questions | chunks"),
+    format: str = Query("ndjson", description="ndjson | parquet"),
+    vectors: bool = Query(False, description="chunks: 임베딩 벡터 포함"),
+    company: Optional[str] = Query(None, description="회사명 필터"),
+    job: Optional[str] = Query(None, description="직무명 필터"),
+    year_min: Optional[int] = Query(None, description="연도 하한"),
+    year_max: Optional[int] = Query(None, description="연도 상한"),
+    tenant: Tenant = Depends(current_tenant),
+):
+    """
+    문항/청크(+벡터) 스트리밍 내보내기 (요청 테넌트 데이터만). 서버 측 커서로 조금씩 읽어 바로 전송한다.
+    """
+    if kind not in KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {KINDS}")
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {FORMATS}")
+    if format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+
+    stream = export_stream(
+        format,
+        kind=kind,
+        vectors=vectors,
+        company=company,
+        job=job,
+        year_min=year_min,
+        year_max=year_max,
+        tenant_id=tenant.id,
+    )
+    ext = "parquet" if format == "parquet" else "ndjson"
+    return StreamingResponse(
+        stream,
+        media_type=PARQUET if format == "parquet" else NDJSON,
+        headers={"Content-Disposition": f'attachment; filename="jargis_{kind}.{ext}"'},
+    )
@@ -1,13 +1,33 @@
+import os
+import time
+
 from fastapi import APIRouter
-from ..db import engine
+from ..db import engine, pool_metrics
+from ..settings import settings
 
 router = APIRouter()
 
-@router.get("/healthz")
-def healthz():
+# 마지막 DB 프로브 결과 (monotonic 시각, 응답) — 잦은 프로브가 풀을 점유하지 않게
+_last_probe: tuple[float, dict] | None = None
+
+
+def _probe_db() -> dict:
     try:
         with engine.connect() as conn:
             conn.exec_driver_sql("SELECT 1")
         return {"status": "ok"}
     except Exception as e:
         return {"status": "error", "detail": str(e)}
+
+
+@router.get("/healthz")
+def healthz():
+    global _last_probe
+    now = time.monotonic()
+    if _last_probe is None or now - _last_probe[0] >= settings.healthz_cache_seconds:
+        _last_probe = (now, _probe_db())
+    return {
+        **_last_probe[1],
+        "pool": pool_metrics(),
+        "worker": {"pid": os.getpid(), "workers": settings.web_concurrency},
+    }
@@ -0,0 +1,20 @@
+# app/routers/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ..db import pool_metrics
+from ..metrics import render_prometheus
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    # 풀 상태는 스크레이프 시점 스냅샷을 게이지로 노출
+    gauges = {
+        f"jargis_db_pool_{k}": v
+        for k, v in pool_metrics().items()
+        if isinstance(v, (int, float))
+    }
+    return PlainTextResponse(
+        render_prometheus(gauges), media_type="text/plain; version=0.0.4"
+    )
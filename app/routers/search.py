@@ -1,14 +1,17 @@
 # app/routers/search.py
-from typing import Optional, List, Dict, Any
-from fastapi import APIRouter, HTTPException
+import unicodedata
+from typing import Optional, List, Dict, Any, Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel, Field
-from sqlalchemy import text
-from ..db import engine
+from ..cache import EMBED_CACHE, EMBED_FLIGHT, SEARCH_CACHE, SEARCH_FLIGHT, generation
+from ..clients import get_openai
+from ..db import engine, sql
+from ..metrics import ROWS_SCANNED, timed
+from ..responses import render
 from ..settings import settings
-
-from openai import OpenAI
-
-client = OpenAI(api_key=settings.openai_api_key)
+from ..tenants import Tenant, ann_order, current_tenant
+from ..tracing import current_span, set_openai_usage
+from ..usage import EMBEDDING, embed_texts, plan_embedding, record_usage
 
 router = APIRouter()
 
@@ -21,6 +24,12 @@ class SearchRequest(BaseModel):
     job: Optional[str] = Field(None, description="직무명 필터")
     year_min: Optional[int] = Field(None, description="연도 하한")
     year_max: Optional[int] = Field(None, description="연도 상한")
+    mode: Literal["chunk", "two_stage"] = Field(
+        "chunk", description="chunk: 청크 전체 검색 | two_stage: 문항 centroid 후보 → 청크 재정렬"
+    )
+    collapse: bool = Field(
+        False, description="의미 중복 클러스터(dedupe-cluster)당 가장 가까운 결과 1건만"
+    )
 
 
 class SearchHit(BaseModel):
@@ -33,6 +42,7 @@ class SearchHit(BaseModel):
     year: Optional[int]
     distance: float  # pgvector cosine distance (낮을수록 유사)
     similarity: float  # 1 - distance (참고용)
+    cluster_id: Optional[int] = None  # collapse 시 소속 중복 클러스터 (없으면 단독)
 
 
 class SearchResponse(BaseModel):
@@ -40,74 +50,519 @@ class SearchResponse(BaseModel):
     model: str
 
 
+HIT_FIELDS = tuple(SearchHit.model_fields)
+
+
+def hit_dict(row) -> Dict[str, Any]:
+    """DB 행 → SearchHit 와 같은 모양의 dict (모델 생성/검증 생략, 없는 키는 None)."""
+    return {k: row.get(k) for k in HIT_FIELDS}
+
+
 def to_pgvector_literal(vec: List[float]) -> str:
     return "[" + ",".join(f"{x:.8f}" for x in vec) + "]"
 
 
-# --------- 엔드포인트 ----------
-@router.post("/search", response_model=SearchResponse)
-def search(req: SearchRequest):
-    query = req.query.strip()
-    if not query:
-        raise HTTPException(status_code=400, detail="Empty query")
+def embed_queries(
+    client, texts: List[str], endpoint: str, tenant: Optional[Tenant] = None
+) -> List[List[float]]:
+    """
+    질의 임베딩 (여러 개면 배치 호출, 한도를 넘으면 나눠서). 실패 시 502.
+    호출 전 토큰 추정으로 상한/테넌트 한도를 확인하고(413/429), 사용량은 장부에 남는다.
+    """
+    counts = plan_embedding(texts, tenant)
+    try:
+        return embed_texts(client, texts, endpoint, tenant, counts=counts)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"OpenAI embeddings error: {e}")
+
+
+def embed_query(client, query: str, tenant: Tenant, endpoint: str = "search") -> List[float]:
+    """
+    질의 1개 임베딩 (캐시 → 없으면 같은 질의의 동시 요청끼리 OpenAI 1회).
+    벡터는 테넌트와 무관하므로 호출·캐시 채우기만 공유하고, 한도 확인(429)과 사용량 기록은
+    요청마다 자기 테넌트로 한다 (한 테넌트의 429가 다른 테넌트 요청으로 번지지 않음).
+    """
+    key = (settings.embedding_model, query)
+    qvec = EMBED_CACHE.get(key)
+    if qvec is not None:
+        return qvec
+    counts = plan_embedding([query], tenant)
+    qvec, tokens = EMBED_FLIGHT.do(key, lambda: _embed_shared(client, query, key, endpoint))
+    record_usage(
+        endpoint,
+        EMBEDDING,
+        settings.embedding_model,
+        tenant.id,
+        estimated_tokens=counts[0],
+        prompt_tokens=tokens if tokens is not None else counts[0],
+    )
+    return qvec
+
 
-    # 1) 쿼리 임베딩
+def _embed_shared(client, query: str, key, endpoint: str):
+    """EMBED_FLIGHT 안에서 도는 부분: OpenAI 호출 + 캐시 채우기만. (벡터, 실제 토큰)"""
     try:
-        emb = client.embeddings.create(
-            model=settings.embedding_model,  # "text-embedding-3-small"
-            input=query,
-        )
-        qvec = emb.data[0].embedding
+        with timed(
+            endpoint, "embed", **{"openai.model": settings.embedding_model, "openai.inputs": 1}
+        ) as sp:
+            emb = client.embeddings.create(model=settings.embedding_model, input=[query])
+            set_openai_usage(sp, emb.usage)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"OpenAI embeddings error: {e}")
+    qvec = emb.data[0].embedding
+    EMBED_CACHE.set(key, qvec)
+    return qvec, emb.usage.total_tokens if emb.usage else None
 
-    qvec_lit = to_pgvector_literal(qvec)
 
-    # 2) 벡터검색 + 메타 필터
-    #    distance = e.embedding <-> :qvec::vector (코사인 거리, 낮을수록 근접)
-    #    similarity = 1 - distance (참고용)
-    filters_sql = []
-    params: Dict[str, Any] = {"qvec": qvec_lit, "topk": req.top_k}
-
-    if req.company:
-        filters_sql.append("c.name ILIKE :company")
-        params["company"] = f"%{req.company}%"
-    if req.job:
-        filters_sql.append("j.name ILIKE :job")
-        params["job"] = f"%{req.job}%"
-    if req.year_min is not None:
-        filters_sql.append("q.year >= :ymin")
-        params["ymin"] = req.year_min
-    if req.year_max is not None:
-        filters_sql.append("q.year <= :ymax")
-        params["ymax"] = req.year_max
-
-    where_clause = ""
-    if filters_sql:
-        where_clause = "WHERE " + " AND ".join(filters_sql)
-
-    sql = f"""
-        SELECT
-            q.id               AS question_id,
-            e.chunk_id         AS chunk_id,
-            q.title            AS title,
-            LEFT(e.chunk_text, 240) AS snippet,
-            c.name             AS company,
-            j.name             AS job,
-            q.year             AS year,
-            (e.embedding <-> CAST(:qvec AS vector)) AS distance,
-            (1 - (e.embedding <-> CAST(:qvec AS vector))) AS similarity
-        FROM embeddings e
-        JOIN questions q ON q.id = e.question_id
+def build_filters(
+    company: Optional[str],
+    job: Optional[str],
+    year_min: Optional[int],
+    year_max: Optional[int],
+    read_model: bool = False,
+) -> tuple[List[str], Dict[str, Any]]:
+    """
+    메타 필터 → (WHERE 조건 목록, 바인드 파라미터).
+    별칭: c=companies, j=jobs, q=questions / read_model=True면 s=search_chunks.
+    """
+    company_col, job_col, year_col = (
+        ("s.company", "s.job", "s.year") if read_model else ("c.name", "j.name", "q.year")
+    )
+    filters_sql: List[str] = []
+    params: Dict[str, Any] = {}
+    if company:
+        filters_sql.append(f"{company_col} ILIKE :company")
+        params["company"] = f"%{company}%"
+    if job:
+        filters_sql.append(f"{job_col} ILIKE :job")
+        params["job"] = f"%{job}%"
+    if year_min is not None:
+        filters_sql.append(f"{year_col} >= :ymin")
+        params["ymin"] = year_min
+    if year_max is not None:
+        filters_sql.append(f"{year_col} <= :ymax")
+        params["ymax"] = year_max
+    return filters_sql, params
+
+
+# 검색은 read model(search_chunks) 한 테이블만 읽는다: 조인 없이 ANN 스캔 + 같은 행에서 필터.
+# 인덱스가 vector_cosine_ops 이므로 거리/정렬 모두 <=> (코사인 거리) 를 써야 인덱스를 탄다.
+# 모든 검색은 s.tenant_id (두 단계 1단계는 qe.tenant_id) = :tenant 로 한정. ANN 인덱스는 전용 테넌트별 partial 인덱스뿐이라
+# 정렬식은 ann_order()로 만든다 (전용 인덱스 없는 테넌트는 tenant_id 인덱스 + 정확 정렬).
+HIT_COLUMNS = """
+        s.question_id, s.chunk_id, s.title, s.snippet, s.company, s.job, s.year"""
+
+
+# 두 단계 검색
+#   1) question_embeddings(문항당 벡터 1개)에서 메타 필터를 적용해 후보 문항 ncand개
+#      (인덱스가 vector_cosine_ops 이므로 <=> 로 정렬해야 인덱스를 탄다)
+#   2) 후보 문항의 청크(search_chunks)만 질의 벡터와 비교해 top_k 재정렬
+TWO_STAGE_SQL = """
+    WITH cand AS (
+        SELECT qe.question_id
+        FROM question_embeddings qe
+        JOIN questions q ON q.id = qe.question_id
         LEFT JOIN companies c ON c.id = q.company_id
         LEFT JOIN jobs j ON j.id = q.job_id
-        {where_clause}
-        ORDER BY distance ASC
-        LIMIT :topk
+        WHERE qe.model = :model
+          AND qe.tenant_id = :tenant
+        {filters}
+        ORDER BY {order}
+        LIMIT :ncand
+    )
+    SELECT {hit_columns},
+        (s.embedding <=> CAST(:qvec AS vector)) AS distance,
+        (1 - (s.embedding <=> CAST(:qvec AS vector))) AS similarity
+    FROM cand
+    JOIN search_chunks s ON s.question_id = cand.question_id AND s.model = :model
+    ORDER BY distance ASC
+    LIMIT :topk
+"""
+
+
+COLLAPSE_SQL = """
+    SELECT question_id, chunk_id, title, snippet, company, job, year,
+           distance, similarity, cluster_id
+    FROM (
+        SELECT h.*, m.cluster_id,
+               ROW_NUMBER() OVER (
+                   PARTITION BY COALESCE(m.cluster_id, -h.question_id)
+                   ORDER BY h.distance
+               ) AS rn
+        FROM ({inner}) h
+        LEFT JOIN question_cluster_members m ON m.question_id = h.question_id
+    ) x
+    WHERE rn = 1
+    ORDER BY distance ASC
+    LIMIT :collapse_k
+"""
+
+
+# --------- 엔드포인트 ----------
+def normalize_query(text: str) -> str:
+    """캐시/합치기 키용: NFKC + 공백 정리 (대소문자는 임베딩에 영향이 있어 유지)."""
+    return unicodedata.normalize("NFKC", " ".join(text.split()))
+
+
+@router.post("/search", response_model=SearchResponse)
+def search(
+    req: SearchRequest,
+    request: Request,
+    client=Depends(get_openai),
+    tenant: Tenant = Depends(current_tenant),
+):
+    query = normalize_query(req.query)
+    if not query:
+        raise HTTPException(status_code=400, detail="Empty query")
+
+    # 같은 테넌트+질의+필터+모델: 캐시(세대/TTL) → 없으면 동시 요청끼리 1회만 실행
+    key = (
+        tenant.id,
+        settings.embedding_model,
+        query,
+        req.top_k,
+        req.company,
+        req.job,
+        req.year_min,
+        req.year_max,
+        req.mode,
+        req.collapse,
+    )
+    payload = SEARCH_CACHE.get(key)
+    current_span().set("search.cache_hit", payload is not None)
+    if payload is None:
+        gen = generation()
+        payload = SEARCH_FLIGHT.do(key, lambda: run_search(req, query, client, tenant))
+        SEARCH_CACHE.set(key, payload, gen)
+
+    # 직렬화까지 직접 수행해 단계 시간을 잰다 (FastAPI의 재검증/재직렬화도 생략)
+    # Accept에 따라 JSON(orjson) 또는 MessagePack
+    with timed("search", "serialize"):
+        return render(request, payload)
+
+
+def run_search(req: SearchRequest, query: str, client, tenant: Tenant) -> Dict[str, Any]:
+    """임베딩 + 벡터검색 → 응답 payload (dict)."""
+    # 1) 쿼리 임베딩 (캐시 → 없으면 필터/테넌트만 다른 동시 요청끼리 OpenAI 1회)
+    qvec = embed_query(client, query, tenant)
+
+    # 2) 벡터검색 + 메타 필터
+    query_sql, params = build_search_sql(req, to_pgvector_literal(qvec), tenant)
+    with timed("search", "db") as sp, engine.connect() as conn:
+        rows = conn.execute(sql(query_sql), params).mappings().all()
+        sp.set("db.rows", len(rows))
+        sp.set("search.mode", req.mode)
+        sp.set("search.collapse", req.collapse)
+    ROWS_SCANNED.inc(len(rows), endpoint="search")
+    return {"hits": [hit_dict(row) for row in rows], "model": settings.embedding_model}
+
+
+def build_search_sql(
+    req: SearchRequest, qvec_lit: str, tenant: Tenant
+) -> tuple[str, Dict[str, Any]]:
+    """검색 모드/필터/collapse → (SQL, 바인드 파라미터). 테넌트 행만 검색한다."""
+    #    distance = s.embedding <=> :qvec (코사인 거리, 낮을수록 근접)
+    #    similarity = 1 - distance (코사인 유사도)
+    if req.mode == "two_stage":
+        # 1단계 필터는 question_embeddings ⋈ questions 쪽 (c/j/q 별칭)
+        filters_sql, params = build_filters(req.company, req.job, req.year_min, req.year_max)
+        query_sql = TWO_STAGE_SQL.format(
+            filters="".join(f"AND {f} " for f in filters_sql),
+            hit_columns=HIT_COLUMNS,
+            order=ann_order("qe.embedding <=> CAST(:qvec AS vector)", tenant),
+        )
+        params["ncand"] = max(settings.search_two_stage_candidates, req.top_k)
+    else:
+        filters_sql, params = build_filters(
+            req.company, req.job, req.year_min, req.year_max, read_model=True
+        )
+        query_sql = f"""
+            SELECT {HIT_COLUMNS},
+                (s.embedding <=> CAST(:qvec AS vector)) AS distance,
+                (1 - (s.embedding <=> CAST(:qvec AS vector))) AS similarity
+            FROM search_chunks s
+            WHERE s.model = :model
+              AND s.tenant_id = :tenant
+            {"".join(f"AND {f} " for f in filters_sql)}
+            ORDER BY {ann_order("s.embedding <=> CAST(:qvec AS vector)", tenant)}
+            LIMIT :topk
+        """
+    params.update(
+        {
+            "qvec": qvec_lit,
+            "topk": req.top_k,
+            "model": settings.embedding_model,
+            "tenant": tenant.id,
+        }
+    )
+
+    if req.collapse:
+        # 안쪽 검색은 넉넉히 뽑고, 클러스터(없으면 문항 자신)별 최상위 1건만 남긴다
+        params["collapse_k"] = req.top_k
+        params["topk"] = req.top_k * settings.search_collapse_oversample
+        query_sql = COLLAPSE_SQL.format(inner=query_sql)
+    return query_sql, params
+
+
+# 문자열 포함 검색 (입력 중 검색의 즉시 결과). pg_trgm GIN 인덱스로 ILIKE '%..%'를 처리하고
+# word_similarity 순으로 정렬. distance/similarity는 벡터 결과와 모양만 맞춘 값이다.
+LEXICAL_SQL = """
+    SELECT
+        q.id               AS question_id,
+        e.chunk_id         AS chunk_id,
+        q.title            AS title,
+        LEFT(e.chunk_text, 240) AS snippet,
+        c.name             AS company,
+        j.name             AS job,
+        q.year             AS year,
+        1 - word_similarity(:q, e.chunk_text) AS distance,
+        word_similarity(:q, e.chunk_text) AS similarity
+    FROM embeddings e
+    JOIN questions q ON q.id = e.question_id
+    LEFT JOIN companies c ON c.id = q.company_id
+    LEFT JOIN jobs j ON j.id = q.job_id
+    WHERE e.model = :model
+      AND e.tenant_id = :tenant
+      AND e.chunk_text ILIKE :pattern
+      {filters}
+    ORDER BY similarity DESC, q.id, e.chunk_id
+    LIMIT :topk
+"""
+
+
+def build_lexical_sql(
+    req: SearchRequest, query: str, tenant: Tenant
+) -> tuple[str, Dict[str, Any]]:
+    filters_sql, params = build_filters(req.company, req.job, req.year_min, req.year_max)
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    params.update(
+        {
+            "q": query,
+            "pattern": f"%{escaped}%",
+            "model": settings.embedding_model,
+            "topk": req.top_k,
+            "tenant": tenant.id,
+        }
+    )
+    return LEXICAL_SQL.format(filters="".join(f"AND {f} " for f in filters_sql)), params
+
+
+# --------- 배치 검색 ----------
+class BatchSearchRequest(BaseModel):
+    queries: List[SearchRequest] = Field(
+        ..., min_length=1, max_length=256, description="질의 목록 (최대 256개)"
+    )
+
+
+class BatchSearchResult(BaseModel):
+    index: int  # 요청 queries 내 위치
+    hits: List[SearchHit]
+
+
+class BatchSearchResponse(BaseModel):
+    results: List[BatchSearchResult]
+    model: str
+
+
+# 질의별 벡터/필터/top_k를 배열로 넘겨 unnest → 질의마다 LATERAL 벡터 검색.
+# 필터는 "NULL이면 통과" 형태라 질의마다 다른 조합도 하나의 문장으로 처리된다.
+BATCH_SEARCH_SQL = """
+    SELECT
+        qs.ord - 1         AS idx,
+        h.question_id, h.chunk_id, h.title, h.snippet,
+        h.company, h.job, h.year, h.distance,
+        1 - h.distance     AS similarity
+    FROM unnest(
+        CAST(:qvecs AS text[]),
+        CAST(:topks AS int[]),
+        CAST(:companies AS text[]),
+        CAST(:jobs AS text[]),
+        CAST(:ymins AS int[]),
+        CAST(:ymaxs AS int[])
+    ) WITH ORDINALITY AS qs(qvec, topk, company, job, ymin, ymax, ord)
+    CROSS JOIN LATERAL (
+        SELECT {hit_columns},
+            (s.embedding <=> CAST(qs.qvec AS vector)) AS distance
+        FROM search_chunks s
+        WHERE s.model = :model
+          AND s.tenant_id = :tenant
+          AND (qs.company IS NULL OR s.company ILIKE qs.company)
+          AND (qs.job IS NULL OR s.job ILIKE qs.job)
+          AND (qs.ymin IS NULL OR s.year >= qs.ymin)
+          AND (qs.ymax IS NULL OR s.year <= qs.ymax)
+        ORDER BY {order}
+        LIMIT qs.topk
+    ) h
+    ORDER BY qs.ord, h.distance
+"""
+
+
+@router.post("/search/batch", response_model=BatchSearchResponse)
+def search_batch(
+    req: BatchSearchRequest,
+    request: Request,
+    client=Depends(get_openai),
+    tenant: Tenant = Depends(current_tenant),
+):
+    """
+    여러 질의를 한 번에 검색: 임베딩 1회(배치) + SQL 1회.
+    같은 질의 텍스트는 한 번만 임베딩한다 (/search와 같은 normalize_query로 정규화 →
+    질의 임베딩 캐시 키도 공유).
     """
+    queries = [normalize_query(r.query) for r in req.queries]
+    empty = [i for i, q in enumerate(queries) if not q]
+    if empty:
+        raise HTTPException(status_code=400, detail=f"Empty query at index {empty}")
 
-    with engine.connect() as conn:
-        rows = conn.execute(text(sql), params).mappings().all()
+    # 1) 고유 질의만 배치 임베딩
+    unique = list(dict.fromkeys(queries))
+    vec_by_query = dict(
+        zip(unique, (to_pgvector_literal(v) for v in embed_queries(client, unique, "search_batch", tenant)))
+    )
 
-    hits = [SearchHit(**row) for row in rows]
-    return SearchResponse(hits=hits, model=settings.embedding_model)
+    # 2) 단일 SQL (LATERAL)
+    params = {
+        "qvecs": [vec_by_query[q] for q in queries],
+        "topks": [r.top_k for r in req.queries],
+        "companies": [f"%{r.company}%" if r.company else None for r in req.queries],
+        "jobs": [f"%{r.job}%" if r.job else None for r in req.queries],
+        "ymins": [r.year_min for r in req.queries],
+        "ymaxs": [r.year_max for r in req.queries],
+        "model": settings.embedding_model,
+        "tenant": tenant.id,
+    }
+    query_sql = BATCH_SEARCH_SQL.format(
+        hit_columns=HIT_COLUMNS,
+        order=ann_order("s.embedding <=> CAST(qs.qvec AS vector)", tenant),
+    )
+    with timed("search_batch", "db") as sp, engine.connect() as conn:
+        rows = conn.execute(sql(query_sql), params).mappings().all()
+        sp.set("db.rows", len(rows))
+        sp.set("search.queries", len(queries))
+    ROWS_SCANNED.inc(len(rows), endpoint="search_batch")
+
+    with timed("search_batch", "serialize"):
+        grouped: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        for row in rows:
+            grouped[row["idx"]].append(hit_dict(row))
+        return render(
+            request,
+            {
+                "results": [{"index": i, "hits": h} for i, h in enumerate(grouped)],
+                "model": settings.embedding_model,
+            },
+        )
+
+
+# --------- 유사 문항 (More like this) ----------
+# 이미 저장된 청크 벡터를 질의로 사용 → OpenAI 호출 없이 SQL 1회.
+#   mean: 문항의 청크 벡터 평균(AVG(vector)) 하나로 ANN 검색
+#   max : 청크별로 ANN 검색 후, 문항마다 가장 가까운 청크 거리(=최대 유사도) 1건으로 합침
+# 평균 벡터는 상관 없는 스칼라 서브쿼리 → 한 번만 계산되는 InitPlan 상수라 ORDER BY가 hnsw를 탄다
+# (CTE를 조인하면 정렬 피연산자가 행마다 오는 값이 되어 인덱스를 못 쓴다)
+SIMILAR_MEAN_QVEC = """(
+        SELECT AVG(embedding) FROM embeddings
+        WHERE question_id = :qid AND model = :model AND tenant_id = :tenant
+    )"""
+
+SIMILAR_MEAN_SQL = """
+    SELECT {hit_columns},
+        (s.embedding <=> {qvec}) AS distance,
+        (1 - (s.embedding <=> {qvec})) AS similarity
+    FROM search_chunks s
+    WHERE {qvec} IS NOT NULL
+      AND s.model = :model
+      AND s.tenant_id = :tenant
+      AND s.question_id <> :qid
+      {filters}
+    ORDER BY {order}
+    LIMIT :topk
+"""
+
+# 원본 청크마다 이웃 청크를 넉넉히(:ncand) 뽑고, 문항별 가장 가까운 청크 1건만 남긴 뒤 top_k
+SIMILAR_MAX_SQL = """
+    WITH src AS (
+        SELECT embedding
+        FROM embeddings
+        WHERE question_id = :qid AND model = :model AND tenant_id = :tenant
+    )
+    SELECT
+        question_id, chunk_id, title, snippet, company, job, year,
+        distance,
+        1 - distance AS similarity
+    FROM (
+        SELECT DISTINCT ON (h.question_id) h.*
+        FROM src
+        CROSS JOIN LATERAL (
+            SELECT {hit_columns},
+                (s.embedding <=> src.embedding) AS distance
+            FROM search_chunks s
+            WHERE s.model = :model
+              AND s.tenant_id = :tenant
+              AND s.question_id <> :qid
+              {filters}
+            ORDER BY {order}
+            LIMIT :ncand
+        ) h
+        ORDER BY h.question_id, h.distance
+    ) best
+    ORDER BY distance ASC
+    LIMIT :topk
+"""
+
+
+@router.get("/questions/{question_id}/similar", response_model=SearchResponse)
+def similar_questions(
+    request: Request,
+    question_id: int,
+    top_k: int = Query(5, ge=1, le=50),
+    pooling: str = Query("mean", pattern="^(mean|max)$", description="mean | max"),
+    company: Optional[str] = Query(None, description="회사명 필터"),
+    job: Optional[str] = Query(None, description="직무명 필터"),
+    year_min: Optional[int] = Query(None, description="연도 하한"),
+    year_max: Optional[int] = Query(None, description="연도 상한"),
+    tenant: Tenant = Depends(current_tenant),
+):
+    """저장된 청크 벡터로 유사 문항 검색 (자기 자신 제외, 재임베딩 없음, 같은 테넌트 안에서만)."""
+    filters_sql, params = build_filters(company, job, year_min, year_max, read_model=True)
+    params.update(
+        {"qid": question_id, "topk": top_k, "model": settings.embedding_model, "tenant": tenant.id}
+    )
+    if pooling == "max":
+        template, qvec = SIMILAR_MAX_SQL, "src.embedding"
+        # 같은 문항의 청크가 여러 건 걸려도 문항 top_k를 채우도록 (collapse와 같은 배수)
+        params["ncand"] = top_k * settings.search_collapse_oversample
+    else:
+        template, qvec = SIMILAR_MEAN_SQL, SIMILAR_MEAN_QVEC
+    filters = "".join(f"AND {f} " for f in filters_sql)
+    query_sql = template.format(
+        filters=filters,
+        hit_columns=HIT_COLUMNS,
+        qvec=qvec,
+        order=ann_order(f"s.embedding <=> {qvec}", tenant),
+    )
+
+    with timed("similar", "db") as sp, engine.connect() as conn:
+        rows = conn.execute(sql(query_sql), params).mappings().all()
+        sp.set("db.rows", len(rows))
+        sp.set("similar.pooling", pooling)
+        if not rows:
+            has_vectors = conn.execute(
+                sql(
+                    "SELECT 1 FROM embeddings "
+                    "WHERE question_id = :qid AND model = :model AND tenant_id = :tenant LIMIT 1"
+                ),
+                {"qid": question_id, "model": settings.embedding_model, "tenant": tenant.id},
+            ).first()
+            if not has_vectors:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No embeddings found for question {question_id}",
+                )
+    ROWS_SCANNED.inc(len(rows), endpoint="similar")
+
+    with timed("similar", "serialize"):
+        return render(
+            request,
+            {"hits": [hit_dict(row) for row in rows], "model": settings.embedding_model},
+        )
@@ -0,0 +1,210 @@
+# app/routers/search_live.py
+"""
+입력 중 검색 (WebSocket /search/live).
+
+클라이언트 → 서버 (키 입력마다, SearchRequest와 같은 필드):
+    {"query": "협업 갈", "top_k": 5, "company": null, "year_min": 2023}
+서버 → 클라이언트 (같은 seq 안에서 lexical → vector 순):
+    {"type": "lexical", "seq": 3, "query": "협업 갈", "hits": [...]}
+    {"type": "vector", "seq": 3, "query": "협업 갈", "hits": [...], "model": "..."}
+    {"type": "clear" | "error", "seq": 3, ...}
+
+- 서버 측 디바운스: 마지막 메시지 후 LIVE_SEARCH_DEBOUNCE_MS 동안 새 입력이 없을 때만 시작
+- 새 입력이 오면 이전 작업을 취소한다. 임베딩 HTTP 요청은 태스크 취소로 끊고,
+  실행 중인 SQL은 pg_cancel_backend로 중단 (statement_timeout은 안전망)
+- 질의 임베딩은 정규화한 질의 단위로 EMBED_CACHE에 남는다
+  → 지웠다 다시 친 접두어, 이어서 누른 /search 모두 OpenAI를 다시 부르지 않는다
+- lexical은 3글자 이상(트라이그램 인덱스 사용 가능), vector는 LIVE_SEARCH_MIN_CHARS 이상
+- 테넌트: X-Tenant 헤더 (브라우저는 헤더를 못 붙이므로 ?tenant= 도 허용). 식별 실패면 1008로 닫는다.
+  요청률은 디바운스를 통과한 검색 1회마다, 임베딩 토큰은 캐시에 없어 호출할 때만 센다.
+"""
+from __future__ import annotations
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+
+from ..cache import EMBED_CACHE
+from ..clients import get_async_openai
+from ..db import CancellableQuery, sql
+from ..metrics import ROWS_SCANNED, SEARCH_CANCELLED, timed
+from ..responses import encode
+from ..settings import settings
+from ..tenants import Tenant, resolve_tenant, take_request
+from ..tracing import set_openai_usage
+from ..usage import EMBEDDING, plan_embedding, record_usage
+from .search import (
+    SearchRequest,
+    build_lexical_sql,
+    build_search_sql,
+    hit_dict,
+    normalize_query,
+    to_pgvector_literal,
+)
+
+router = APIRouter()
+log = logging.getLogger(__name__)
+
+_TRGM_MIN = 3  # pg_trgm은 3글자 미만 패턴에 인덱스를 못 쓴다 (전체 스캔 방지)
+
+
+# ---------- 취소 가능한 단계 ----------
+async def _in_thread(fn, *args):
+    # starlette run_in_threadpool은 스레드가 끝날 때까지 취소를 미루므로 asyncio executor를 직접 쓴다
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+
+def _cancel_quietly(q: CancellableQuery) -> None:
+    try:
+        q.cancel()
+    except Exception as e:  # 취소 실패는 statement_timeout이 처리
+        log.warning("pg_cancel_backend failed: %s", e)
+
+
+async def _query(stage: str, query_sql: str, params: Dict[str, Any]) -> list:
+    q = CancellableQuery(settings.live_search_statement_timeout_ms)
+    try:
+        with timed("search_live", stage) as sp:
+            rows = await _in_thread(q.run, sql(query_sql), params)
+            sp.set("db.rows", len(rows))
+    except asyncio.CancelledError:
+        SEARCH_CANCELLED.inc(stage=stage)
+        # 기다리지 않는다 (새 질의가 취소 왕복을 기다리지 않게)
+        asyncio.get_running_loop().run_in_executor(None, _cancel_quietly, q)
+        raise
+    ROWS_SCANNED.inc(len(rows), endpoint="search_live")
+    return rows
+
+
+async def _embed(query: str, tenant: Tenant) -> List[float]:
+    key = (settings.embedding_model, query)
+    vec = EMBED_CACHE.get(key)
+    if vec is not None:
+        return vec
+    counts = await _in_thread(plan_embedding, [query], tenant)
+    try:
+        with timed(
+            "search_live", "embed", **{"openai.model": settings.embedding_model, "openai.inputs": 1}
+        ) as sp:
+            emb = await get_async_openai().embeddings.create(
+                model=settings.embedding_model, input=[query]
+            )
+            set_openai_usage(sp, emb.usage)
+    except asyncio.CancelledError:
+        SEARCH_CANCELLED.inc(stage="embed")
+        raise
+    record_usage(
+        "search_live",
+        EMBEDDING,
+        settings.embedding_model,
+        tenant.id,
+        estimated_tokens=counts[0],
+        prompt_tokens=emb.usage.total_tokens if emb.usage else counts[0],
+    )
+    vec = emb.data[0].embedding
+    EMBED_CACHE.set(key, vec)
+    return vec
+
+
+# ---------- 세션 ----------
+class _LiveSession:
+    """연결 1개. 진행 중인 작업은 최대 1개 (새 입력이 오면 이전 작업 취소)."""
+
+    def __init__(self, ws: WebSocket, tenant: Tenant) -> None:
+        self.ws = ws
+        self.tenant = tenant
+        self.seq = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def submit(self, msg: Dict[str, Any]) -> None:
+        self.seq += 1
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+        self.task = asyncio.create_task(self._run(self.seq, msg))
+
+    async def close(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except BaseException:
+                pass
+
+    async def _send(self, payload: Dict[str, Any]) -> None:
+        await self.ws.send_text(encode(payload).decode("utf-8"))
+
+    async def _run(self, seq: int, msg: Dict[str, Any]) -> None:
+        # 디바운스: 이 sleep 중에 새 입력이 오면 여기서 취소된다
+        await asyncio.sleep(settings.live_search_debounce_ms / 1000)
+        if not str(msg.get("query") or "").strip():
+            await self._send({"type": "clear", "seq": seq})
+            return
+        try:
+            req = SearchRequest.model_validate(msg)
+        except ValidationError as e:
+            await self._send({"type": "error", "seq": seq, "detail": str(e)})
+            return
+        query = normalize_query(req.query)
+        try:
+            take_request(self.tenant)
+            if len(query) >= _TRGM_MIN:
+                rows = await _query("lexical", *build_lexical_sql(req, query, self.tenant))
+                await self._send(
+                    {"type": "lexical", "seq": seq, "query": query, "hits": [hit_dict(r) for r in rows]}
+                )
+            if len(query) < settings.live_search_min_chars:
+                return
+            qvec = await _embed(query, self.tenant)
+            rows = await _query(
+                "vector", *build_search_sql(req, to_pgvector_literal(qvec), self.tenant)
+            )
+            await self._send(
+                {
+                    "type": "vector",
+                    "seq": seq,
+                    "query": query,
+                    "hits": [hit_dict(r) for r in rows],
+                    "model": settings.embedding_model,
+                }
+            )
+        except asyncio.CancelledError:
+            raise
+        except WebSocketDisconnect:
+            return
+        except HTTPException as e:  # 테넌트 요청률/토큰 한도
+            await self._send(
+                {"type": "error", "seq": seq, "status": e.status_code, "detail": e.detail}
+            )
+        except Exception as e:
+            log.warning("live search failed (seq=%d): %s", seq, e)
+            await self._send({"type": "error", "seq": seq, "detail": str(e)})
+
+
+@router.websocket("/search/live")
+async def search_live(ws: WebSocket):
+    slug = ws.headers.get("x-tenant") or ws.query_params.get("tenant")
+    try:
+        tenant = await _in_thread(resolve_tenant, slug)
+    except HTTPException as e:
+        await ws.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+        return
+    await ws.accept()
+    session = _LiveSession(ws, tenant)
+    try:
+        while True:
+            text = await ws.receive_text()
+            try:
+                msg = json.loads(text)
+            except ValueError:
+                await ws.send_text(encode({"type": "error", "detail": "invalid JSON"}).decode("utf-8"))
+                continue
+            if not isinstance(msg, dict):
+                msg = {"query": str(msg)}
+            session.submit(msg)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await session.close()
@@ -1,45 +1,24 @@
 # app/routers/upload.py
 from typing import Optional, List, Tuple
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from sqlalchemy import text
 from ..db import engine
 from ..settings import settings
-
-# OpenAI SDK (>=1.x)
-from openai import OpenAI
-
-client = OpenAI(api_key=settings.openai_api_key)
+from ..metrics import timed
+from ..utils.chunking import semantic_chunk
+from ..centroids import refresh_question_centroids
+from ..read_model import refresh_search_chunks
+from ..name_cache import COMPANIES, JOBS
+from ..cache import bump_generation
+from ..near_dup import index_question_signatures
+from ..clients import get_openai
+from ..tenants import Tenant, current_tenant
+from ..usage import embed_texts, plan_embedding
 
 router = APIRouter()
 
 
-# ---------- 유틸: 간단 청킹 ----------
-def simple_chunk(text: str, max_len: int = 800, overlap: int = 100) -> List[str]:
-    """
-    문자 길이 기반의 아주 단순한 청킹 (PoC용)
-    - max_len: 청크 최대 길이(문자)
-    - overlap: 이전 청크와 겹치는 길이
-    """
-    text = text.strip()
-    if not text:
-        return []
-
-    chunks = []
-    start = 0
-    n = len(text)
-    while start < n:
-        end = min(n, start + max_len)
-        chunk = text[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
-        if end == n:
-            break
-        # 오버랩 적용
-        start = max(0, end - overlap)
-    return chunks
-
-
 # ---------- 요청 스키마 ----------
 class UploadRequest(BaseModel):
     content: str = Field(..., description="자소서 문항/답변 원문(긴 텍스트)")
@@ -58,69 +37,35 @@ class UploadResponse(BaseModel):
 
 # ---------- 라우팅 ----------
 @router.post("/upload", response_model=UploadResponse)
-def upload(req: UploadRequest):
+def upload(
+    req: UploadRequest,
+    client=Depends(get_openai),
+    tenant: Tenant = Depends(current_tenant),
+):
     # 1) 청킹
-    chunks = simple_chunk(req.content, max_len=800, overlap=100)
+    chunks = semantic_chunk(req.content)
     if not chunks:
         raise HTTPException(status_code=400, detail="Empty content after preprocessing")
+    # 토큰 추정 → 상한/테넌트 한도 초과면 문항을 만들기 전에 413/429
+    counts = plan_embedding(chunks, tenant)
 
     # 2) 회사/직무 upsert → id 확보
-    with engine.begin() as conn:
-        company_id = None
-        job_id = None
-
-        if req.company:
-            res = conn.execute(
-                text(
-                    """
-                    INSERT INTO companies(name)
-                    VALUES (:name)
-                    ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
-                    RETURNING id
-                """
-                ),
-                {"name": req.company.strip()},
-            ).first()
-            company_id = (
-                res[0]
-                if res
-                else conn.execute(
-                    text("SELECT id FROM companies WHERE name = :name"),
-                    {"name": req.company.strip()},
-                ).scalar()
-            )
-
-        if req.job:
-            res = conn.execute(
-                text(
-                    """
-                    INSERT INTO jobs(name)
-                    VALUES (:name)
-                    ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
-                    RETURNING id
-                """
-                ),
-                {"name": req.job.strip()},
-            ).first()
-            job_id = (
-                res[0]
-                if res
-                else conn.execute(
-                    text("SELECT id FROM jobs WHERE name = :name"),
-                    {"name": req.job.strip()},
-                ).scalar()
-            )
+    with timed("upload", "db"), engine.begin() as conn:
+        # normalized_name → id 캐시 경유 (이미 있는 이름이면 DB 쓰기 없음)
+        company_id = COMPANIES.get_or_create(conn, req.company) if req.company else None
+        job_id = JOBS.get_or_create(conn, req.job) if req.job else None
 
         # 3) questions 행 생성
         q = conn.execute(
             text(
                 """
-                INSERT INTO questions(content, company_id, job_id, title, year)
-                VALUES (:content, :company_id, :job_id, :title, :year)
+                INSERT INTO questions(tenant_id, content, company_id, job_id, title, year)
+                VALUES (:tenant_id, :content, :company_id, :job_id, :title, :year)
                 RETURNING id
             """
             ),
             {
+                "tenant_id": tenant.id,
                 "content": req.content,
                 "company_id": company_id,
                 "job_id": job_id,
@@ -132,37 +77,36 @@ def upload(req: UploadRequest):
             raise HTTPException(status_code=500, detail="Failed to insert question")
         question_id = q[0]
 
-    # 4) OpenAI 임베딩 호출 (배치)
+    # 4) OpenAI 임베딩 호출 (배치, 요청 한도를 넘으면 나눠서 / 사용량은 장부에)
     try:
-        emb_res = client.embeddings.create(
-            model=settings.embedding_model,  # "text-embedding-3-small"
-            input=chunks,
-        )
-        vectors = [d.embedding for d in emb_res.data]  # List[List[float]]
+        vectors = embed_texts(client, chunks, "upload", tenant, counts=counts)
     except Exception as e:
         # 실패 시 롤백을 위해 questions 삭제
         with engine.begin() as conn:
             conn.execute(
                 text("DELETE FROM questions WHERE id = :qid"), {"qid": question_id}
             )
-        raise HTTPException(status_code(502), detail=f"OpenAI embeddings error: {e}")
+        raise HTTPException(status_code=502, detail=f"OpenAI embeddings error: {e}")
 
     # 5) embeddings 테이블 삽입
     # pgvector는 '[v1,v2,...]' 문자열 리터럴을 받아들일 수 있음
     def to_pgvector_literal(vec: List[float]) -> str:
         return "[" + ",".join(f"{x:.8f}" for x in vec) + "]"
 
-    with engine.begin() as conn:
+    with timed("upload", "db"), engine.begin() as conn:
         for idx, (chunk_text, vec) in enumerate(zip(chunks, vectors), start=1):
             vec_lit = to_pgvector_literal(vec)
             conn.execute(
                 text(
                     """
-                INSERT INTO embeddings (question_id, chunk_id, chunk_text, embedding, dim, model)
-                VALUES (:question_id, :chunk_id, :chunk_text, CAST(:embedding AS vector), :dim, :model)
+                INSERT INTO embeddings
+                    (tenant_id, question_id, chunk_id, chunk_text, embedding, dim, model)
+                VALUES (:tenant_id, :question_id, :chunk_id, :chunk_text,
+                        CAST(:embedding AS vector), :dim, :model)
                 """
                 ),
                 {
+                    "tenant_id": tenant.id,
                     "question_id": question_id,
                     "chunk_id": idx,
                     "chunk_text": chunk_text,
@@ -171,7 +115,11 @@ def upload(req: UploadRequest):
                     "model": settings.embedding_model,
                 },
             )
+        refresh_question_centroids(conn, [question_id])
+        refresh_search_chunks(conn, [question_id])
+        index_question_signatures(conn, [(question_id, req.content)])
 
+    bump_generation()  # 검색 응답 캐시 무효화
     return UploadResponse(
         question_id=question_id,
         chunks=len(chunks),
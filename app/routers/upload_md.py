@@ -1,16 +1,31 @@
 # app/routers/upload_md.py
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
 from pydantic import BaseModel
-from sqlalchemy import text
-from ..db import engine
-from ..utils.md_parse import parse_md_blocks, extract_year_candidates
+from ..db import engine, sql
+from ..metrics import CACHE_HITS, CACHE_MISSES, ROWS_SCANNED, timed
+from ..utils.md_parse import MdStreamParser
 from ..utils.normalization import normalize_name
-from ..utils.hashing import sha256_hex, short_hash
+from ..name_cache import COMPANIES, JOBS
+from ..preview_store import PREVIEW_SESSIONS, discard_spool, spool_path
+from ..cache import bump_generation
+from ..utils.hashing import short_hash
+from ..utils.minhash import minhash_signature
+from ..near_dup import find_near_duplicates, index_question_signatures
+from ..tenants import Tenant, current_tenant
+from ..usage import embed_texts, plan_embedding
 
 router = APIRouter()
 
+# 업로드 스트림을 읽는 단위 (바이트)
+UPLOAD_READ_CHUNK = 64 * 1024
+
 
 # ---------- 응답 스키마 ----------
+class NearDuplicate(BaseModel):
+    question_id: int
+    jaccard: float  # MinHash 추정치 (답변 문자 3-gram 기준)
+
+
 class PreviewQuestion(BaseModel):
     title: str
     question: str
@@ -18,6 +33,7 @@ class PreviewQuestion(BaseModel):
     hash_prefix: str
     duplicate: bool
     exists_question_id: int | None = None
+    near_duplicates: list[NearDuplicate] = []
     content_preview: str
 
 
@@ -25,6 +41,8 @@ class PreviewResponse(BaseModel):
     document: dict
     meta: dict
     questions: list[PreviewQuestion]
+    preview_token: str | None = None  # commit에 원문 대신 전달 (세션 TTL 내)
+    preview_expires_in: int | None = None  # 초
 
 
 # ---------- 엔드포인트 ----------
@@ -34,90 +52,150 @@ async def upload_md_preview(
     hint_company: str | None = Form(None),
     hint_job: str | None = Form(None),
     hint_year: int | None = Form(None),
+    tenant: Tenant = Depends(current_tenant),
 ):
     """
-    Markdown 파일 업로드 → 파싱 → 중복 여부 체크 (DB 저장 X)
+    Markdown 파일 업로드 → 파싱 → 중복 여부 체크 (DB 저장 X, 같은 테넌트 안에서만)
     """
+    # 업로드를 조각 단위로 읽으며 해시/연도/섹션 파싱을 한 번에 수행.
+    # 섹션은 중복 체크에 필요한 최소 필드만 남기고 raw는 버린다.
+    # 원문은 메모리에 모으지 않고 임시 파일로 흘려 쓴다 (신규 문서면 commit 시 documents.raw_text)
+    parser = MdStreamParser()
+    sections: list[dict] = []
+    raw_path = spool_path()
+
+    def collect(parsed):
+        for sec in parsed:
+            q_text = sec["question"] or ""
+            a_text = sec["answer"] or ""
+            sections.append(
+                {
+                    "title": sec["title"],
+                    "question": q_text,
+                    "answer": a_text,
+                    "prefix": short_hash(q_text + a_text, 16),
+                }
+            )
+
     try:
-        raw_bytes = await file.read()
-        raw_text = raw_bytes.decode("utf-8")
+        with timed("upload_md_preview", "parse") as sp, open(raw_path, "wb") as spool:
+            while data := await file.read(UPLOAD_READ_CHUNK):
+                spool.write(data)
+                collect(parser.feed(data))
+            collect(parser.close())
+            sp.set("parse.bytes", parser.bytes_read)
+            sp.set("parse.sections", len(sections))
     except Exception as e:
+        discard_spool(raw_path)
         raise HTTPException(status_code=400, detail=f"파일 읽기 실패: {e}")
 
     # 문서 해시
-    doc_hash = sha256_hex(raw_text)
-
-    # DB에서 동일 문서 여부 확인
-    with engine.connect() as conn:
-        existing_doc = conn.execute(
-            text("SELECT id FROM documents WHERE content_hash = :h"),
-            {"h": doc_hash},
-        ).fetchone()
-
-    # 문항 파싱
-    sections = parse_md_blocks(raw_text)
-
-    # 연도 추출 후보
-    year = hint_year
-    if year is None:
-        candidates = extract_year_candidates(raw_text)
-        if candidates:
-            # 단순히 최빈값 or 최대값 선택 (시연용)
-            year = max(candidates)
+    doc_hash = parser.content_hash
 
-    # 회사/직무 추정 (지금은 hint 우선)
-    company = hint_company or "Unknown Company"
-    job = hint_job or "Unknown Job"
-
-    norm_company = normalize_name(company)
-    norm_job = normalize_name(job)
-
-    # DB에서 기존 company/job 있는지 조회
-    with engine.connect() as conn:
-        existing_company = conn.execute(
-            text("SELECT id FROM companies WHERE normalized_name = :n"),
-            {"n": norm_company},
-        ).fetchone()
-        existing_job = conn.execute(
-            text("SELECT id FROM jobs WHERE normalized_name = :n"),
-            {"n": norm_job},
-        ).fetchone()
-
-    # 질문 단위 중복 체크
-    preview_questions: list[PreviewQuestion] = []
-    with engine.connect() as conn:
-        for sec in sections:
-            q_text = sec["question"] or ""
-            a_text = sec["answer"] or ""
-            raw = sec["raw"] or ""
-            prefix = short_hash(q_text + a_text, 16)
-
-            row = conn.execute(
-                text(
-                    """
-                    SELECT id FROM questions
-                    WHERE content_hash_prefix = :p
-                      AND coalesce(year,0) = coalesce(:y,0)
-                """
-                ),
-                {"p": prefix, "y": year},
+    # 세션에 넘기기 전에 실패하면 임시 파일을 지운다 (넘긴 뒤에는 세션 만료/축출 시 삭제)
+    try:
+        # DB에서 동일 문서 여부 확인 (이미 있는 문서면 원문은 필요 없으므로 바로 버린다)
+        with timed("upload_md_preview", "db"), engine.connect() as conn:
+            existing_doc = conn.execute(
+                sql("SELECT id FROM documents WHERE tenant_id = :t AND content_hash = :h"),
+                {"t": tenant.id, "h": doc_hash},
             ).fetchone()
-
+        raw_size = parser.bytes_read
+        if existing_doc is not None:
+            discard_spool(raw_path)
+            raw_path, raw_size = None, 0
+
+        # 연도 추출 후보
+        year = hint_year
+        if year is None and parser.years:
+            # 단순히 최빈값 or 최대값 선택 (시연용)
+            year = max(parser.years)
+
+        # 회사/직무 추정 (지금은 hint 우선)
+        company = hint_company or "Unknown Company"
+        job = hint_job or "Unknown Job"
+
+        norm_company = normalize_name(company)
+        norm_job = normalize_name(job)
+
+        # 기존 company/job 있는지 조회 (캐시 적중 시 DB 접근 없음)
+        with timed("upload_md_preview", "db"):
+            existing_company = COMPANIES.lookup(None, norm_company, company)
+            existing_job = JOBS.lookup(None, norm_job, job)
+
+        # 질문 단위 중복 체크 (한 번의 쿼리로 일괄 조회)
+        existing_by_prefix: dict[str, int] = {}
+        if sections:
+            with timed("upload_md_preview", "db"), engine.connect() as conn:
+                existing_by_prefix = {
+                    r[0]: r[1]
+                    for r in conn.execute(
+                        sql(
+                            """
+                            SELECT DISTINCT ON (content_hash_prefix) content_hash_prefix, id
+                            FROM questions
+                            WHERE tenant_id = :t
+                              AND content_hash_prefix = ANY(:ps)
+                              AND coalesce(year,0) = coalesce(:y,0)
+                            ORDER BY content_hash_prefix, id
+                        """
+                        ),
+                        {"t": tenant.id, "ps": [sec["prefix"] for sec in sections], "y": year},
+                    ).fetchall()
+                }
+
+        # 근사 중복: 답변 MinHash → LSH 밴드 충돌 후보만 서명 비교 (임베딩/전수 비교 없음)
+        near_by_idx: list[list[tuple[int, float]]] = [[] for _ in sections]
+        if sections:
+            with timed("upload_md_preview", "near_dup") as sp, engine.connect() as conn:
+                sigs = [minhash_signature(sec["answer"]) for sec in sections]
+                near_by_idx = find_near_duplicates(conn, sigs, tenant_id=tenant.id)
+                sp.set("near_dup.matches", sum(len(n) for n in near_by_idx))
+
+        preview_questions: list[PreviewQuestion] = []
+        for sec, near in zip(sections, near_by_idx):
+            a_text = sec["answer"]
+            exists_id = existing_by_prefix.get(sec["prefix"])
             preview_questions.append(
                 PreviewQuestion(
                     title=sec["title"],
-                    question=q_text,
+                    question=sec["question"],
                     answer=a_text,
-                    hash_prefix=prefix,
-                    duplicate=row is not None,
-                    exists_question_id=row[0] if row else None,
+                    hash_prefix=sec["prefix"],
+                    duplicate=exists_id is not None,
+                    exists_question_id=exists_id,
+                    near_duplicates=[
+                        NearDuplicate(question_id=qid, jaccard=round(j, 3))
+                        for qid, j in near
+                        if qid != exists_id
+                    ],
                     content_preview=(
                         (a_text[:120] + "...") if len(a_text) > 120 else a_text
                     ),
                 )
             )
 
+        # 서버 측 세션: 섹션은 메모리, 원문은 임시 파일 경로만 (세션이 사라지면 파일도 삭제)
+        token = PREVIEW_SESSIONS.put(
+            {
+                "tenant_id": tenant.id,
+                "filename": file.filename,
+                "content_hash": doc_hash,
+                "raw_path": raw_path,
+                "sections": [
+                    {"title": s["title"], "question": s["question"], "answer": s["answer"]}
+                    for s in sections
+                ],
+            },
+            size=raw_size + sum(len(s["question"]) + len(s["answer"]) for s in sections) * 2,
+        )
+    except BaseException:
+        discard_spool(raw_path)
+        raise
+
     return PreviewResponse(
+        preview_token=token,
+        preview_expires_in=settings.preview_session_ttl_seconds,
         document={
             "filename": file.filename,
             "content_hash": doc_hash,
@@ -137,29 +215,12 @@ async def upload_md_preview(
 # app/routers/upload_md.py (기존 preview 밑에 이어서 추가)
 from typing import Optional, List
 from pydantic import BaseModel, Field
-from sqlalchemy import text
 from ..settings import settings
-from openai import OpenAI
-
-client = OpenAI(api_key=settings.openai_api_key)
-
-
-# ---- 간단 청킹 (upload 라우터와 동일 규칙) ----
-def simple_chunk(text: str, max_len: int = 800, overlap: int = 100) -> List[str]:
-    text = (text or "").strip()
-    if not text:
-        return []
-    chunks = []
-    start, n = 0, len(text)
-    while start < n:
-        end = min(n, start + max_len)
-        chunk = text[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
-        if end == n:
-            break
-        start = max(0, end - overlap)
-    return chunks
+from ..tracing import current_span
+from ..centroids import refresh_question_centroids
+from ..read_model import refresh_search_chunks
+from ..utils.chunking import semantic_chunk
+from ..clients import get_openai
 
 
 def to_pgvector_literal(vec: List[float]) -> str:
@@ -185,12 +246,27 @@ class CommitDocument(BaseModel):
     filename: str
     content_hash: str
     raw_text: Optional[str] = None  # 문서가 최초 저장이면 필요, 이미 있으면 생략 가능
+    previous_document_id: Optional[int] = None  # 버전 모드: 이전 버전 명시 (없으면 filename으로 탐색)
+
+
+class CommitEdit(BaseModel):
+    """프리뷰 세션 섹션 대비 사용자가 바꾼 값만 (None = 그대로)."""
+
+    index: int  # 프리뷰 questions 내 위치 (0부터)
+    title: Optional[str] = None
+    question: Optional[str] = None
+    answer: Optional[str] = None
+    include: Optional[bool] = None
 
 
 class CommitPayload(BaseModel):
-    document: CommitDocument
+    # 둘 중 하나: preview_token(+edits) 또는 document(+questions 전체)
+    preview_token: Optional[str] = None
+    edits: List[CommitEdit] = Field(default_factory=list)
+    document: Optional[CommitDocument] = None
     meta: CommitMeta
     questions: List[CommitQuestion] = Field(default_factory=list)
+    versioning: bool = False  # 이전 버전 문서와 연결하고 변경분만 반영
 
 
 class CommitResponse(BaseModel):
@@ -201,99 +277,190 @@ class CommitResponse(BaseModel):
     inserted_questions: int
     skipped_questions: int
     inserted_embeddings: int
+    previous_document_id: Optional[int] = None
+    updated_questions: int = 0
+    deleted_questions: int = 0
+    embedded_chunks: int = 0  # 실제 OpenAI 임베딩 호출 대상 청크 수
+    reused_embeddings: int = 0  # 기존 벡터 재사용(복사/유지) 청크 수
+    deleted_embeddings: int = 0
 
 
 # ---------- 헬퍼: 회사/직무 upsert ----------
+# normalized_name → id 캐시 경유: 이미 있는 이름이면 DB 쓰기/잠금 없음
 def upsert_company(conn, name: str) -> int:
-    from ..utils.normalization import normalize_name
-
-    norm = normalize_name(name)
-    if not norm:
-        # Unknown 처리 (NULL 허용 시 None 반환)
-        return None
-    row = conn.execute(
-        text(
+    return COMPANIES.get_or_create(conn, name)
+
+
+def upsert_job(conn, name: str) -> int:
+    return JOBS.get_or_create(conn, name)
+
+
+# ---------- 헬퍼: 문서 버전 관리 ----------
+def find_previous_document(
+    conn, tenant_id: int, filename: str, exclude_id: int
+) -> Optional[int]:
+    """같은 테넌트가 같은 filename으로 올린 가장 최근 문서(자기 자신 제외)의 id."""
+    return conn.execute(
+        sql(
             """
-            INSERT INTO companies(name, normalized_name)
-            VALUES (:n, :nn)
-            ON CONFLICT (normalized_name) DO UPDATE
-            SET name = EXCLUDED.name
-            RETURNING id
+            SELECT id FROM documents
+            WHERE tenant_id = :t AND filename = :fn AND id <> :id
+            ORDER BY uploaded_at DESC, id DESC
+            LIMIT 1
         """
         ),
-        {"n": name.strip(), "nn": norm},
-    ).first()
-    if row:
-        return row[0]
-    # fallback: select
-    return conn.execute(
-        text("SELECT id FROM companies WHERE normalized_name=:nn"), {"nn": norm}
+        {"t": tenant_id, "fn": filename, "id": exclude_id},
     ).scalar()
 
 
-def upsert_job(conn, name: str) -> int:
-    from ..utils.normalization import normalize_name
-
-    norm = normalize_name(name)
-    if not norm:
-        return None
-    row = conn.execute(
-        text(
+def load_document_questions(conn, document_id: int) -> List[tuple[int, str, str]]:
+    """문서에 속한 (question_id, title, content_hash_prefix) 목록."""
+    rows = conn.execute(
+        sql(
             """
-            INSERT INTO jobs(name, normalized_name)
-            VALUES (:n, :nn)
-            ON CONFLICT (normalized_name) DO UPDATE
-            SET name = EXCLUDED.name
-            RETURNING id
+            SELECT id, coalesce(title, ''), content_hash_prefix
+            FROM questions
+            WHERE document_id = :docid
+            ORDER BY id
         """
         ),
-        {"n": name.strip(), "nn": norm},
-    ).first()
-    if row:
-        return row[0]
-    return conn.execute(
-        text("SELECT id FROM jobs WHERE normalized_name=:nn"), {"nn": norm}
-    ).scalar()
+        {"docid": document_id},
+    ).fetchall()
+    return [(r[0], r[1], r[2]) for r in rows]
+
+
+def section_content(q: CommitQuestion) -> str:
+    # content 구성: 질문 + 개행 + 답변 (스키마 설명상 "문항/답변 원문")
+    content = (q.question or "").strip()
+    if q.answer:
+        content = (content + "\n\n" + q.answer.strip()).strip()
+    return content
+
+
+def section_prefix(q: CommitQuestion) -> str:
+    """
+    문항 고유성 해시. preview와 동일 규칙(질문+답변)으로 항상 다시 계산한다.
+    클라이언트가 보낸 hash_prefix는 편집 전 값일 수 있어 신뢰하지 않는다.
+    """
+    return short_hash((q.question or "").strip() + (q.answer or "").strip(), 16)
+
+
+def resolve_preview_session(
+    payload: CommitPayload, tenant: Tenant
+) -> tuple[CommitDocument, List[CommitQuestion]]:
+    """프리뷰 토큰 → (문서, edits가 반영된 섹션 목록). 세션이 없거나 다른 테넌트 것이면 410."""
+    session = PREVIEW_SESSIONS.get(payload.preview_token)
+    if session is None or session.get("tenant_id") != tenant.id:
+        raise HTTPException(
+            status_code=410, detail="Preview session expired or not found; run preview again"
+        )
+    raw_text = None
+    if session.get("raw_path"):
+        try:
+            with open(session["raw_path"], "rb") as f:
+                raw_text = f.read().decode("utf-8")
+        except FileNotFoundError:  # 같은 문서의 새 프리뷰가 세션을 대체한 직후
+            raise HTTPException(
+                status_code=410, detail="Preview session expired or not found; run preview again"
+            )
+    questions = [CommitQuestion(**sec) for sec in session["sections"]]
+    for edit in payload.edits:
+        if not 0 <= edit.index < len(questions):
+            raise HTTPException(status_code=400, detail=f"Invalid edit index {edit.index}")
+        changes = edit.model_dump(exclude={"index"}, exclude_none=True)
+        questions[edit.index] = questions[edit.index].model_copy(update=changes)
+    doc = CommitDocument(
+        filename=session["filename"],
+        content_hash=session["content_hash"],
+        raw_text=raw_text,
+        previous_document_id=(
+            payload.document.previous_document_id if payload.document else None
+        ),
+    )
+    return doc, questions
 
 
 # ---------- /upload-md/commit ----------
 @router.post("/upload-md/commit", response_model=CommitResponse)
-def upload_md_commit(payload: CommitPayload):
-    doc = payload.document
+def upload_md_commit(
+    payload: CommitPayload,
+    client=Depends(get_openai),
+    tenant: Tenant = Depends(current_tenant),
+):
+    if payload.preview_token:
+        doc, questions = resolve_preview_session(payload, tenant)
+    elif payload.document is not None:
+        doc, questions = payload.document, payload.questions
+    else:
+        raise HTTPException(status_code=400, detail="preview_token or document required")
     meta = payload.meta
-    sections = [q for q in payload.questions if q.include]
+    sections = [q for q in questions if q.include]
 
     if not sections:
         raise HTTPException(status_code=400, detail="No sections to commit")
 
-    # 1) documents upsert (content_hash UNIQUE)
-    with engine.begin() as conn:
+    previous_document_id: Optional[int] = None
+
+    # 1) documents upsert ((tenant_id, content_hash) UNIQUE)
+    with timed("upload_md_commit", "db"), engine.begin() as conn:
         existing_doc = conn.execute(
-            text("SELECT id FROM documents WHERE content_hash = :h"),
-            {"h": doc.content_hash},
+            sql(
+                "SELECT id, previous_id FROM documents WHERE tenant_id = :t AND content_hash = :h"
+            ),
+            {"t": tenant.id, "h": doc.content_hash},
         ).fetchone()
 
         if existing_doc:
             document_id = existing_doc[0]
+            previous_document_id = existing_doc[1]
         else:
             if not doc.raw_text:
                 raise HTTPException(
                     status_code=400, detail="raw_text required for new document"
                 )
+            if payload.versioning:
+                previous_document_id = doc.previous_document_id
+            if previous_document_id is not None:
+                # 명시한 이전 버전도 같은 테넌트 문서여야 한다
+                owned = conn.execute(
+                    sql("SELECT 1 FROM documents WHERE id = :id AND tenant_id = :t"),
+                    {"id": previous_document_id, "t": tenant.id},
+                ).first()
+                if not owned:
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"Previous document {previous_document_id} not found",
+                    )
             row = conn.execute(
-                text(
+                sql(
                     """
-                    INSERT INTO documents(filename, content_hash, raw_text, source)
-                    VALUES (:fn, :h, :raw, 'upload-md')
+                    INSERT INTO documents(tenant_id, filename, content_hash, raw_text, source, previous_id)
+                    VALUES (:t, :fn, :h, :raw, 'upload-md', :prev)
                     RETURNING id
                 """
                 ),
-                {"fn": doc.filename, "h": doc.content_hash, "raw": doc.raw_text},
+                {
+                    "t": tenant.id,
+                    "fn": doc.filename,
+                    "h": doc.content_hash,
+                    "raw": doc.raw_text,
+                    "prev": previous_document_id,
+                },
             ).first()
             if not row:
                 raise HTTPException(status_code=500, detail="Failed to insert document")
             document_id = row[0]
 
+            if payload.versioning and previous_document_id is None:
+                previous_document_id = find_previous_document(
+                    conn, tenant.id, doc.filename, document_id
+                )
+                if previous_document_id is not None:
+                    conn.execute(
+                        sql("UPDATE documents SET previous_id = :prev WHERE id = :id"),
+                        {"prev": previous_document_id, "id": document_id},
+                    )
+
         # 2) companies/jobs upsert
         company_id = upsert_company(conn, meta.company) if meta.company else None
         job_id = upsert_job(conn, meta.job) if meta.job else None
@@ -301,56 +468,105 @@ def upload_md_commit(payload: CommitPayload):
     # 3) 질문 insert (고유성 체크) + 4) 임베딩 생성/저장
     inserted_q = 0
     skipped_q = 0
-    inserted_emb = 0
+    updated_q = 0
+    deleted_q = 0
 
-    # OpenAI 임베딩(배치) 준비: 섹션별로 answer 기반 청킹 → 하나의 리스트로 flatten
-    all_chunks: List[tuple[int, int, str]] = []  # (temp_index, chunk_id, chunk_text)
-    sec_indices: List[int] = []  # 섹션 인덱스 → all_chunks 범위 매핑
-
-    # 3-a) 일단 questions를 insert하면서 각 question_id를 확보해야 하지만,
     # 임베딩은 answer 청크 기준 배치 생성이 효율적이므로 2단계로 처리:
-    # (A) questions insert만 먼저 → 신규 question들의 (tmp list) 유지
+    # (A) questions insert/update 먼저 → 각 섹션의 question_id 확보
+    # (B) chunk_hash 기준으로 기존 벡터와 diff → 변경분만 임베딩
     question_ids: List[Optional[int]] = [None] * len(sections)
+    changed_qids: set[int] = set()  # 내용/메타가 바뀌어 read model 갱신이 필요한 question
+    signed: List[tuple[int, str]] = []  # 근사 중복 색인 대상 (question_id, 답변)
+
+    with timed("upload_md_commit", "db"), engine.begin() as conn:
+        # 버전 모드: 이전 버전 문항을 제목/해시로 매칭할 준비
+        prev_by_id: dict[int, tuple[str, str]] = {}
+        if payload.versioning and previous_document_id is not None:
+            for qid, title, prefix in load_document_questions(
+                conn, previous_document_id
+            ):
+                prev_by_id[qid] = (title, prefix)
+        claimed: set[int] = set()
 
-    from ..utils.hashing import short_hash
-
-    with engine.begin() as conn:
         for i, q in enumerate(sections):
-            # content 구성: 질문 + 개행 + 답변 (스키마 설명상 "문항/답변 원문")
-            content = (q.question or "").strip()
-            if q.answer:
-                content = (content + "\n\n" + q.answer.strip()).strip()
-
-            prefix = q.hash_prefix or short_hash(content, 16)
+            content = section_content(q)
+            prefix = section_prefix(q)
 
-            # 고유성 체크: (company_id, job_id, year, content_hash_prefix)
+            # 고유성 체크: (tenant_id, company_id, job_id, year, content_hash_prefix)
             exists_row = conn.execute(
-                text(
+                sql(
                     """
                     SELECT id FROM questions
-                    WHERE content_hash_prefix = :p
+                    WHERE tenant_id = :t
+                      AND content_hash_prefix = :p
                       AND coalesce(company_id, -1) = coalesce(:cid, -1)
                       AND coalesce(job_id, -1) = coalesce(:jid, -1)
                       AND coalesce(year, 0) = coalesce(:y, 0)
                 """
                 ),
-                {"p": prefix, "cid": company_id, "jid": job_id, "y": meta.year},
+                {"t": tenant.id, "p": prefix, "cid": company_id, "jid": job_id, "y": meta.year},
             ).fetchone()
 
             if exists_row:
                 question_ids[i] = exists_row[0]
                 skipped_q += 1
+                if exists_row[0] in prev_by_id and exists_row[0] not in claimed:
+                    # 변경 없는 문항 → 새 버전 문서로 소속만 이동
+                    claimed.add(exists_row[0])
+                    conn.execute(
+                        sql("UPDATE questions SET document_id = :docid WHERE id = :id"),
+                        {"docid": document_id, "id": exists_row[0]},
+                    )
+                continue
+
+            # 버전 모드: 같은 제목의 이전 문항이 있으면 그 행을 갱신(id 유지)
+            prev_qid = next(
+                (
+                    pid
+                    for pid, (ptitle, _) in prev_by_id.items()
+                    if pid not in claimed and ptitle == (q.title or "")
+                ),
+                None,
+            )
+            if prev_qid is not None:
+                claimed.add(prev_qid)
+                conn.execute(
+                    sql(
+                        """
+                        UPDATE questions
+                        SET content = :content, company_id = :cid, job_id = :jid,
+                            document_id = :docid, title = :title, year = :y,
+                            content_hash_prefix = :prefix
+                        WHERE id = :id
+                    """
+                    ),
+                    {
+                        "content": content,
+                        "cid": company_id,
+                        "jid": job_id,
+                        "docid": document_id,
+                        "title": q.title,
+                        "y": meta.year,
+                        "prefix": prefix,
+                        "id": prev_qid,
+                    },
+                )
+                question_ids[i] = prev_qid
+                changed_qids.add(prev_qid)
+                signed.append((prev_qid, q.answer or q.question or ""))
+                updated_q += 1
                 continue
 
             row = conn.execute(
-                text(
+                sql(
                     """
-                    INSERT INTO questions(content, company_id, job_id, document_id, title, year, content_hash_prefix)
-                    VALUES (:content, :cid, :jid, :docid, :title, :y, :prefix)
+                    INSERT INTO questions(tenant_id, content, company_id, job_id, document_id, title, year, content_hash_prefix)
+                    VALUES (:t, :content, :cid, :jid, :docid, :title, :y, :prefix)
                     RETURNING id
                 """
                 ),
                 {
+                    "t": tenant.id,
                     "content": content,
                     "cid": company_id,
                     "jid": job_id,
@@ -365,75 +581,199 @@ def upload_md_commit(payload: CommitPayload):
                 raise HTTPException(status_code=500, detail="Failed to insert question")
 
             question_ids[i] = row[0]
+            signed.append((row[0], q.answer or q.question or ""))
             inserted_q += 1
 
-    # (B) 신규/존재하는 question들에 대해 청킹 → 임베딩 배치 생성
-    # 답변이 비어 있으면 질문으로 대체
-    flat_chunks: List[str] = []
-    chunk_map: List[tuple[int, int]] = []  # (section_index, chunk_id)
+        # 새 버전에 없는 이전 문항 (벡터 재사용 후 (C)에서 삭제)
+        orphan_qids = [pid for pid in prev_by_id if pid not in claimed]
+
+        index_question_signatures(conn, signed)
 
+    # (B) 청킹 → chunk_hash 기준 diff
+    # 답변이 비어 있으면 질문으로 대체
+    planned: List[tuple[int, int, str, str]] = []  # (question_id, chunk_id, text, hash)
     for i, q in enumerate(sections):
+        qid = question_ids[i]
+        if not qid:
+            continue
         qtext = (q.answer or q.question or "").strip()
-        chunks = simple_chunk(qtext, max_len=800, overlap=100)
-        if not chunks:
+        for idx, ck in enumerate(semantic_chunk(qtext), start=1):
+            planned.append((qid, idx, ck, short_hash(ck, 16)))
+
+    qids = sorted({p[0] for p in planned})
+    hashes = sorted({p[3] for p in planned})
+    with timed("upload_md_commit", "db"), engine.connect() as conn:
+        stored = set()
+        reusable = set()
+        if qids:
+            stored = {
+                (r[0], r[1])
+                for r in conn.execute(
+                    sql(
+                        """
+                        SELECT question_id, chunk_hash FROM embeddings
+                        WHERE question_id = ANY(:qids) AND model = :model
+                    """
+                    ),
+                    {"qids": qids, "model": settings.embedding_model},
+                ).fetchall()
+            }
+            # 같은 테넌트의 다른 문항/이전 버전에 같은 청크가 이미 임베딩되어 있으면 벡터 재사용
+            reusable = {
+                r[0]
+                for r in conn.execute(
+                    sql(
+                        """
+                        SELECT DISTINCT chunk_hash FROM embeddings
+                        WHERE model = :model AND tenant_id = :t AND chunk_hash = ANY(:hs)
+                    """
+                    ),
+                    {"model": settings.embedding_model, "t": tenant.id, "hs": hashes},
+                ).fetchall()
+            }
+
+    ROWS_SCANNED.inc(len(stored), endpoint="upload_md_commit")
+
+    keep: List[tuple[int, int, str, str]] = []  # 이미 저장됨 → chunk_id만 정리
+    copy: List[tuple[int, int, str, str]] = []  # 다른 행의 벡터 복사
+    fresh: List[tuple[int, int, str, str]] = []  # 신규 임베딩 필요
+    seen: set[tuple[int, str]] = set()
+    for item in planned:
+        key = (item[0], item[3])
+        if key in seen:
             continue
-        for idx, ck in enumerate(chunks, start=1):
-            flat_chunks.append(ck)
-            chunk_map.append((i, idx))
-
-    vectors: List[List[float]] = []
-    if flat_chunks:
+        seen.add(key)
+        if key in stored:
+            keep.append(item)
+        elif item[3] in reusable:
+            copy.append(item)
+        else:
+            fresh.append(item)
+
+    # 같은 텍스트는 한 번만 임베딩
+    fresh_texts = list(dict.fromkeys(item[2] for item in fresh))
+    vectors_by_text: dict[str, List[float]] = {}
+    if fresh_texts:
+        # 추정 토큰으로 상한/테넌트 한도 확인 (413/429) → 요청 한도에 맞춰 나눠 호출, 문서별 장부 기록
+        counts = plan_embedding(fresh_texts, tenant)
         try:
-            emb_res = client.embeddings.create(
-                model=settings.embedding_model,  # "text-embedding-3-small"
-                input=flat_chunks,
+            vectors = embed_texts(
+                client,
+                fresh_texts,
+                "upload_md_commit",
+                tenant,
+                document_id=document_id,
+                counts=counts,
             )
-            vectors = [d.embedding for d in emb_res.data]
         except Exception as e:
             raise HTTPException(status_code=502, detail=f"OpenAI embeddings error: {e}")
-
-    # (C) embeddings insert
-    from ..utils.hashing import short_hash
-
-    with engine.begin() as conn:
-        for (sec_idx, chunk_id), vec in zip(chunk_map, vectors):
-            qid = question_ids[sec_idx]
-            if not qid:
-                continue
-            chunk_text = flat_chunks.pop(0)  # consume in order
-            chunk_hash = short_hash(chunk_text, 16)
-            vec_lit = to_pgvector_literal(vec)
-            # 중복 청크 방지 (question_id, chunk_hash)
-            exists = conn.execute(
-                text(
+        vectors_by_text = dict(zip(fresh_texts, vectors))
+    root = current_span()
+    root.set("commit.sections", len(sections))
+    root.set("commit.questions_inserted", inserted_q)
+    root.set("commit.questions_updated", updated_q)
+    root.set("commit.chunks_planned", len(planned))
+    root.set("commit.chunks_embedded", len(fresh_texts))
+    root.set("commit.chunks_reused", len(keep) + len(copy))
+    CACHE_HITS.inc(len(keep) + len(copy), cache="chunk_embedding")
+    CACHE_MISSES.inc(len(fresh), cache="chunk_embedding")
+
+    # (C) embeddings 반영
+    inserted_emb = 0
+    deleted_emb = 0
+    with timed("upload_md_commit", "db"), engine.begin() as conn:
+        for qid, chunk_id, chunk_text, chunk_hash in copy:
+            inserted_emb += conn.execute(
+                sql(
                     """
-                    SELECT 1 FROM embeddings
-                    WHERE question_id = :qid AND chunk_hash = :ch
+                    INSERT INTO embeddings (tenant_id, question_id, chunk_id, chunk_text, embedding, dim, model, chunk_hash)
+                    SELECT tenant_id, :qid, :cid, :ct, embedding, dim, model, chunk_hash
+                    FROM embeddings
+                    WHERE model = :model AND tenant_id = :t AND chunk_hash = :ch
+                    LIMIT 1
+                    ON CONFLICT DO NOTHING
                 """
                 ),
-                {"qid": qid, "ch": chunk_hash},
-            ).fetchone()
-            if exists:
-                continue
-            conn.execute(
-                text(
+                {
+                    "qid": qid,
+                    "cid": chunk_id,
+                    "ct": chunk_text,
+                    "model": settings.embedding_model,
+                    "t": tenant.id,
+                    "ch": chunk_hash,
+                },
+            ).rowcount
+
+        for qid, chunk_id, chunk_text, chunk_hash in fresh:
+            vec = vectors_by_text[chunk_text]
+            inserted_emb += conn.execute(
+                sql(
                     """
-                    INSERT INTO embeddings (question_id, chunk_id, chunk_text, embedding, dim, model, chunk_hash)
-                    VALUES (:qid, :cid, :ct, (:emb)::vector, :dim, :model, :ch)
+                    INSERT INTO embeddings (tenant_id, question_id, chunk_id, chunk_text, embedding, dim, model, chunk_hash)
+                    VALUES (:t, :qid, :cid, :ct, (:emb)::vector, :dim, :model, :ch)
+                    ON CONFLICT DO NOTHING
                 """
                 ),
                 {
+                    "t": tenant.id,
                     "qid": qid,
                     "cid": chunk_id,
                     "ct": chunk_text,
-                    "emb": vec_lit,  # "[0.123,...]" 형태의 문자열
+                    "emb": to_pgvector_literal(vec),  # "[0.123,...]" 형태의 문자열
                     "dim": len(vec),
                     "model": settings.embedding_model,
                     "ch": chunk_hash,
                 },
-            )
+            ).rowcount
+
+        # 새 버전에 없는 이전 문항 삭제 (embeddings는 CASCADE)
+        if orphan_qids:
+            deleted_q = conn.execute(
+                sql("DELETE FROM questions WHERE id = ANY(:ids)"),
+                {"ids": orphan_qids},
+            ).rowcount
+
+        # 커밋한 모든 문항: 유지 청크의 순번 정리 + 더 이상 없는 청크 삭제 (현재 모델 행만).
+        # 내용이 같아 건너뛴 문항도 포함 (청킹 규칙이 바뀌면 같은 답변도 경계가 달라진다)
+        touched = changed_qids | {item[0] for item in copy + fresh}
+        for qid, chunk_id, _, chunk_hash in keep:
+            renumbered = conn.execute(
+                sql(
+                    """
+                    UPDATE embeddings SET chunk_id = :cid
+                    WHERE question_id = :qid AND chunk_hash = :ch AND model = :model
+                      AND chunk_id IS DISTINCT FROM :cid
+                """
+                ),
+                {"qid": qid, "cid": chunk_id, "ch": chunk_hash, "model": settings.embedding_model},
+            ).rowcount
+            if renumbered:
+                touched.add(qid)
+        live_by_qid: dict[int, List[str]] = {qid: [] for qid in question_ids if qid}
+        for qid, _, _, chunk_hash in planned:
+            live_by_qid[qid].append(chunk_hash)
+        for qid, live in live_by_qid.items():
+            stale = conn.execute(
+                sql(
+                    """
+                    DELETE FROM embeddings
+                    WHERE question_id = :qid AND model = :model
+                      AND (chunk_hash IS NULL OR chunk_hash <> ALL(:live))
+                """
+                ),
+                {"qid": qid, "live": live, "model": settings.embedding_model},
+            ).rowcount
+            if stale:
+                deleted_emb += stale
+                touched.add(qid)
+
+        # 청크/메타가 바뀐 문항의 centroid, 검색 read model 갱신 (같은 트랜잭션)
+        refresh_question_centroids(conn, touched)
+        refresh_search_chunks(conn, touched)
 
-            inserted_emb += 1
+    bump_generation()  # 검색 응답 캐시 무효화
+    if payload.preview_token:
+        PREVIEW_SESSIONS.pop(payload.preview_token)
 
     return CommitResponse(
         document_id=document_id,
@@ -443,4 +783,10 @@ def upload_md_commit(payload: CommitPayload):
         inserted_questions=inserted_q,
         skipped_questions=skipped_q,
         inserted_embeddings=inserted_emb,
+        previous_document_id=previous_document_id,
+        updated_questions=updated_q,
+        deleted_questions=deleted_q,
+        embedded_chunks=len(fresh_texts),
+        reused_embeddings=len(keep) + len(copy),
+        deleted_embeddings=deleted_emb,
     )
@@ -0,0 +1,28 @@
+# app/routers/usage.py
+from fastapi import APIRouter, Depends, Query
+
+from ..tenants import Tenant, current_tenant, used_today
+from ..usage import GROUP_BY, usage_summary
+
+router = APIRouter()
+
+
+@router.get("/usage")
+def usage(
+    days: int = Query(7, ge=1, le=366, description="최근 N일"),
+    group_by: str = Query(
+        "endpoint", pattern=f"^({'|'.join(GROUP_BY)})$", description=" | ".join(GROUP_BY)
+    ),
+    tenant: Tenant = Depends(current_tenant),
+):
+    """
+    요청 테넌트의 OpenAI 사용량 요약 (토큰, 추정치, USD 환산) + 오늘 임베딩 한도.
+    장부는 배치로 기록되므로 방금 한 호출은 USAGE_FLUSH_SECONDS 정도 늦게 보인다.
+    """
+    summary = usage_summary(tenant.id, days, group_by)
+    summary["tenant"] = tenant.slug
+    summary["today"] = {
+        "embedding_tokens": used_today(tenant.id),
+        "embedding_tokens_limit": tenant.embedding_tokens_per_day,
+    }
+    return summary
@@ -0,0 +1,129 @@
+# app/server.py
+"""
+운영용 서버 실행 (uv run serve).
+
+    uv run serve                         # 워커 = WEB_CONCURRENCY 또는 CPU 수
+    uv run serve --workers 4 --port 8080
+
+- reload/파일 감시 없음, 멀티 워커 (uvicorn이 죽은 워커를 다시 띄운다)
+- uvloop / httptools가 있으면 사용 (uvicorn[standard]에 포함), 없으면 asyncio / h11
+- keep-alive 유지 시간, graceful shutdown 대기 시간, 동시 연결 제한은 SERVER_* 설정으로 조정
+- 정한 워커 수를 WEB_CONCURRENCY로 워커 프로세스에 넘긴다 → DB 풀 크기(예산 ÷ 워커 수)가 맞게 계산됨
+- uvicorn 워커는 spawn으로 앱을 새로 import하므로 부모에서 만든 객체는 공유되지 않는다.
+  대신 각 워커가 시작할 때(lifespan) warm_worker()로 DB 풀/이름 캐시/OpenAI 클라이언트를 미리 준비한다.
+"""
+from __future__ import annotations
+import argparse
+import importlib.util
+import logging
+import os
+import sys
+import time
+from typing import Optional
+
+from .settings import settings
+
+__all__ = ["default_workers", "event_loop", "http_impl", "warm_worker", "main"]
+
+log = logging.getLogger(__name__)
+
+
+# ---------- 실행 옵션 ----------
+def _cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))  # 컨테이너 CPU 제한(cpuset) 반영
+    except AttributeError:  # pragma: no cover - macOS/Windows
+        return os.cpu_count() or 1
+
+
+def default_workers() -> int:
+    """WEB_CONCURRENCY가 설정돼 있으면 그 값, 아니면 CPU 수 (워커당 DB 커넥션 2개 이상 남도록 제한)."""
+    if "web_concurrency" in settings.model_fields_set:
+        return max(1, settings.web_concurrency)
+    return max(1, min(_cpu_count(), settings.db_max_connections // 2))
+
+
+def event_loop() -> str:
+    if sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None:
+        return "uvloop"
+    return "asyncio"
+
+
+def http_impl() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") is not None else "h11"
+
+
+# ---------- 워커 초기화 ----------
+def warm_worker() -> dict:
+    """
+    워커 시작 시 1회. 첫 요청들이 커넥션 생성/캐시 적재 비용을 내지 않게 미리 채운다.
+    DB가 아직 준비되지 않았어도 워커는 뜨도록 실패는 경고만 남긴다 (/healthz가 상태를 보고).
+    """
+    from .clients import get_openai
+    from .db import _pool_size, engine
+    from .name_cache import COMPANIES, JOBS
+    from .tenants import TENANTS
+
+    t0 = time.perf_counter()
+    report: dict = {"pid": os.getpid()}
+    get_openai()  # SDK import + 클라이언트 생성 (네트워크 접근 없음)
+    try:
+        if not settings.db_pgbouncer:
+            # 풀 크기만큼 동시에 열었다가 반납 → 풀에 유휴 커넥션으로 남는다
+            conns = [engine.connect() for _ in range(_pool_size())]
+            try:
+                for c in conns:
+                    c.exec_driver_sql("SELECT 1")
+            finally:
+                for c in conns:
+                    c.close()
+            report["connections"] = len(conns)
+        report["companies"] = COMPANIES.warmup()
+        report["jobs"] = JOBS.warmup()
+        report["tenants"] = TENANTS.reload()
+    except Exception as e:
+        log.warning("worker warmup failed: %s", e)
+        report["error"] = str(e)
+    report["seconds"] = round(time.perf_counter() - t0, 3)
+    log.info("worker warmup: %s", report)
+    return report
+
+
+# ---------- 실행 ----------
+def main(argv: Optional[list] = None) -> None:
+    ap = argparse.ArgumentParser(description="운영용 API 서버 (멀티 워커, reload 없음)")
+    ap.add_argument("--host", default=settings.server_host)
+    ap.add_argument("--port", type=int, default=settings.server_port)
+    ap.add_argument("--workers", type=int, default=None, help="기본: WEB_CONCURRENCY 또는 CPU 수")
+    args = ap.parse_args(argv)
+
+    import uvicorn
+
+    workers = args.workers or default_workers()
+    # 워커 프로세스의 Settings()가 같은 값을 읽도록 (DB 풀 크기 계산)
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    loop, http = event_loop(), http_impl()
+    logging.basicConfig(level=settings.log_level.upper())
+    log.info("serve: workers=%d loop=%s http=%s", workers, loop, http)
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        reload=False,
+        loop=loop,
+        http=http,
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.server_keepalive_seconds,
+        timeout_graceful_shutdown=settings.server_graceful_timeout_seconds,
+        limit_concurrency=settings.server_limit_concurrency,
+        access_log=settings.server_access_log,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.server_forwarded_allow_ips,
+        log_level=settings.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
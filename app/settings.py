@@ -1,14 +1,96 @@
 # app/settings.py
+import threading
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import Any, Dict, List, Optional
 
 class Settings(BaseSettings):
     database_url: str
     allowed_origins: List[str] = ["http://localhost:8501"]
     openai_api_key: str
+    openai_base_url: Optional[str] = None  # None이면 SDK 기본값 (벤치: 가짜 서버 주소)
     embedding_model: str = "text-embedding-3-small"
     log_level: str = "info"  # ← 추가
 
+    # DB 커넥션 풀
+    web_concurrency: int = 1  # 워커 프로세스 수 (WEB_CONCURRENCY)
+    db_max_connections: int = 20  # 전체 워커가 나눠 쓰는 커넥션 예산
+    db_pool_size: Optional[int] = None  # None이면 db_max_connections // web_concurrency
+    db_max_overflow: int = 5
+    db_pool_timeout: float = 10.0  # 초
+    db_pool_recycle: int = 1800  # 초, -1이면 비활성
+    db_pool_pre_ping: bool = True
+    db_pgbouncer: bool = False  # True면 앱 풀 비활성(NullPool), PgBouncer에 위임
+    db_statement_cache_size: int = 500  # SQLAlchemy 컴파일 캐시 크기
+    healthz_cache_seconds: float = 1.0  # healthz DB 프로브 결과 재사용 시간
+
+    # 검색
+    search_two_stage_candidates: int = 50  # two_stage 모드 1단계 후보 문항 수 (최소 top_k)
+    search_collapse_oversample: int = 5  # collapse 시 top_k × N건을 뽑아 클러스터별 1건으로 축약
+    search_cache_ttl_seconds: float = 10.0  # /search 응답 캐시 (0이면 끔), commit 시 세대 변경으로 무효화
+    search_cache_max_entries: int = 1024
+    query_embedding_cache_ttl_seconds: float = 600.0  # 정규화된 질의 → 임베딩 (0이면 끔)
+    query_embedding_cache_max_entries: int = 4096
+    query_embedding_cache_max_mb: float = 32.0  # 워커당 총 크기 (float32 보관, 1536차원 ≈ 6KB/개)
+    near_dup_threshold: float = 0.8  # preview 근사 중복 보고 기준 (MinHash Jaccard 추정치)
+
+    # 테넌트 (app/tenants.py): X-Tenant 헤더로 식별
+    tenant_default: str = "default"  # 헤더가 없을 때 쓰는 slug
+    tenant_required: bool = False  # True면 X-Tenant 필수 (없으면 401)
+    tenant_cache_seconds: float = 30.0  # tenants 행(한도/인덱스 여부) 재조회 간격
+    tenant_usage_cache_seconds: float = 5.0  # 일일 토큰 사용량 재조회 간격 (한도 초과 허용 오차)
+
+    # OpenAI 사용량 장부 / 예산 (app/usage.py)
+    embedding_batch_max_inputs: int = 2048  # OpenAI 요청 1회 입력 수 상한 (넘으면 나눠 호출)
+    embedding_batch_max_tokens: int = 300_000  # OpenAI 요청 1회 총 토큰 상한
+    embedding_max_input_tokens: int = 8191  # 입력 1개 상한 (tiktoken이 있을 때만 검사)
+    embedding_max_request_tokens: int = 1_000_000  # API 요청 1건의 추정 토큰 상한 (넘으면 413)
+    openai_embedding_rpm: int = 3000  # 계정 한도 (uv run usage estimate의 소요 시간 예측용)
+    openai_embedding_tpm: int = 1_000_000
+    # 모델별 USD / 1M 토큰 [입력, 출력]
+    openai_prices: Dict[str, List[float]] = {
+        "text-embedding-3-small": [0.02, 0.0],
+        "text-embedding-3-large": [0.13, 0.0],
+        "gpt-4o-mini": [0.15, 0.60],
+    }
+    usage_flush_seconds: float = 2.0  # 장부 배치 기록 간격
+    usage_flush_rows: int = 500  # 이만큼 쌓이면 간격 전이라도 기록
+
+    # 파티셔닝 (app/partitions.py): search_chunks 모델 파티션 아래 연도별 하위 파티션 범위
+    partition_year_from: int = 2018  # 이보다 이른 연도/NULL은 모델별 default 하위 파티션
+    partition_years_ahead: int = 1  # 올해 + N년까지 미리 만듦 (연초 전에 uv run partitions ensure)
+
+    # 입력 중 검색 (WebSocket /search/live)
+    live_search_debounce_ms: int = 250  # 마지막 입력 후 이만큼 조용하면 검색 시작
+    live_search_min_chars: int = 2  # 이보다 짧은 질의는 lexical 결과만 (임베딩 생략)
+    live_search_statement_timeout_ms: int = 3000  # 취소 신호가 유실돼도 남는 쿼리 상한
+
+    # Markdown 프리뷰 세션 (app/preview_store.py)
+    preview_session_ttl_seconds: int = 1800
+    preview_session_max_entries: int = 256
+    preview_session_max_bytes: int = 256 * 1024 * 1024  # 원문(디스크)+섹션(메모리) 합계 근사치
+    preview_spool_dir: Optional[str] = None  # 프리뷰 원문 임시 파일 위치 (None이면 시스템 임시 디렉터리)
+
+    # 응답 압축 (app/main.py)
+    response_compression: str = "off"  # "off" | "gzip" | "br" (br은 brotli-asgi 필요, 없으면 gzip)
+    response_compression_min_size: int = 1024  # 바이트, 이보다 작은 응답은 압축 안 함
+
+    # 운영 서버 (uv run serve, app/server.py) — 워커 수는 WEB_CONCURRENCY
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_keepalive_seconds: int = 5  # 유휴 keep-alive 연결 유지 (LB idle timeout보다 짧게)
+    server_graceful_timeout_seconds: int = 30  # 종료 시 진행 중 요청 대기 한도
+    server_limit_concurrency: Optional[int] = None  # 워커당 동시 연결 상한 (초과 시 503)
+    server_backlog: int = 2048
+    server_access_log: bool = False
+    server_forwarded_allow_ips: str = "127.0.0.1"  # X-Forwarded-* 를 신뢰할 프록시
+    server_warmup: bool = True  # 워커 시작 시 DB 풀/이름 캐시 미리 채움
+
+    # 트레이싱 (app/tracing.py)
+    trace_sample_ratio: float = 0.0  # 0이면 꺼짐, 1.0이면 모든 요청
+    trace_exporter: str = "file"  # "file" | "otlp" | "none"
+    trace_file: str = "traces.jsonl"  # OTLP/JSON 배치를 한 줄씩 기록
+    trace_otlp_endpoint: str = "http://127.0.0.1:4318/v1/traces"
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -16,4 +98,38 @@ class Settings(BaseSettings):
         extra="ignore",  # ← 여분 키가 있어도 무시(선택, 안전장치)
     )
 
-settings = Settings()
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+
+
+def get_settings() -> Settings:
+    """
+    Settings()는 첫 사용 시 만든다 (get_engine/get_openai와 같은 방식).
+    .env 읽기/검증은 실제로 설정을 읽는 경로만 낸다 — 모듈 수준에서 값을 읽는
+    cache/preview_store/tenants/main은 import 시점에 만들어진다.
+    """
+    global _settings
+    if _settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = Settings()
+    return _settings
+
+
+class _LazySettings:
+    """`from .settings import settings` 호환용: 속성 접근 시 get_settings()에 위임."""
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(get_settings(), name, value)
+
+    def __repr__(self) -> str:
+        return repr(_settings) if _settings is not None else "<settings (not loaded)>"
+
+
+settings = _LazySettings()
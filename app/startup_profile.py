@@ -0,0 +1,94 @@
+# app/startup_profile.py
+"""
+기동(import) 시간 프로파일 — `python -X importtime` 요약.
+
+    uv run profile-startup                      # app.main import (= 워커 기동 비용)
+    uv run profile-startup --module app.export  # 짧은 CLI 쪽
+    uv run profile-startup --top 30 --json
+
+새 인터프리터에서 모듈을 import해 (.pyc 캐시를 위해 1회 예열 후) 측정한다.
+- 패키지별: 최상위 패키지(openai, sqlalchemy, app …) 단위 self 시간 합계
+- 모듈별: cumulative 상위 N개 (어떤 import가 무거운 하위 트리를 끌고 오는지)
+"""
+from __future__ import annotations
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+__all__ = ["profile_import", "summarize", "main"]
+
+# "import time:       self [us] |  cumulative | imported package"
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_import(module: str) -> Tuple[float, List[Tuple[str, int, int, int]]]:
+    """(wall 초, [(모듈, self us, cumulative us, 깊이)])."""
+    cmd = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    subprocess.run(cmd, capture_output=True, check=False)  # .pyc 예열
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or ["?"]
+        raise SystemExit(f"import {module} 실패: {tail[0]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            depth = (len(m.group(3)) - 1) // 2
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), depth))
+    return wall, rows
+
+
+def summarize(rows: List[Tuple[str, int, int, int]], top: int) -> Dict:
+    by_pkg: Dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_pkg[name.split(".")[0]] += self_us
+    total_us = sum(by_pkg.values())
+    ms = lambda us: round(us / 1000, 1)  # noqa: E731
+    return {
+        "modules": len(rows),
+        "import_ms": ms(total_us),
+        "packages": [
+            {"package": p, "self_ms": ms(us), "share": round(us / total_us, 3) if total_us else 0.0}
+            for p, us in sorted(by_pkg.items(), key=lambda kv: -kv[1])[:top]
+        ],
+        "cumulative": [
+            {"module": n, "cumulative_ms": ms(cum), "self_ms": ms(s), "depth": d}
+            for n, s, cum, d in sorted(rows, key=lambda r: -r[2])[:top]
+        ],
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="모듈 import 시간 프로파일 (-X importtime 요약)")
+    ap.add_argument("--module", action="append", help="측정할 모듈 (반복 가능, 기본: app.main)")
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = ap.parse_args()
+
+    report = {}
+    for module in args.module or ["app.main"]:
+        wall, rows = profile_import(module)
+        report[module] = {"wall_ms": round(wall * 1000, 1), **summarize(rows, args.top)}
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    for module, r in report.items():
+        print(f"== import {module}: wall {r['wall_ms']} ms, import {r['import_ms']} ms, {r['modules']} modules")
+        print("-- 패키지별 self")
+        for p in r["packages"]:
+            print(f"  {p['self_ms']:>9.1f} ms  {p['share'] * 100:5.1f}%  {p['package']}")
+        print("-- cumulative 상위")
+        for m in r["cumulative"]:
+            print(f"  {m['cumulative_ms']:>9.1f} ms  {'  ' * m['depth']}{m['module']}")
+
+
+if __name__ == "__main__":
+    main()
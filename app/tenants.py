@@ -0,0 +1,376 @@
+# app/tenants.py
+"""
+테넌트(데이터 소유자) 식별 + 요청률 / 임베딩 토큰 한도 + 테넌트별 검색 인덱스.
+
+    def search(req, tenant: Tenant = Depends(current_tenant)): ...
+
+- 요청의 X-Tenant 헤더(slug)로 tenants 행을 찾는다. 헤더가 없으면 TENANT_DEFAULT("default", id 1).
+  TENANT_REQUIRED=true면 헤더 필수 (없으면 401, 모르는 slug는 403).
+- 요청률: 테넌트별 토큰 버킷 (requests_per_minute). 워커 프로세스마다 따로 세므로
+  한도를 WEB_CONCURRENCY로 나눠 적용한다 (DB 커넥션 예산과 같은 방식).
+- 임베딩 토큰: tenant_usage(테넌트, UTC 날짜)에 누적하고(app/usage.py 장부가 배치로 기록),
+  오늘 사용량 + 이번 요청 추정치가 embedding_tokens_per_day를 넘으면 OpenAI를 부르기 전에 429.
+  사용량은 TENANT_USAGE_CACHE_SECONDS 동안 워커 안에서 재사용한다.
+- 검색: dedicated_index 테넌트는 전용 partial hnsw (WHERE tenant_id = N)로 ANN,
+  나머지는 tenant_id btree로 자기 행만 읽어 정확 정렬한다 (ann_order 참고).
+  → 작은 테넌트의 검색 비용은 자기 데이터 크기에만 비례한다.
+
+    uv run tenants create acme --rpm 600 --daily-tokens 2000000
+    uv run tenants dedicate acme     # 전용 ANN 인덱스 (온라인 생성) 후 ANN 경로로 전환
+    uv run tenants list
+"""
+from __future__ import annotations
+import argparse
+import datetime as dt
+import math
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from fastapi import Header, HTTPException
+
+from .db import engine, sql
+from .metrics import TENANT_REJECTED
+from .settings import settings
+
+__all__ = [
+    "Tenant",
+    "TENANTS",
+    "current_tenant",
+    "resolve_tenant",
+    "take_request",
+    "check_embedding_quota",
+    "used_today",
+    "record_embedding_tokens",
+    "ann_order",
+    "ann_index_name",
+    "ann_index_definition",
+]
+
+DEFAULT_TENANT_ID = 1
+
+
+class Tenant:
+    __slots__ = (
+        "id",
+        "slug",
+        "requests_per_minute",
+        "embedding_tokens_per_day",
+        "dedicated_index",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        slug: str,
+        requests_per_minute: Optional[int],
+        embedding_tokens_per_day: Optional[int],
+        dedicated_index: bool,
+    ) -> None:
+        self.id = id
+        self.slug = slug
+        self.requests_per_minute = requests_per_minute
+        self.embedding_tokens_per_day = embedding_tokens_per_day
+        self.dedicated_index = dedicated_index
+
+    def __repr__(self) -> str:
+        return f"Tenant({self.id}, {self.slug!r})"
+
+
+# ---------- slug → Tenant 캐시 ----------
+class TenantCache:
+    """tenants 테이블 전체를 TTL 동안 들고 있는다 (한도 변경은 TTL 안에 반영)."""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._by_slug: Dict[str, Tenant] = {}
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, slug: str) -> Optional[Tenant]:
+        if time.monotonic() >= self._expires:
+            self.reload()
+        return self._by_slug.get(slug)
+
+    def reload(self) -> int:
+        with self._lock:
+            with engine.connect() as conn:
+                rows = conn.execute(
+                    sql(
+                        """
+                        SELECT id, slug, requests_per_minute, embedding_tokens_per_day, dedicated_index
+                        FROM tenants
+                        """
+                    )
+                ).fetchall()
+            self._by_slug = {r[1]: Tenant(*r) for r in rows}
+            self._expires = time.monotonic() + self.ttl
+            return len(self._by_slug)
+
+
+TENANTS = TenantCache(settings.tenant_cache_seconds)
+
+
+# ---------- 요청률 (토큰 버킷) ----------
+class _RateLimiter:
+    def __init__(self) -> None:
+        # tenant_id -> (남은 토큰, 마지막 갱신 시각)
+        self._buckets: Dict[int, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, tenant: Tenant) -> float:
+        """요청 1건 허용이면 0, 아니면 다음 토큰까지 남은 초."""
+        if not tenant.requests_per_minute:
+            return 0.0
+        per_worker = max(tenant.requests_per_minute / max(settings.web_concurrency, 1), 1.0)
+        rate = per_worker / 60.0
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(tenant.id, (per_worker, now))
+            tokens = min(per_worker, tokens + (now - last) * rate)
+            if tokens >= 1.0:
+                self._buckets[tenant.id] = (tokens - 1.0, now)
+                return 0.0
+            self._buckets[tenant.id] = (tokens, now)
+            return (1.0 - tokens) / rate
+
+
+_LIMITER = _RateLimiter()
+
+
+def resolve_tenant(slug: Optional[str]) -> Tenant:
+    """slug(없으면 기본 테넌트) → Tenant. 인증/식별 실패는 HTTPException."""
+    if not slug:
+        if settings.tenant_required:
+            raise HTTPException(status_code=401, detail="X-Tenant header required")
+        slug = settings.tenant_default
+    tenant = TENANTS.get(slug)
+    if tenant is None:
+        raise HTTPException(status_code=403, detail=f"Unknown tenant: {slug}")
+    return tenant
+
+
+def take_request(tenant: Tenant) -> None:
+    """요청률 한도를 넘었으면 429 (Retry-After)."""
+    wait = _LIMITER.take(tenant)
+    if wait:
+        TENANT_REJECTED.inc(tenant=tenant.slug, reason="rate")
+        raise HTTPException(
+            status_code=429,
+            detail="Tenant request rate limit exceeded",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+
+
+def current_tenant(x_tenant: Optional[str] = Header(None)) -> Tenant:
+    """라우터 의존성: 테넌트 식별 + 요청률 확인."""
+    tenant = resolve_tenant(x_tenant)
+    take_request(tenant)
+    return tenant
+
+
+# ---------- 임베딩 토큰 한도 ----------
+_USAGE_SQL = """
+    SELECT embedding_tokens FROM tenant_usage
+    WHERE tenant_id = :tid AND day = :day
+"""
+
+# tenant_id -> (날짜, 사용량, 만료 시각)
+_usage: Dict[int, Tuple[dt.date, int, float]] = {}
+_usage_lock = threading.Lock()
+
+
+def _today() -> dt.date:
+    return dt.datetime.now(dt.timezone.utc).date()
+
+
+def used_today(tenant_id: int) -> int:
+    """오늘(UTC) 임베딩 토큰 사용량 (워커 캐시 경유)."""
+    day = _today()
+    now = time.monotonic()
+    with _usage_lock:
+        item = _usage.get(tenant_id)
+        if item is not None and item[0] == day and item[2] > now:
+            return item[1]
+    with engine.connect() as conn:
+        used = conn.execute(sql(_USAGE_SQL), {"tid": tenant_id, "day": day}).scalar() or 0
+    with _usage_lock:
+        _usage[tenant_id] = (day, used, now + settings.tenant_usage_cache_seconds)
+    return used
+
+
+def check_embedding_quota(tenant: Tenant, tokens: int = 0) -> None:
+    """
+    오늘(UTC) 사용량 + tokens(이번 호출 추정치)가 한도를 넘으면 429. OpenAI 호출 전에 부른다.
+    tokens=0이면 이미 다 썼는지만 본다.
+    """
+    if tenant.embedding_tokens_per_day is None:
+        return
+    used = used_today(tenant.id)
+    if used < tenant.embedding_tokens_per_day and used + tokens <= tenant.embedding_tokens_per_day:
+        return
+    TENANT_REJECTED.inc(tenant=tenant.slug, reason="embedding_quota")
+    now = dt.datetime.now(dt.timezone.utc)
+    midnight = dt.datetime.combine(now.date() + dt.timedelta(days=1), dt.time(), dt.timezone.utc)
+    raise HTTPException(
+        status_code=429,
+        detail="Tenant daily embedding token quota exceeded",
+        headers={"Retry-After": str(math.ceil((midnight - now).total_seconds()))},
+    )
+
+
+def record_embedding_tokens(tenant_id: int, tokens: int) -> None:
+    """
+    임베딩 호출 후 이 워커의 사용량 캐시에 바로 반영 (다음 한도 확인에 쓰임).
+    DB(tenant_usage) 누적은 app/usage.py 장부가 배치로 한다 → 직접 부르지 말고 usage.record_usage 사용.
+    """
+    if not tokens:
+        return
+    day = _today()
+    with _usage_lock:
+        item = _usage.get(tenant_id)
+        if item is not None and item[0] == day:
+            _usage[tenant_id] = (day, item[1] + tokens, item[2])
+
+
+# ---------- 테넌트별 검색 인덱스 ----------
+def ann_order(distance_sql: str, tenant: Tenant) -> str:
+    """
+    ORDER BY 식. 전용 인덱스가 없는 테넌트는 "+ 0"으로 hnsw 정렬 스캔을 막는다:
+    공용 그래프를 훑은 뒤 테넌트 필터로 걸러 내는 대신(작은 테넌트는 결과가 비기 쉬움)
+    tenant_id 인덱스로 자기 행만 읽어 정확한 거리순으로 정렬한다.
+    """
+    return distance_sql if tenant.dedicated_index else f"({distance_sql}) + 0"
+
+
+# 테넌트별 ANN이 필요한 테이블: 청크 검색과 두 단계 검색의 1단계(문항 centroid)
+ANN_TABLES = ("search_chunks", "question_embeddings")
+
+
+def ann_index_name(tenant_id: int, table: str = "search_chunks") -> str:
+    return f"idx_{table}_cosine_t{tenant_id}"
+
+
+def ann_index_definition(tenant_id: int) -> str:
+    # 바인드 없이 리터럴: 질의의 s.tenant_id = N (psycopg2가 리터럴로 보냄)과 술어가 일치해야 쓰인다
+    return f"USING hnsw (embedding vector_cosine_ops) WHERE tenant_id = {int(tenant_id)}"
+
+
+def dedicate(slug: str) -> Dict[str, object]:
+    """전용 partial hnsw 인덱스를 온라인으로 만든 뒤 ANN 경로로 전환."""
+    from .partitions import create_index_online
+
+    with engine.connect() as conn:
+        tid = conn.execute(sql("SELECT id FROM tenants WHERE slug = :s"), {"s": slug}).scalar()
+    if tid is None:
+        raise SystemExit(f"unknown tenant: {slug}")
+    t0 = time.perf_counter()
+    for table in ANN_TABLES:
+        create_index_online(ann_index_name(tid, table), table, ann_index_definition(tid))
+    with engine.begin() as conn:
+        conn.execute(sql("UPDATE tenants SET dedicated_index = true WHERE id = :id"), {"id": tid})
+    return {
+        "tenant": slug,
+        "indexes": [ann_index_name(tid, t) for t in ANN_TABLES],
+        "seconds": round(time.perf_counter() - t0, 2),
+    }
+
+
+def undedicate(slug: str) -> Dict[str, object]:
+    with engine.begin() as conn:
+        tid = conn.execute(
+            sql("UPDATE tenants SET dedicated_index = false WHERE slug = :s RETURNING id"), {"s": slug}
+        ).scalar()
+        if tid is None:
+            raise SystemExit(f"unknown tenant: {slug}")
+        for table in ANN_TABLES:
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {ann_index_name(tid, table)}")
+    return {"tenant": slug, "dropped": [ann_index_name(tid, t) for t in ANN_TABLES]}
+
+
+# ---------- CLI ----------
+_LIST_SQL = """
+    SELECT t.id, t.slug, t.requests_per_minute, t.embedding_tokens_per_day, t.dedicated_index,
+           (SELECT count(*) FROM questions q WHERE q.tenant_id = t.id) AS questions,
+           (SELECT count(*) FROM search_chunks s WHERE s.tenant_id = t.id AND s.model = :model) AS chunks,
+           COALESCE(u.embedding_tokens, 0) AS tokens_today
+    FROM tenants t
+    LEFT JOIN tenant_usage u ON u.tenant_id = t.id AND u.day = :day
+    ORDER BY t.id
+"""
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="테넌트 관리")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    for name in ("create", "update"):
+        p = sub.add_parser(name)
+        p.add_argument("slug")
+        p.add_argument("--name")
+        p.add_argument("--rpm", type=int, help="분당 요청 수 (0이면 무제한)")
+        p.add_argument("--daily-tokens", type=int, help="일일 임베딩 토큰 (0이면 무제한)")
+    p = sub.add_parser("dedicate", help="전용 ANN 인덱스 생성 (큰 테넌트)")
+    p.add_argument("slug")
+    p = sub.add_parser("undedicate", help="전용 인덱스 삭제 (정확 검색으로)")
+    p.add_argument("slug")
+    sub.add_parser("list")
+    args = ap.parse_args()
+
+    if args.cmd in ("create", "update"):
+        params = {
+            "s": args.slug,
+            "n": args.name or args.slug,
+            "rpm": args.rpm or None,
+            "tok": args.daily_tokens or None,
+        }
+        with engine.begin() as conn:
+            if args.cmd == "create":
+                tid = conn.execute(
+                    sql(
+                        """
+                        INSERT INTO tenants (slug, name, requests_per_minute, embedding_tokens_per_day)
+                        VALUES (:s, :n, :rpm, :tok)
+                        RETURNING id
+                        """
+                    ),
+                    params,
+                ).scalar()
+            else:
+                # 주어진 값만 바꾼다 (0은 무제한으로)
+                tid = conn.execute(
+                    sql(
+                        """
+                        UPDATE tenants SET
+                            name = COALESCE(CAST(:name AS text), name),
+                            requests_per_minute = CASE WHEN :set_rpm THEN :rpm ELSE requests_per_minute END,
+                            embedding_tokens_per_day =
+                                CASE WHEN :set_tok THEN :tok ELSE embedding_tokens_per_day END
+                        WHERE slug = :s
+                        RETURNING id
+                        """
+                    ),
+                    {
+                        **params,
+                        "name": args.name,
+                        "set_rpm": args.rpm is not None,
+                        "set_tok": args.daily_tokens is not None,
+                    },
+                ).scalar()
+                if tid is None:
+                    raise SystemExit(f"unknown tenant: {args.slug}")
+        print({"id": tid, "slug": args.slug})
+    elif args.cmd == "dedicate":
+        print(dedicate(args.slug))
+    elif args.cmd == "undedicate":
+        print(undedicate(args.slug))
+    else:
+        with engine.connect() as conn:
+            rows = conn.execute(
+                sql(_LIST_SQL), {"model": settings.embedding_model, "day": _today()}
+            ).mappings().all()
+        for r in rows:
+            print(dict(r))
+
+
+if __name__ == "__main__":
+    main()
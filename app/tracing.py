@@ -0,0 +1,318 @@
+# app/tracing.py
+"""
+요청 단위 트레이싱 (OpenTelemetry 호환 span 모델, 외부 의존성 없음).
+
+    with span("upload_md.embed", chunks=len(texts)) as sp:
+        res = client.embeddings.create(...)
+        sp.set("openai.total_tokens", res.usage.total_tokens)
+
+- trace/span id, parent, 시작/종료 시각(unix ns), 속성, 상태를 OTLP/JSON 형식으로 내보낸다.
+- 샘플링은 트레이스(루트 span) 단위로 결정되고 하위 span은 그 결정을 따른다.
+  샘플링되지 않은 트레이스의 span은 no-op 이라 운영에서 켜 두어도 부담이 작다.
+- 내보내기는 백그라운드 스레드가 배치로 처리 (파일 JSONL 또는 OTLP/HTTP 수집기).
+- SQLAlchemy 엔진에 install_db_hooks(engine)을 걸면 모든 SQL 문이 span이 된다.
+"""
+from __future__ import annotations
+import atexit
+import contextvars
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from .settings import settings
+
+__all__ = [
+    "span",
+    "start_trace",
+    "current_span",
+    "install_db_hooks",
+    "traceparent",
+    "set_openai_usage",
+]
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "jargis_current_span", default=None
+)
+_rand = random.SystemRandom()
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str]) -> None:
+        self.trace_id = trace_id
+        self.span_id = f"{_rand.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+
+    def set(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def to_otlp(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attr(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            out["parentSpanId"] = self.parent_id
+        return out
+
+
+class _NoopSpan:
+    """샘플링되지 않은 트레이스용. 속성 기록을 무시한다."""
+
+    __slots__ = ()
+    trace_id = ""
+    span_id = ""
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_attr(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        v = {"boolValue": value}
+    elif isinstance(value, int):
+        v = {"intValue": str(value)}
+    elif isinstance(value, float):
+        v = {"doubleValue": value}
+    else:
+        v = {"stringValue": str(value)}
+    return {"key": key, "value": v}
+
+
+# ---------- 내보내기 ----------
+class _Exporter:
+    """span 큐 → 배치 → 파일(JSONL) 또는 OTLP/HTTP."""
+
+    def __init__(self, kind: str, path: str, endpoint: str, batch_size: int = 256, interval: float = 2.0) -> None:
+        self.kind = kind
+        self.path = path
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.interval = interval
+        self._q: "queue.Queue[Span]" = queue.Queue(maxsize=10_000)
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="jargis-trace-export", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, sp: Span) -> None:
+        try:
+            self._q.put_nowait(sp)
+        except queue.Full:
+            self.dropped += 1  # 수집기가 느려도 요청 경로는 막지 않는다
+
+    def _drain(self, block: bool) -> List[Span]:
+        batch: List[Span] = []
+        try:
+            batch.append(self._q.get(timeout=self.interval) if block else self._q.get_nowait())
+            while len(batch) < self.batch_size:
+                batch.append(self._q.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._drain(block=True)
+            if batch:
+                self._export(batch)
+
+    def flush(self) -> None:
+        while batch := self._drain(block=False):
+            self._export(batch)
+
+    def _payload(self, batch: List[Span]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            _otlp_attr("service.name", "jargis-api"),
+                            _otlp_attr("process.pid", os.getpid()),
+                        ]
+                    },
+                    "scopeSpans": [
+                        {"scope": {"name": "app.tracing"}, "spans": [s.to_otlp() for s in batch]}
+                    ],
+                }
+            ]
+        }
+
+    def _export(self, batch: List[Span]) -> None:
+        try:
+            body = json.dumps(self._payload(batch), ensure_ascii=False)
+            if self.kind == "otlp":
+                import httpx
+
+                httpx.post(
+                    self.endpoint,
+                    content=body,
+                    headers={"Content-Type": "application/json"},
+                    timeout=5.0,
+                )
+            else:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(body + "\n")
+        except Exception:
+            self.dropped += len(batch)
+
+
+_exporter: Optional[_Exporter] = None
+_exporter_lock = threading.Lock()
+
+
+def _get_exporter() -> Optional[_Exporter]:
+    global _exporter
+    if settings.trace_exporter == "none":
+        return None
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = _Exporter(
+                    settings.trace_exporter, settings.trace_file, settings.trace_otlp_endpoint
+                )
+    return _exporter
+
+
+# ---------- span API ----------
+def current_span():
+    return _current.get() or NOOP_SPAN
+
+
+def traceparent() -> Optional[str]:
+    """현재 span의 W3C traceparent 헤더 값 (하위 호출 전파용)."""
+    sp = _current.get()
+    return f"00-{sp.trace_id}-{sp.span_id}-01" if sp else None
+
+
+def _parse_traceparent(header: Optional[str]) -> tuple[Optional[str], Optional[str], Optional[bool]]:
+    # "00-<32 hex trace>-<16 hex parent>-<flags>"
+    try:
+        _, trace_id, parent_id, flags = (header or "").split("-")
+        if len(trace_id) == 32 and len(parent_id) == 16:
+            return trace_id, parent_id, bool(int(flags, 16) & 1)
+    except ValueError:
+        pass
+    return None, None, None
+
+
+@contextmanager
+def start_trace(name: str, traceparent_header: Optional[str] = None, **attrs: Any) -> Iterator[Any]:
+    """
+    루트 span 시작 + 샘플링 결정. 상위에서 traceparent를 받으면 그 트레이스를 잇고
+    sampled 플래그를 따른다. 없으면 trace_sample_ratio 확률로 샘플링.
+    """
+    trace_id, parent_id, sampled = _parse_traceparent(traceparent_header)
+    if sampled is None:
+        sampled = settings.trace_sample_ratio > 0 and _rand.random() < settings.trace_sample_ratio
+    if not sampled or _get_exporter() is None:
+        token = _current.set(None)
+        try:
+            yield NOOP_SPAN
+        finally:
+            _current.reset(token)
+        return
+    root = Span(name, trace_id or f"{_rand.getrandbits(128):032x}", parent_id)
+    with _activate(root, attrs) as sp:
+        yield sp
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Any]:
+    """현재 트레이스 아래 하위 span. 트레이스가 없거나 샘플링 제외면 no-op."""
+    parent = _current.get()
+    if parent is None:
+        yield NOOP_SPAN
+        return
+    with _activate(Span(name, parent.trace_id, parent.span_id), attrs) as sp:
+        yield sp
+
+
+@contextmanager
+def _activate(sp: Span, attrs: Dict[str, Any]) -> Iterator[Span]:
+    for k, v in attrs.items():
+        sp.set(k, v)
+    token = _current.set(sp)
+    try:
+        yield sp
+    except BaseException as e:
+        sp.error = f"{type(e).__name__}: {e}"[:500]
+        raise
+    finally:
+        _current.reset(token)
+        sp.end_ns = time.time_ns()
+        exporter = _get_exporter()
+        if exporter is not None:
+            exporter.submit(sp)
+
+
+def set_openai_usage(sp, usage) -> None:
+    """OpenAI 응답의 usage(토큰 수)를 span 속성으로."""
+    if usage is None:
+        return
+    for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        sp.set(f"openai.{key}", getattr(usage, key, None))
+
+
+# ---------- SQLAlchemy 연동 ----------
+_DB_SPAN_KEY = "_jargis_span"
+
+
+def install_db_hooks(engine) -> None:
+    """모든 SQL 실행을 db.query span으로 기록 (statement, rowcount)."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        parent = _current.get()
+        if parent is None:
+            return
+        sp = Span("db.query", parent.trace_id, parent.span_id)
+        sp.set("db.system", "postgresql")
+        sp.set("db.statement", " ".join(statement.split())[:1000])
+        sp.set("db.executemany", executemany)
+        conn.info.setdefault(_DB_SPAN_KEY, []).append(sp)
+
+    def _finish(conn, cursor, error: Optional[BaseException] = None) -> None:
+        stack = conn.info.get(_DB_SPAN_KEY)
+        if not stack:
+            return
+        sp = stack.pop()
+        if cursor is not None and getattr(cursor, "rowcount", -1) >= 0:
+            sp.set("db.rows", cursor.rowcount)
+        if error is not None:
+            sp.error = f"{type(error).__name__}: {error}"[:500]
+        sp.end_ns = time.time_ns()
+        exporter = _get_exporter()
+        if exporter is not None:
+            exporter.submit(sp)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        _finish(conn, cursor)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(ctx):
+        if ctx.connection is not None:
+            _finish(ctx.connection, ctx.cursor, ctx.original_exception)
@@ -0,0 +1,490 @@
+# app/usage.py
+"""
+OpenAI 사용량 장부(usage_ledger) + 호출 전 토큰 추정/예산 확인 + 백필 비용 예측.
+
+    counts = plan_embedding(texts, tenant)     # 추정 + 한도 확인 (413/429, 호출 전)
+    vectors = embed_texts(client, texts, "upload", tenant, document_id=doc_id, counts=counts)
+    record_usage("draft", "chat", "gpt-4o-mini", tenant.id, prompt_tokens=..., completion_tokens=...)
+
+- 토큰 추정은 utils.tokens.count_tokens (tiktoken이 있으면 정확, 없으면 보수적 근사).
+  추정치로 OpenAI 요청 1회 한도(EMBEDDING_BATCH_MAX_INPUTS / _TOKENS)에 맞춰 배치를 나누고,
+  요청당 상한(EMBEDDING_MAX_REQUEST_TOKENS)과 테넌트 일일 한도를 돈을 쓰기 전에 확인한다.
+- 장부 기록은 요청 경로 밖: 큐 → 백그라운드 스레드가 USAGE_FLUSH_SECONDS마다
+  (테넌트, 엔드포인트, 모델, 종류, 문서)별로 합쳐 한 번에 INSERT하고 tenant_usage도 같은 트랜잭션에서 누적.
+  큐가 차거나 DB 오류면 버리고 jargis_usage_dropped_total로 센다. 종료 시 남은 것은 flush.
+- 장부에는 추정치와 실제(usage) 토큰이 함께 남아 추정 오차를 확인할 수 있다.
+
+    GET /usage?days=7&group_by=endpoint|model|kind|document|day
+    uv run usage summary [--tenant acme] [--days 30] [--by model]
+    uv run usage estimate [--tenant acme] [--model text-embedding-3-large] [--sample 5000]
+    uv run usage estimate --md bench/data          # Markdown 적재 전 예측
+"""
+from __future__ import annotations
+import argparse
+import atexit
+import datetime as dt
+import logging
+import math
+import queue
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+from .db import engine, sql
+from .metrics import OPENAI_BATCH_SIZE, OPENAI_TOKENS, USAGE_DROPPED, timed
+from .settings import settings
+from .tenants import Tenant, check_embedding_quota, record_embedding_tokens
+from .tracing import set_openai_usage
+from .utils.tokens import EXACT, count_tokens, split_batches
+
+__all__ = [
+    "plan_embedding",
+    "embed_texts",
+    "record_usage",
+    "flush_usage",
+    "usage_summary",
+    "estimate_embedding",
+    "GROUP_BY",
+    "EMBEDDING",
+    "CHAT",
+]
+
+log = logging.getLogger(__name__)
+
+EMBEDDING = "embedding"
+CHAT = "chat"
+
+
+# ---------- 호출 전 추정 / 예산 ----------
+def plan_embedding(texts: Sequence[str], tenant: Optional[Tenant] = None) -> List[int]:
+    """입력별 추정 토큰 수. 요청/입력 상한이나 테넌트 일일 한도를 넘으면 OpenAI 호출 전에 413/429."""
+    counts = [count_tokens(t) for t in texts]
+    total = sum(counts)
+    if EXACT:  # 근사치로는 거절하지 않는다 (보수적이라 정상 입력도 넘길 수 있음)
+        over = [i for i, n in enumerate(counts) if n > settings.embedding_max_input_tokens]
+        if over:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Input too long for embedding at index {over[:10]} "
+                f"(max {settings.embedding_max_input_tokens} tokens)",
+            )
+    if total > settings.embedding_max_request_tokens:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Request needs ~{total} embedding tokens "
+            f"(max {settings.embedding_max_request_tokens} per request)",
+        )
+    if tenant is not None:
+        check_embedding_quota(tenant, total)
+    return counts
+
+
+def embed_texts(
+    client,
+    texts: Sequence[str],
+    endpoint: str,
+    tenant: Optional[Tenant] = None,
+    document_id: Optional[int] = None,
+    counts: Optional[Sequence[int]] = None,
+) -> List[List[float]]:
+    """
+    임베딩 (입력 순서 유지). 추정치로 요청 1회 한도에 맞게 나눠 호출하고 배치마다 사용량을 기록한다.
+    counts가 없으면 plan_embedding으로 확인부터 한다. OpenAI 예외는 그대로 올린다
+    (앞 배치는 이미 과금됐으므로 기록된 채 남는다).
+    """
+    if counts is None:
+        counts = plan_embedding(texts, tenant)
+    model = settings.embedding_model
+    tenant_id = tenant.id if tenant is not None else None
+    vectors: List[List[float]] = []
+    for start, end in split_batches(
+        counts, settings.embedding_batch_max_inputs, settings.embedding_batch_max_tokens
+    ):
+        part = list(texts[start:end])
+        estimated = sum(counts[start:end])
+        with timed(
+            endpoint,
+            "embed",
+            **{
+                "openai.model": model,
+                "openai.inputs": len(part),
+                "openai.estimated_tokens": estimated,
+            },
+        ) as sp:
+            emb = client.embeddings.create(model=model, input=part)
+            set_openai_usage(sp, emb.usage)
+        vectors.extend(d.embedding for d in sorted(emb.data, key=lambda d: d.index))
+        OPENAI_BATCH_SIZE.observe(len(part), endpoint=endpoint)
+        record_usage(
+            endpoint,
+            EMBEDDING,
+            model,
+            tenant_id,
+            document_id,
+            inputs=len(part),
+            estimated_tokens=estimated,
+            prompt_tokens=emb.usage.total_tokens if emb.usage else estimated,
+        )
+    return vectors
+
+
+# ---------- 장부 기록 (비동기 배치) ----------
+# (tenant_id, endpoint, model, kind, document_id, UTC 날짜) → 합산 대상
+_Key = Tuple[Optional[int], str, str, str, Optional[int], dt.date]
+
+_INSERT_LEDGER_SQL = """
+    INSERT INTO usage_ledger (
+        tenant_id, endpoint, model, kind, document_id,
+        requests, inputs, estimated_tokens, prompt_tokens, completion_tokens
+    )
+    VALUES (:tenant_id, :endpoint, :model, :kind, :document_id,
+            :requests, :inputs, :estimated_tokens, :prompt_tokens, :completion_tokens)
+"""
+
+_ADD_TENANT_USAGE_SQL = """
+    INSERT INTO tenant_usage (tenant_id, day, embedding_tokens)
+    VALUES (:tid, :day, :n)
+    ON CONFLICT (tenant_id, day) DO UPDATE
+    SET embedding_tokens = tenant_usage.embedding_tokens + EXCLUDED.embedding_tokens
+"""
+
+
+class _LedgerWriter:
+    """사용량 이벤트 큐 → 키별 합산 → usage_ledger / tenant_usage 배치 기록."""
+
+    def __init__(self, interval: float, batch_size: int) -> None:
+        self.interval = interval
+        self.batch_size = batch_size
+        self._q: "queue.Queue[Tuple[_Key, Tuple[int, ...]]]" = queue.Queue(maxsize=100_000)
+        self._write_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="jargis-usage-ledger", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, key: _Key, values: Tuple[int, ...]) -> None:
+        try:
+            self._q.put_nowait((key, values))
+        except queue.Full:
+            USAGE_DROPPED.inc(reason="queue_full")  # DB가 느려도 요청 경로는 막지 않는다
+
+    def _drain(self, block: bool) -> List[Tuple[_Key, Tuple[int, ...]]]:
+        # block: 첫 이벤트 후 interval 동안(또는 batch_size까지) 모아서 한 번에 쓴다
+        batch: List[Tuple[_Key, Tuple[int, ...]]] = []
+        try:
+            batch.append(self._q.get() if block else self._q.get_nowait())
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if block and remaining > 0:
+                    batch.append(self._q.get(timeout=remaining))
+                else:
+                    batch.append(self._q.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._drain(block=True)
+            if batch:
+                self._write(batch)
+
+    def flush(self) -> None:
+        while batch := self._drain(block=False):
+            self._write(batch)
+
+    def _write(self, batch: List[Tuple[_Key, Tuple[int, ...]]]) -> None:
+        totals: Dict[_Key, List[int]] = defaultdict(lambda: [0, 0, 0, 0, 0])
+        for key, values in batch:
+            acc = totals[key]
+            for i, v in enumerate(values):
+                acc[i] += v
+        rows = []
+        tenant_tokens: Dict[Tuple[int, dt.date], int] = defaultdict(int)
+        for (tenant_id, endpoint, model, kind, document_id, day), v in totals.items():
+            rows.append(
+                {
+                    "tenant_id": tenant_id,
+                    "endpoint": endpoint,
+                    "model": model,
+                    "kind": kind,
+                    "document_id": document_id,
+                    "requests": v[0],
+                    "inputs": v[1],
+                    "estimated_tokens": v[2],
+                    "prompt_tokens": v[3],
+                    "completion_tokens": v[4],
+                }
+            )
+            if kind == EMBEDDING and tenant_id is not None:
+                tenant_tokens[(tenant_id, day)] += v[3]
+        try:
+            with self._write_lock, engine.begin() as conn:
+                conn.execute(sql(_INSERT_LEDGER_SQL), rows)
+                if tenant_tokens:
+                    conn.execute(
+                        sql(_ADD_TENANT_USAGE_SQL),
+                        [{"tid": t, "day": d, "n": n} for (t, d), n in sorted(tenant_tokens.items())],
+                    )
+        except Exception as e:
+            USAGE_DROPPED.inc(len(batch), reason="db_error")
+            log.warning("usage ledger write failed (%d events): %s", len(batch), e)
+
+
+_writer: Optional[_LedgerWriter] = None
+_writer_lock = threading.Lock()
+
+
+def _get_writer() -> _LedgerWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = _LedgerWriter(settings.usage_flush_seconds, settings.usage_flush_rows)
+    return _writer
+
+
+def record_usage(
+    endpoint: str,
+    kind: str,
+    model: str,
+    tenant_id: Optional[int] = None,
+    document_id: Optional[int] = None,
+    *,
+    inputs: int = 1,
+    estimated_tokens: int = 0,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+) -> None:
+    """OpenAI 호출 1회의 사용량: 메트릭·테넌트 캐시는 즉시, 장부/tenant_usage는 배치로."""
+    if kind == EMBEDDING:
+        OPENAI_TOKENS.inc(prompt_tokens, endpoint=endpoint, kind="embedding")
+        if tenant_id is not None:
+            record_embedding_tokens(tenant_id, prompt_tokens)
+    else:
+        OPENAI_TOKENS.inc(prompt_tokens, endpoint=endpoint, kind="prompt")
+        OPENAI_TOKENS.inc(completion_tokens, endpoint=endpoint, kind="completion")
+    day = dt.datetime.now(dt.timezone.utc).date()
+    _get_writer().submit(
+        (tenant_id, endpoint, model, kind, document_id, day),
+        (1, inputs, estimated_tokens, prompt_tokens, completion_tokens),
+    )
+
+
+def flush_usage() -> None:
+    """큐에 남은 이벤트를 지금 기록 (워커 종료 시)."""
+    if _writer is not None:
+        _writer.flush()
+
+
+# ---------- 요약 ----------
+GROUP_BY = {
+    "endpoint": "endpoint",
+    "model": "model",
+    "kind": "kind",
+    "document": "CAST(document_id AS text)",
+    "day": "CAST(CAST(created_at AT TIME ZONE 'UTC' AS date) AS text)",
+}
+
+_SUMMARY_SQL = """
+    SELECT {key} AS key, model,
+           SUM(requests) AS requests,
+           SUM(inputs) AS inputs,
+           SUM(estimated_tokens) AS estimated_tokens,
+           SUM(prompt_tokens) AS prompt_tokens,
+           SUM(completion_tokens) AS completion_tokens
+    FROM usage_ledger
+    WHERE created_at >= now() - make_interval(days => :days)
+      AND (CAST(:tenant AS int) IS NULL OR tenant_id = :tenant)
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+"""
+
+_SUM_FIELDS = ("requests", "inputs", "estimated_tokens", "prompt_tokens", "completion_tokens")
+
+
+def _cost(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    price = settings.openai_prices.get(model)
+    if price is None:
+        return None
+    out = price[1] if len(price) > 1 else 0.0
+    return (prompt_tokens * price[0] + completion_tokens * out) / 1_000_000
+
+
+def usage_summary(tenant_id: Optional[int], days: int = 7, group_by: str = "endpoint") -> Dict[str, Any]:
+    """최근 days일 사용량을 group_by별로 (모델 가격으로 USD 환산). tenant_id=None이면 전체."""
+    with engine.connect() as conn:
+        rows = conn.execute(
+            sql(_SUMMARY_SQL.format(key=GROUP_BY[group_by])), {"days": days, "tenant": tenant_id}
+        ).mappings().all()
+    groups: Dict[Optional[str], Dict[str, Any]] = {}
+    total: Dict[str, Any] = {f: 0 for f in _SUM_FIELDS}
+    total["cost_usd"] = 0.0
+    unpriced = set()
+    for r in rows:
+        g = groups.setdefault(r["key"], {"key": r["key"], **{f: 0 for f in _SUM_FIELDS}, "cost_usd": 0.0})
+        for f in _SUM_FIELDS:
+            g[f] += int(r[f])
+            total[f] += int(r[f])
+        cost = _cost(r["model"], int(r["prompt_tokens"]), int(r["completion_tokens"]))
+        if cost is None:
+            unpriced.add(r["model"])
+            continue
+        g["cost_usd"] += cost
+        total["cost_usd"] += cost
+    for g in list(groups.values()) + [total]:
+        g["cost_usd"] = round(g["cost_usd"], 6)
+    # 추정/실제 비율 (1보다 크면 보수적으로 추정)
+    total["estimate_ratio"] = (
+        round(total["estimated_tokens"] / total["prompt_tokens"], 3) if total["prompt_tokens"] else None
+    )
+    return {
+        "days": days,
+        "group_by": group_by,
+        "groups": list(groups.values()),
+        "total": total,
+        "unpriced_models": sorted(unpriced),
+    }
+
+
+# ---------- 백필/적재 예측 ----------
+def estimate_embedding(texts: Iterable[str], model: Optional[str] = None, scale: float = 1.0) -> Dict[str, Any]:
+    """
+    texts를 임베딩한다면: 토큰/요청 수, 비용, 계정 한도(RPM/TPM) 기준 최소 소요 시간.
+    scale: 표본으로 추정할 때 전체/표본 배율.
+    """
+    model = model or settings.embedding_model
+    counts = [count_tokens(t) for t in texts]
+    batches = split_batches(
+        counts, settings.embedding_batch_max_inputs, settings.embedding_batch_max_tokens
+    )
+    inputs = round(len(counts) * scale)
+    tokens = round(sum(counts) * scale)
+    requests = math.ceil(len(batches) * scale)
+    minutes = max(
+        requests / max(settings.openai_embedding_rpm, 1),
+        tokens / max(settings.openai_embedding_tpm, 1),
+    )
+    cost = _cost(model, tokens, 0)
+    return {
+        "model": model,
+        "inputs": inputs,
+        "tokens": tokens,
+        "requests": requests,
+        "cost_usd": round(cost, 4) if cost is not None else None,
+        "min_minutes": round(minutes, 2),  # 한도만큼 꽉 채워 보낼 때의 하한
+        "bound_by": "tpm"
+        if tokens / max(settings.openai_embedding_tpm, 1) >= requests / max(settings.openai_embedding_rpm, 1)
+        else "rpm",
+        "exact_tokenizer": EXACT,
+        "sampled": scale != 1.0,
+    }
+
+
+_STORED_SQL = """
+    SELECT DISTINCT ON (chunk_hash) chunk_text
+    FROM embeddings
+    WHERE model = :model
+      AND (CAST(:tenant AS int) IS NULL OR tenant_id = :tenant)
+    ORDER BY chunk_hash
+"""
+
+_STORED_COUNT_SQL = """
+    SELECT count(DISTINCT chunk_hash)
+    FROM embeddings
+    WHERE model = :model
+      AND (CAST(:tenant AS int) IS NULL OR tenant_id = :tenant)
+"""
+
+_STORED_SAMPLE_SQL = """
+    SELECT chunk_text
+    FROM embeddings
+    WHERE model = :model
+      AND (CAST(:tenant AS int) IS NULL OR tenant_id = :tenant)
+    ORDER BY random()
+    LIMIT :n
+"""
+
+
+def _stored_texts(tenant_id: Optional[int], sample: int) -> Tuple[Iterable[str], float]:
+    """현재 모델로 저장된 고유 청크(chunk_hash 기준) 텍스트. sample>0이면 표본 + 배율."""
+    params = {"model": settings.embedding_model, "tenant": tenant_id}
+    if sample:
+        with engine.connect() as conn:
+            total = conn.execute(sql(_STORED_COUNT_SQL), params).scalar() or 0
+            texts = conn.execute(sql(_STORED_SAMPLE_SQL), {**params, "n": sample}).scalars().all()
+        return texts, (total / len(texts) if texts else 1.0)
+
+    def stream() -> Iterable[str]:
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=2000).execute(
+                sql(_STORED_SQL), params
+            )
+            for text in result.scalars():
+                yield text
+
+    return stream(), 1.0
+
+
+def _markdown_texts(paths: Sequence[Path]) -> List[str]:
+    """Markdown 파일들을 upload-md와 같은 규칙으로 청킹한 고유 청크."""
+    from .utils.chunking import semantic_chunk
+    from .utils.md_parse import parse_md_blocks
+
+    files: List[Path] = []
+    for p in paths:
+        files.extend(sorted(p.rglob("*.md")) if p.is_dir() else [p])
+    chunks: Dict[str, None] = {}
+    for f in files:
+        for sec in parse_md_blocks(f.read_text(encoding="utf-8")):
+            for ck in semantic_chunk((sec.get("answer") or sec.get("question") or "").strip()):
+                chunks[ck] = None
+    return list(chunks)
+
+
+# ---------- CLI ----------
+def main() -> None:
+    ap = argparse.ArgumentParser(description="OpenAI 사용량 요약 / 임베딩 비용 예측")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("summary", help="장부 요약")
+    p.add_argument("--tenant", help="테넌트 slug (기본: 전체)")
+    p.add_argument("--days", type=int, default=7)
+    p.add_argument("--by", choices=sorted(GROUP_BY), default="endpoint")
+    p = sub.add_parser("estimate", help="재임베딩 백필 / Markdown 적재 비용·시간 예측")
+    p.add_argument("--tenant", help="테넌트 slug (기본: 전체)")
+    p.add_argument("--model", help="대상 모델 (기본: EMBEDDING_MODEL)")
+    p.add_argument("--sample", type=int, default=0, help="저장된 청크에서 표본 N개로 추정 (0이면 전수)")
+    p.add_argument("--md", type=Path, nargs="+", help="Markdown 파일/디렉터리 (저장된 청크 대신)")
+    args = ap.parse_args()
+
+    tenant_id = None
+    if args.tenant:
+        from .tenants import TENANTS
+
+        tenant = TENANTS.get(args.tenant)
+        if tenant is None:
+            raise SystemExit(f"unknown tenant: {args.tenant}")
+        tenant_id = tenant.id
+
+    if args.cmd == "summary":
+        out = usage_summary(tenant_id, args.days, args.by)
+        for g in out["groups"]:
+            print(g)
+        print({"total": out["total"], "unpriced_models": out["unpriced_models"]})
+        return
+    t0 = time.perf_counter()
+    if args.md:
+        texts, scale = _markdown_texts(args.md), 1.0
+    else:
+        texts, scale = _stored_texts(tenant_id, args.sample)
+    out = estimate_embedding(texts, args.model, scale)
+    out["seconds"] = round(time.perf_counter() - t0, 2)
+    print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# app/utils/chunking.py
+from __future__ import annotations
+import re
+from typing import List
+
+from .tokens import chunk_tokens
+
+__all__ = ["semantic_chunk", "DEFAULT_MAX_TOKENS"]
+
+# text-embedding-3-small 기준, 문항 답변(800~1000자) 하나가 1~2청크가 되도록
+DEFAULT_MAX_TOKENS = 512
+
+# 빈 줄 = 문단 경계
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+# 답변 안의 소제목 라인 예: "[신뢰를 주는 디지털 인재]"
+_BRACKET_HEADER_RE = re.compile(r"^\s*\[[^\[\]\n]+\]\s*$")
+
+# 문장 끝: 종결부호(. ! ? 。 …) + 닫는 따옴표/괄호, 그 뒤에 공백이 올 때.
+# 문장은 이 끝까지 자르고 공백만 버린다 (닫는 부호는 문장에 남는다)
+_SENTENCE_END_RE = re.compile(r"[.!?。…][\"'”’)\]]*(?=\s)")
+
+
+def _paragraphs(text: str) -> List[str]:
+    """
+    문단 분리. 대괄호 소제목 라인은 독립 문단으로 떼어낸 뒤,
+    바로 다음 문단 앞에 붙여 소제목과 본문이 같은 청크에 들어가게 한다.
+    """
+    paras: List[str] = []
+    for block in _PARAGRAPH_RE.split(text):
+        lines = [ln.strip() for ln in block.strip().splitlines() if ln.strip()]
+        buf: List[str] = []
+        for ln in lines:
+            if _BRACKET_HEADER_RE.match(ln):
+                if buf:
+                    paras.append(" ".join(buf))
+                    buf = []
+                paras.append(ln)
+            else:
+                buf.append(ln)
+        if buf:
+            paras.append(" ".join(buf))
+
+    merged: List[str] = []
+    pending_header = None
+    for p in paras:
+        if _BRACKET_HEADER_RE.match(p):
+            pending_header = p if pending_header is None else pending_header + "\n" + p
+            continue
+        if pending_header is not None:
+            p = pending_header + "\n" + p
+            pending_header = None
+        merged.append(p)
+    if pending_header is not None:
+        merged.append(pending_header)
+    return merged
+
+
+def _sentences(paragraph: str) -> List[str]:
+    parts: List[str] = []
+    start = 0
+    for m in _SENTENCE_END_RE.finditer(paragraph):
+        parts.append(paragraph[start : m.end()])
+        start = m.end()
+    parts.append(paragraph[start:])
+    return [s.strip() for s in parts if s.strip()]
+
+
+def _split_chars(word: str, max_tokens: int) -> List[str]:
+    """공백 없는 긴 토큰(URL, 붙여 쓴 문자열 등): 예산에 맞는 가장 긴 접두어씩 글자 단위로."""
+    pieces: List[str] = []
+    while word:
+        lo, hi = 1, len(word)  # 최소 1글자는 진행
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if chunk_tokens(word[:mid]) <= max_tokens:
+                lo = mid
+            else:
+                hi = mid - 1
+        pieces.append(word[:lo])
+        word = word[lo:]
+    return pieces
+
+
+def _hard_split(sentence: str, max_tokens: int) -> List[str]:
+    """예산을 넘는 단일 문장: 공백(어절) 경계에서 자르고, 어절 하나가 넘치면 글자 단위로."""
+    pieces: List[str] = []
+    buf = ""
+    for word in sentence.split():
+        if chunk_tokens(word) > max_tokens:
+            if buf:
+                pieces.append(buf)
+                buf = ""
+            pieces.extend(_split_chars(word, max_tokens))
+            continue
+        cand = f"{buf} {word}" if buf else word
+        if buf and chunk_tokens(cand) > max_tokens:
+            pieces.append(buf)
+            buf = word
+        else:
+            buf = cand
+    if buf:
+        pieces.append(buf)
+    return pieces
+
+
+def semantic_chunk(text: str, max_tokens: int = DEFAULT_MAX_TOKENS) -> List[str]:
+    """
+    문단/문장 경계를 지키는 토큰 예산 기반 청킹.
+    - 문단을 통째로 채울 수 있으면 문단 단위로 묶고(문단 사이 빈 줄 유지),
+      넘치면 문장 단위로, 그래도 넘치는 문장은 어절 단위로 나눈다.
+    - 오버랩 없음: 경계가 문장 단위라 잘린 문맥을 보충할 필요가 없다.
+    - 입력이 같으면 출력도 항상 같다 (chunk_hash 안정성). 토큰 수는 tiktoken이 아닌
+      고정 근사치(chunk_tokens)로 세어 설치 환경에 따라 경계가 바뀌지 않는다.
+    """
+    text = (text or "").strip()
+    if not text:
+        return []
+
+    units: List[tuple[str, str]] = []  # (sep, text): sep는 앞 유닛과의 구분자
+    for para in _paragraphs(text):
+        if chunk_tokens(para) <= max_tokens:
+            units.append(("\n\n", para))
+            continue
+        first = True
+        for sent in _sentences(para):
+            parts = (
+                [sent] if chunk_tokens(sent) <= max_tokens else _hard_split(sent, max_tokens)
+            )
+            for part in parts:
+                units.append(("\n\n" if first else " ", part))
+                first = False
+
+    chunks: List[str] = []
+    buf = ""
+    buf_tokens = 0
+    for sep, unit in units:
+        unit_tokens = chunk_tokens(unit)
+        if buf and buf_tokens + unit_tokens > max_tokens:
+            chunks.append(buf)
+            buf, buf_tokens = "", 0
+        buf = f"{buf}{sep}{unit}" if buf else unit
+        buf_tokens += unit_tokens
+    if buf:
+        chunks.append(buf)
+    return chunks
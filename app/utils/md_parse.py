@@ -1,9 +1,16 @@
 # app/utils/md_parse.py
 from __future__ import annotations
+import codecs
+import hashlib
 import re
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List
 
-__all__ = ["parse_md_blocks", "extract_year_candidates"]
+__all__ = [
+    "parse_md_blocks",
+    "extract_year_candidates",
+    "MdStreamParser",
+    "iter_md_sections",
+]
 
 # 헤더 라인 예: "# 자기소개서 1 – [입행 목표 및 성장 계획]"
 HEADING_RE = re.compile(
@@ -97,3 +104,105 @@ def extract_year_candidates(text: str) -> List[int]:
     정확한 year 결정은 상위 로직에서 빈도/우선순위로 판단.
     """
     return [int(y) for y in _YEAR_RE.findall(text or "") if 2000 <= int(y) <= 2099]
+
+
+# ---------- 스트리밍(라인 단위) 파서 ----------
+# HEADING_RE / LABEL_RE 와 같은 규칙을 한 줄(개행 포함)에 fullmatch로 적용
+_HEADING_LINE_RE = re.compile(r"#\s*자기소개서\s+\d+\s*[–-]\s*\[(?P<title>.+?)\]\s*")
+_LABEL_LINE_RE = re.compile(r"\s*\*\*(질문|답변)\*\*\s*")
+_LABEL_KEYS = {"질문": "question", "답변": "answer"}
+
+
+class MdStreamParser:
+    """
+    업로드 바이트를 조각 단위로 받아 한 번의 순회로
+    (1) 문서 sha256, (2) 연도 후보, (3) 섹션 파싱을 동시에 수행.
+
+        parser = MdStreamParser()
+        for data in chunks:
+            for sec in parser.feed(data):
+                ...
+        for sec in parser.close():
+            ...
+        parser.content_hash  # == sha256_hex(raw_text)
+
+    섹션 형식은 parse_md_blocks와 동일. 한 번에 메모리에 올라가는 것은
+    현재 섹션과 미완성 라인뿐이다 (O(가장 큰 섹션)).
+    잘못된 UTF-8이면 UnicodeDecodeError.
+    """
+
+    def __init__(self) -> None:
+        self._hasher = hashlib.sha256()
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._pending = ""
+        self._title: str | None = None
+        self._body: List[str] = []
+        self._blocks: Dict[str, List[str]] = {}
+        self._current: str | None = None
+        self.years: List[int] = []
+        self.bytes_read = 0
+
+    @property
+    def content_hash(self) -> str:
+        return self._hasher.hexdigest()
+
+    def feed(self, data: bytes) -> Iterator[Dict[str, str]]:
+        self._hasher.update(data)
+        self.bytes_read += len(data)
+        self._pending += self._decoder.decode(data)
+        if "\n" not in self._pending:
+            return
+        *lines, self._pending = self._pending.split("\n")
+        for line in lines:
+            sec = self._line(line + "\n")
+            if sec is not None:
+                yield sec
+
+    def close(self) -> Iterator[Dict[str, str]]:
+        self._pending += self._decoder.decode(b"", final=True)
+        if self._pending:
+            sec = self._line(self._pending)
+            self._pending = ""
+            if sec is not None:
+                yield sec
+        if self._title is not None:
+            yield self._flush()
+            self._title = None
+
+    def _line(self, line: str) -> Dict[str, str] | None:
+        self.years.extend(extract_year_candidates(line))
+        m = _HEADING_LINE_RE.fullmatch(line)
+        if m:
+            done = self._flush() if self._title is not None else None
+            self._title = m.group("title").strip()
+            self._body, self._blocks, self._current = [], {}, None
+            return done
+        if self._title is None:
+            return None
+        self._body.append(line)
+        lab = _LABEL_LINE_RE.fullmatch(line)
+        if lab:
+            # 같은 라벨이 반복되면 마지막 블록이 이긴다 (_extract_blocks와 동일)
+            self._current = _LABEL_KEYS[lab.group(1)]
+            self._blocks[self._current] = []
+        elif self._current is not None:
+            self._blocks[self._current].append(line)
+        return None
+
+    def _flush(self) -> Dict[str, str]:
+        raw = "".join(self._body).strip()
+        if self._blocks:
+            question = "".join(self._blocks.get("question", [])).strip()
+            answer = "".join(self._blocks.get("answer", [])).strip()
+        else:
+            # 라벨이 없다면 전체를 답변으로 간주 (보수적)
+            question, answer = "", raw
+        return {"title": self._title, "question": question, "answer": answer, "raw": raw}
+
+
+def iter_md_sections(chunks: Iterable[bytes]) -> Iterator[Dict[str, str]]:
+    """바이트 조각 iterable → 섹션 제너레이터 (동기 버전)."""
+    parser = MdStreamParser()
+    for data in chunks:
+        yield from parser.feed(data)
+    yield from parser.close()
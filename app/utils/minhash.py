@@ -0,0 +1,87 @@
+# app/utils/minhash.py
+"""
+MinHash 서명 + LSH 밴딩 (근사 중복 답변 탐지용).
+
+    sig = minhash_signature(answer)           # 128개 정수 (짧은 텍스트면 None)
+    keys = lsh_buckets(sig)                   # [(band, bucket), ...] 16개
+    estimate_jaccard(sig, other_sig)          # 같은 위치 값 일치 비율 ≈ Jaccard
+
+- 정규화: NFKC → 소문자 → 한글/영문/숫자만 남김 (공백·문장부호 차이는 무시)
+- shingle: 문자 3-gram (한글은 음절 단위라 3-gram이면 단어 조각 수준)
+- 밴드 16개 × 행 8개: 후보가 될 확률 1-(1-J^8)^16 → J=0.9 ≈100%, 0.8 ≈95%, 0.5 ≈6%
+"""
+from __future__ import annotations
+import hashlib
+import random
+import re
+import struct
+import unicodedata
+import zlib
+from typing import List, Optional, Sequence, Tuple
+
+__all__ = [
+    "NUM_PERM",
+    "BANDS",
+    "ROWS",
+    "shingles",
+    "minhash_signature",
+    "lsh_buckets",
+    "estimate_jaccard",
+]
+
+try:  # 선택 의존성: 있으면 벡터화 (결과는 순수 파이썬 경로와 동일)
+    import numpy as _np
+except Exception:  # pragma: no cover - numpy 미설치 환경
+    _np = None
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 3
+
+# (a*h + b) mod P, h는 32비트 → a*h + b < 2^64 라 uint64에서 넘치지 않는다
+_P = (1 << 61) - 1
+_rnd = random.Random(0x6A61)  # 서명이 DB에 저장되므로 seed 고정 (바꾸면 전체 재색인)
+_PERMS: List[Tuple[int, int]] = [
+    (_rnd.randrange(1, 1 << 32), _rnd.randrange(0, 1 << 32)) for _ in range(NUM_PERM)
+]
+if _np is not None:
+    _A = _np.array([a for a, _ in _PERMS], dtype=_np.uint64)[:, None]
+    _B = _np.array([b for _, b in _PERMS], dtype=_np.uint64)[:, None]
+
+_KEEP_RE = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def _normalize(text: str) -> str:
+    return _KEEP_RE.sub("", unicodedata.normalize("NFKC", text or "").lower())
+
+
+def shingles(text: str, k: int = SHINGLE) -> set[int]:
+    """정규화 텍스트의 문자 k-gram 해시(crc32) 집합."""
+    s = _normalize(text)
+    return {zlib.crc32(s[i : i + k].encode("utf-8")) for i in range(len(s) - k + 1)}
+
+
+def minhash_signature(text: str) -> Optional[List[int]]:
+    """NUM_PERM개 최솟값 서명. shingle이 없으면(3자 미만) None."""
+    hs = shingles(text)
+    if not hs:
+        return None
+    if _np is not None:
+        h = _np.fromiter(hs, dtype=_np.uint64, count=len(hs))[None, :]
+        return [int(v) for v in ((_A * h + _B) % _np.uint64(_P)).min(axis=1)]
+    return [min((a * h + b) % _P for h in hs) for a, b in _PERMS]
+
+
+def lsh_buckets(sig: Sequence[int]) -> List[Tuple[int, int]]:
+    """밴드별 (band, bucket). bucket은 밴드 값 묶음의 64비트 해시 (BIGINT 범위)."""
+    out = []
+    for band in range(BANDS):
+        rows = sig[band * ROWS : (band + 1) * ROWS]
+        digest = hashlib.blake2b(struct.pack(f">{ROWS}Q", *rows), digest_size=8).digest()
+        out.append((band, struct.unpack(">q", digest)[0]))
+    return out
+
+
+def estimate_jaccard(a: Sequence[int], b: Sequence[int]) -> float:
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
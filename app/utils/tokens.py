@@ -0,0 +1,66 @@
+# app/utils/tokens.py
+from __future__ import annotations
+import re
+from typing import List, Sequence, Tuple
+
+__all__ = ["EXACT", "count_tokens", "chunk_tokens", "split_batches"]
+
+try:  # 선택 의존성: 있으면 정확한 BPE 토큰 수 사용
+    import tiktoken
+
+    _ENC = tiktoken.get_encoding("cl100k_base")
+except Exception:  # pragma: no cover - tiktoken 미설치 환경
+    _ENC = None
+
+EXACT = _ENC is not None  # False면 count_tokens는 근사치 (상한 검사에 쓰지 않는다)
+
+_HANGUL_RE = re.compile(r"[가-힣]")
+_WORD_RE = re.compile(r"[0-9A-Za-z]+")
+
+
+def count_tokens(txt: str) -> int:
+    """
+    임베딩 토큰 수 (text-embedding-3-* 의 cl100k_base 기준). 예산/비용 추정용.
+    tiktoken이 없으면 chunk_tokens()의 근사치.
+    """
+    if not txt:
+        return 0
+    if _ENC is not None:
+        return len(_ENC.encode(txt))
+    return chunk_tokens(txt)
+
+
+def chunk_tokens(txt: str) -> int:
+    """
+    청킹 예산용 토큰 근사치. tiktoken 설치 여부와 무관하게 항상 같은 값이어야
+    청크 경계(→ chunk_hash)가 환경마다 달라지지 않는다.
+      - 한글 음절 1자 ≈ 1토큰
+      - 영문/숫자 단어 4자 ≈ 1토큰
+      - 그 외 문장부호/기호 1자 ≈ 1토큰 (공백 제외)
+    """
+    if not txt:
+        return 0
+    hangul = len(_HANGUL_RE.findall(txt))
+    words = _WORD_RE.findall(txt)
+    word_tokens = sum((len(w) + 3) // 4 for w in words)
+    rest = len(txt) - hangul - sum(len(w) for w in words) - sum(c.isspace() for c in txt)
+    return hangul + word_tokens + max(0, rest)
+
+
+def split_batches(
+    counts: Sequence[int], max_inputs: int, max_tokens: int
+) -> List[Tuple[int, int]]:
+    """
+    입력별 토큰 수 → 요청 1회 한도(입력 수, 총 토큰)를 넘지 않는 연속 구간 [start, end) 목록.
+    입력 1개가 max_tokens를 넘으면 그 입력만 단독 구간이 된다.
+    """
+    out: List[Tuple[int, int]] = []
+    start = total = 0
+    for i, n in enumerate(counts):
+        if i > start and (i - start >= max_inputs or total + n > max_tokens):
+            out.append((start, i))
+            start, total = i, 0
+        total += n
+    if start < len(counts):
+        out.append((start, len(counts)))
+    return out
@@ -0,0 +1,138 @@
+# bench/chunking.py
+"""
+청킹 벤치마크: 기존 문자 기반 청커(800/100) vs semantic_chunk.
+
+    python -m bench.chunking [--docs 200] [--seed 7] [--max-tokens 512]
+
+합성 코퍼스는 sample.md의 답변 문장을 섞어 만든다. 측정 항목:
+  - chunks: 청크 수
+  - embed_tokens: 임베딩에 쓰이는 총 토큰 수 (오버랩 포함)
+  - cut_sentences: 청크 경계에서 잘린 문장 비율
+  - recall@1: 문장 하나를 질의로 삼아, 문자 bigram 코사인으로 고른 top-1 청크가
+    그 문장을 온전히 포함하는 비율 (임베딩 없이 경계 품질을 보는 대리 지표)
+"""
+from __future__ import annotations
+import argparse
+import json
+import math
+import random
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from app.utils.chunking import DEFAULT_MAX_TOKENS, semantic_chunk
+from app.utils.md_parse import parse_md_blocks
+from app.utils.tokens import count_tokens
+
+ROOT = Path(__file__).resolve().parent.parent
+_SENT_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def legacy_chunk(text: str, max_len: int = 800, overlap: int = 100) -> List[str]:
+    """기존 upload/upload_md 라우터의 simple_chunk (비교 기준)."""
+    text = (text or "").strip()
+    if not text:
+        return []
+    chunks = []
+    start, n = 0, len(text)
+    while start < n:
+        end = min(n, start + max_len)
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end == n:
+            break
+        start = max(0, end - overlap)
+    return chunks
+
+
+def synthetic_corpus(n_docs: int, seed: int) -> List[str]:
+    """sample.md 답변의 문단/문장을 재조합한 답변 n_docs개."""
+    rnd = random.Random(seed)
+    sections = parse_md_blocks((ROOT / "sample.md").read_text(encoding="utf-8"))
+    headers = [s["answer"].splitlines()[0] for s in sections if s["answer"]]
+    sentences = [
+        s.strip()
+        for sec in sections
+        for para in sec["answer"].split("\n\n")[1:]
+        for s in _SENT_RE.split(para)
+        if s.strip()
+    ]
+    docs = []
+    for _ in range(n_docs):
+        paras = []
+        for _ in range(rnd.randint(3, 7)):
+            paras.append(" ".join(rnd.sample(sentences, rnd.randint(2, 5))))
+        docs.append(rnd.choice(headers) + "\n" + "\n\n".join(paras))
+    return docs
+
+
+def _bigrams(s: str) -> Counter:
+    s = re.sub(r"\s+", "", s)
+    return Counter(s[i : i + 2] for i in range(len(s) - 1))
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    dot = sum(v * b.get(k, 0) for k, v in a.items())
+    na = math.sqrt(sum(v * v for v in a.values()))
+    nb = math.sqrt(sum(v * v for v in b.values()))
+    return dot / (na * nb) if na and nb else 0.0
+
+
+def evaluate(name: str, chunker: Callable[[str], List[str]], docs: List[str], seed: int) -> Dict:
+    t0 = time.perf_counter()
+    per_doc = [chunker(d) for d in docs]
+    elapsed = time.perf_counter() - t0
+
+    chunks = [c for cs in per_doc for c in cs]
+    total_sent = 0
+    cut = 0
+    hit = 0
+    queries = 0
+    rnd = random.Random(seed)
+    for doc, cs in zip(docs, per_doc):
+        sents = [s for p in doc.split("\n\n") for s in _SENT_RE.split(p) if s.strip()]
+        total_sent += len(sents)
+        cut += sum(1 for s in sents if not any(s.strip() in c for c in cs))
+        vecs = [_bigrams(c) for c in cs]
+        for s in rnd.sample(sents, min(3, len(sents))):
+            queries += 1
+            qv = _bigrams(s)
+            best = max(range(len(cs)), key=lambda i: _cosine(qv, vecs[i]))
+            hit += s.strip() in cs[best]
+
+    return {
+        "chunker": name,
+        "docs": len(docs),
+        "chunks": len(chunks),
+        "embed_tokens": sum(count_tokens(c) for c in chunks),
+        "cut_sentences": round(cut / max(1, total_sent), 4),
+        "recall_at_1": round(hit / max(1, queries), 4),
+        "chunk_ms": round(elapsed * 1000, 2),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--docs", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS)
+    args = ap.parse_args()
+
+    docs = synthetic_corpus(args.docs, args.seed)
+    results = [
+        evaluate("legacy_800_100", legacy_chunk, docs, args.seed),
+        evaluate(
+            f"semantic_{args.max_tokens}",
+            lambda t: semantic_chunk(t, max_tokens=args.max_tokens),
+            docs,
+            args.seed,
+        ),
+    ]
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
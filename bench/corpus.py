@@ -0,0 +1,230 @@
+# bench/corpus.py
+"""
+sample.md 양식을 본뜬 합성 자기소개서 코퍼스 생성기.
+
+    # Markdown 파일로 저장 (preview/commit 시나리오 입력)
+    python -m bench.corpus write-md --docs 50 --out bench/data
+
+    # DB에 직접 적재 (API/OpenAI 우회, 가짜 임베딩) — 1만~100만 청크 규모
+    python -m bench.corpus seed-db --chunks 100000 [--batch 2000] [--tenant default]
+
+seed-db는 DATABASE_URL(.env)의 DB에 COPY로 적재하며,
+임베딩은 bench.fake_openai.fake_embedding 과 동일하다
+(가짜 서버를 띄운 API로 검색하면 일관된 결과가 나온다).
+"""
+from __future__ import annotations
+import argparse
+import io
+import random
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from app.utils.chunking import semantic_chunk
+from app.utils.hashing import sha256_hex, short_hash
+from app.utils.md_parse import parse_md_blocks
+from app.utils.normalization import normalize_name
+
+ROOT = Path(__file__).resolve().parent.parent
+_SENT_RE = re.compile(r"(?<=[.!?])\s+")
+
+COMPANIES = ["하나은행", "신한은행", "KB국민은행", "LG CNS", "삼성SDS", "한화비전", "네이버", "카카오"]
+JOBS = ["디지털/ICT", "백엔드", "프론트엔드", "데이터", "플랫폼", "인프라"]
+YEARS = [2022, 2023, 2024, 2025]
+
+
+class _Material:
+    """sample.md에서 뽑은 제목/질문/소제목/문장 풀."""
+
+    def __init__(self) -> None:
+        sections = parse_md_blocks((ROOT / "sample.md").read_text(encoding="utf-8"))
+        self.titles = [s["title"] for s in sections]
+        self.questions = [s["question"] for s in sections]
+        self.headers = [s["answer"].splitlines()[0] for s in sections if s["answer"]]
+        self.sentences = [
+            sent.strip()
+            for s in sections
+            for para in s["answer"].split("\n\n")[1:]
+            for sent in _SENT_RE.split(para)
+            if sent.strip()
+        ]
+
+
+def generate_sections(n: int, seed: int = 7) -> Iterator[Dict[str, str]]:
+    """문항 n개 (title, question, answer). 같은 seed면 같은 결과."""
+    rnd = random.Random(seed)
+    m = _Material()
+    for i in range(n):
+        paras = [
+            " ".join(rnd.sample(m.sentences, rnd.randint(2, 5)))
+            for _ in range(rnd.randint(3, 6))
+        ]
+        yield {
+            "title": f"{rnd.choice(m.titles)} #{i}",
+            "question": rnd.choice(m.questions),
+            "answer": rnd.choice(m.headers) + "\n" + "\n\n".join(paras),
+        }
+
+
+def render_markdown(sections: List[Dict[str, str]]) -> str:
+    parts = []
+    for i, s in enumerate(sections, start=1):
+        parts.append(
+            f"# 자기소개서 {i} – [{s['title']}]\n\n"
+            f"**질문**\n{s['question']}\n\n"
+            f"**답변**\n{s['answer']}\n"
+        )
+    return "\n---\n\n".join(parts)
+
+
+def write_md(docs: int, per_doc: int, out: Path, seed: int) -> List[Path]:
+    out.mkdir(parents=True, exist_ok=True)
+    gen = generate_sections(docs * per_doc, seed)
+    paths = []
+    for d in range(docs):
+        secs = [next(gen) for _ in range(per_doc)]
+        p = out / f"cover_letter_{d:05d}.md"
+        p.write_text(render_markdown(secs), encoding="utf-8")
+        paths.append(p)
+    return paths
+
+
+def seed_db(target_chunks: int, batch: int, seed: int, model: str, tenant_id: int = 1) -> Dict:
+    """questions/embeddings를 COPY로 직접 적재 (tenant_id 테넌트 소유). 적재 통계를 반환."""
+    from psycopg2.extras import execute_values
+
+    from app.centroids import refresh_question_centroids
+    from app.db import engine
+    from app.read_model import refresh_search_chunks
+    from bench.fake_openai import fake_embedding
+
+    rnd = random.Random(seed)
+    t0 = time.perf_counter()
+    n_chunks = n_questions = 0
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        company_ids = [
+            execute_values(
+                cur,
+                "INSERT INTO companies(name, normalized_name) VALUES %s "
+                "ON CONFLICT (normalized_name) DO UPDATE SET name = EXCLUDED.name RETURNING id",
+                [(c, normalize_name(c))],
+                fetch=True,
+            )[0][0]
+            for c in COMPANIES
+        ]
+        job_ids = [
+            execute_values(
+                cur,
+                "INSERT INTO jobs(name, normalized_name) VALUES %s "
+                "ON CONFLICT (normalized_name) DO UPDATE SET name = EXCLUDED.name RETURNING id",
+                [(j, normalize_name(j))],
+                fetch=True,
+            )[0][0]
+            for j in JOBS
+        ]
+        doc_text = f"bench seed {seed} {time.time()}"
+        cur.execute(
+            "INSERT INTO documents(tenant_id, filename, content_hash, raw_text, source) "
+            "VALUES (%s, %s, %s, %s, 'bench') RETURNING id",
+            (tenant_id, f"bench_seed_{seed}.md", sha256_hex(doc_text), doc_text),
+        )
+        doc_id = cur.fetchone()[0]
+
+        gen = generate_sections(10**9, seed)
+        while n_chunks < target_chunks:
+            secs = []
+            chunk_lists = []
+            pending = 0
+            while len(secs) < batch and n_chunks + pending < target_chunks:
+                s = next(gen)
+                secs.append(s)
+                chunk_lists.append(semantic_chunk(s["answer"]))
+                pending += len(chunk_lists[-1])
+            rows = [
+                (
+                    tenant_id,
+                    s["question"] + "\n\n" + s["answer"],
+                    rnd.choice(company_ids),
+                    rnd.choice(job_ids),
+                    doc_id,
+                    s["title"][:200],
+                    rnd.choice(YEARS),
+                    short_hash(s["title"] + s["question"] + s["answer"], 16),
+                )
+                for s in secs
+            ]
+            qids = [
+                r[0]
+                for r in execute_values(
+                    cur,
+                    "INSERT INTO questions(tenant_id, content, company_id, job_id, document_id, title, year, content_hash_prefix) "
+                    "VALUES %s RETURNING id",
+                    rows,
+                    fetch=True,
+                )
+            ]
+            buf = io.StringIO()
+            for qid, chunks in zip(qids, chunk_lists):
+                for idx, ck in enumerate(chunks, start=1):
+                    vec = "[" + ",".join(f"{x:.6f}" for x in fake_embedding(ck)) + "]"
+                    text = ck.replace("\\", "\\\\").replace("\t", " ").replace("\n", "\\n")
+                    buf.write(
+                        f"{tenant_id}\t{qid}\t{idx}\t{text}\t{vec}\t1536\t{model}\t{short_hash(ck, 16)}\n"
+                    )
+                    n_chunks += 1
+            buf.seek(0)
+            cur.copy_expert(
+                "COPY embeddings(tenant_id, question_id, chunk_id, chunk_text, embedding, dim, model, chunk_hash) "
+                "FROM STDIN",
+                buf,
+            )
+            raw.commit()
+            with engine.begin() as conn:
+                refresh_search_chunks(conn, qids)  # 검색 read model
+                refresh_question_centroids(conn, qids, model)  # two_stage 1단계
+            n_questions += len(qids)
+            print(f"  {n_chunks}/{target_chunks} chunks", flush=True)
+    finally:
+        raw.close()
+    return {
+        "questions": n_questions,
+        "chunks": n_chunks,
+        "seconds": round(time.perf_counter() - t0, 2),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    w = sub.add_parser("write-md", help="Markdown 파일 생성")
+    w.add_argument("--docs", type=int, default=50)
+    w.add_argument("--per-doc", type=int, default=4)
+    w.add_argument("--out", type=Path, default=ROOT / "bench" / "data")
+    w.add_argument("--seed", type=int, default=7)
+
+    s = sub.add_parser("seed-db", help="DB에 직접 적재")
+    s.add_argument("--chunks", type=int, default=10_000)
+    s.add_argument("--batch", type=int, default=2_000, help="배치당 문항 수")
+    s.add_argument("--seed", type=int, default=7)
+    s.add_argument("--model", default="text-embedding-3-small")
+    s.add_argument("--tenant", default="default", help="적재할 테넌트 slug")
+
+    args = ap.parse_args()
+    if args.cmd == "write-md":
+        paths = write_md(args.docs, args.per_doc, args.out, args.seed)
+        print(f"{len(paths)} files → {args.out}")
+    else:
+        from app.tenants import TENANTS
+
+        tenant = TENANTS.get(args.tenant)
+        if tenant is None:
+            raise SystemExit(f"unknown tenant: {args.tenant} (uv run tenants create 먼저)")
+        print(seed_db(args.chunks, args.batch, args.seed, args.model, tenant.id))
+
+
+if __name__ == "__main__":
+    main()
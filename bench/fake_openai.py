@@ -0,0 +1,146 @@
+# bench/fake_openai.py
+"""
+로컬 가짜 OpenAI 서버 (embeddings / chat.completions).
+
+    python -m bench.fake_openai [--port 8900] [--latency-ms 50] [--jitter-ms 10]
+    # API 쪽: OPENAI_BASE_URL=http://127.0.0.1:8900/v1 uv run api
+
+임베딩은 문자 bigram feature hashing → L2 정규화 벡터라서
+  - 같은 입력이면 항상 같은 벡터 (결정적)
+  - 글자가 많이 겹치는 텍스트끼리 코사인 유사도가 높다 (검색 재현율 측정 가능)
+지연은 요청 단위로 latency ± jitter 만큼 sleep 한다.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import hashlib
+import math
+import random
+import re
+import time
+import zlib
+from functools import lru_cache
+from typing import List, Union
+
+from app.utils.tokens import count_tokens
+
+DIM = 1536
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1 << 18)
+def _slot(bigram: str, dim: int) -> tuple[int, float]:
+    h = zlib.crc32(bigram.encode("utf-8"))
+    return h % dim, (1.0 if h & 0x80000000 else -1.0)
+
+
+def fake_embedding(text: str, dim: int = DIM) -> List[float]:
+    """결정적 bigram 해싱 임베딩."""
+    s = _SPACE_RE.sub(" ", text or "").strip()
+    vec = [0.0] * dim
+    if len(s) < 2:
+        s = (s + "  ")[:2]
+    for i in range(len(s) - 1):
+        idx, sign = _slot(s[i : i + 2], dim)
+        vec[idx] += sign
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return [x / norm for x in vec]
+
+
+def create_app(latency_ms: float = 0.0, jitter_ms: float = 0.0, dim: int = DIM):
+    from fastapi import FastAPI
+    from pydantic import BaseModel
+
+    app = FastAPI(title="fake-openai")
+    rnd = random.Random(0)
+    stats = {"embedding_requests": 0, "embedding_inputs": 0, "chat_requests": 0}
+
+    async def delay() -> None:
+        ms = max(0.0, latency_ms + rnd.uniform(-jitter_ms, jitter_ms))
+        if ms:
+            await asyncio.sleep(ms / 1000)
+
+    class EmbeddingsBody(BaseModel):
+        model: str
+        input: Union[str, List[str]]
+        encoding_format: str | None = None
+
+    class ChatBody(BaseModel):
+        model: str
+        messages: list
+        max_tokens: int | None = None
+        temperature: float | None = None
+
+    @app.post("/v1/embeddings")
+    async def embeddings(body: EmbeddingsBody):
+        await delay()
+        inputs = [body.input] if isinstance(body.input, str) else body.input
+        stats["embedding_requests"] += 1
+        stats["embedding_inputs"] += len(inputs)
+        tokens = sum(count_tokens(t) for t in inputs)
+        return {
+            "object": "list",
+            "model": body.model,
+            "data": [
+                {"object": "embedding", "index": i, "embedding": fake_embedding(t, dim)}
+                for i, t in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat(body: ChatBody):
+        await delay()
+        stats["chat_requests"] += 1
+        prompt = " ".join(str(m.get("content", "")) for m in body.messages)
+        digest = hashlib.sha256(prompt.encode()).hexdigest()[:12]
+        content = f"[fake draft {digest}] " + "저는 근거를 바탕으로 협업하는 개발자입니다. " * 8
+        prompt_tokens = count_tokens(prompt)
+        completion_tokens = count_tokens(content)
+        return {
+            "id": f"chatcmpl-{digest}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    @app.get("/stats")
+    def get_stats():
+        return stats
+
+    return app
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8900)
+    ap.add_argument("--latency-ms", type=float, default=50.0)
+    ap.add_argument("--jitter-ms", type=float, default=10.0)
+    ap.add_argument("--dim", type=int, default=DIM)
+    args = ap.parse_args()
+
+    import uvicorn
+
+    uvicorn.run(
+        create_app(args.latency_ms, args.jitter_ms, args.dim),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
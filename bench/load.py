@@ -0,0 +1,313 @@
+# bench/load.py
+"""
+API 부하 테스트 (고정 동시성, 처리량 + p50/p95/p99).
+
+준비:
+    python -m bench.fake_openai --latency-ms 50 &
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 uv run serve   # 운영 모드 (개발 모드: uv run api)
+    python -m bench.corpus seed-db --chunks 10000
+
+실행:
+    python -m bench.load --scenario search --concurrency 16 --requests 2000
+    python -m bench.load --scenario all --out bench/results
+    python -m bench.load compare bench/results/a.json bench/results/b.json
+
+시나리오: search | search_uncached | preview | commit | draft | all
+  - search: 고정 질의 8개를 돌려 쓴다 → 응답/질의 임베딩 캐시, single-flight 적중 경로.
+  - search_uncached: 요청마다 다른 질의 → 캐시를 모두 비켜 가는 임베딩 + DB 경로.
+결과는 --out 디렉터리에 <UTC시각>-<git sha>.json 으로 저장된다.
+서버 워커 수(/healthz의 worker 항목)도 함께 기록되어 api ↔ serve 결과를 구분할 수 있다.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from app.utils.hashing import sha256_hex
+from bench.corpus import generate_sections, render_markdown
+
+ROOT = Path(__file__).resolve().parent.parent
+
+QUERIES = [
+    "협업 갈등 해결 사례",
+    "입행 후 성장 계획",
+    "설득 경험과 강점",
+    "고객 중심 서비스 개선",
+    "데이터 기반 의사결정",
+    "새로운 기술을 빠르게 학습한 경험",
+    "디지털 금융 플랫폼의 미래",
+    "실패를 극복한 경험",
+]
+
+
+def percentile(sorted_vals: List[float], p: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = (len(sorted_vals) - 1) * p
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (k - lo)
+
+
+async def run_scenario(
+    name: str,
+    make_request: Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]],
+    client: httpx.AsyncClient,
+    concurrency: int,
+    total: int,
+) -> Dict:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        for i in counter:
+            t0 = time.perf_counter()
+            try:
+                r = await make_request(client, i)
+                ok = r.status_code < 400
+                key = str(r.status_code)
+            except httpx.HTTPError as e:
+                ok = False
+                key = type(e).__name__
+            dt = time.perf_counter() - t0
+            if ok:
+                latencies.append(dt)
+            else:
+                errors[key] = errors.get(key, 0) + 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - t0
+
+    lat = sorted(latencies)
+    ms = lambda v: round(v * 1000, 2)  # noqa: E731
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": total,
+        "ok": len(lat),
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(lat) / wall, 2) if wall else 0.0,
+        "latency_ms": {
+            "mean": ms(statistics.fmean(lat)) if lat else 0.0,
+            "p50": ms(percentile(lat, 0.50)),
+            "p95": ms(percentile(lat, 0.95)),
+            "p99": ms(percentile(lat, 0.99)),
+            "max": ms(lat[-1]) if lat else 0.0,
+        },
+    }
+
+
+# ---------- 시나리오 ----------
+def search_request(seed: int, mode: str = "chunk", cache_bust: bool = False):
+    rnd = random.Random(seed)
+    # 워밍업과 본 측정, 이전 실행 사이에서도 겹치지 않도록 실행마다 다른 접미사
+    run_id = time.time_ns()
+    seq = itertools.count()
+
+    async def req(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        query = rnd.choice(QUERIES)
+        if cache_bust:
+            query = f"{query} {run_id:x}-{next(seq)}"
+        body = {"query": query, "top_k": 5, "mode": mode}
+        if i % 3 == 0:
+            body["year_min"] = 2023
+        return await client.post("/search", json=body)
+
+    return req
+
+
+def preview_request(seed: int, per_doc: int):
+    docs = [
+        render_markdown(list(generate_sections(per_doc, seed + d))).encode("utf-8")
+        for d in range(32)
+    ]
+
+    async def req(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        files = {"file": (f"bench_{i}.md", docs[i % len(docs)], "text/markdown")}
+        return await client.post("/upload-md/preview", files=files)
+
+    return req
+
+
+def commit_request(seed: int, per_doc: int):
+    run_id = int(time.time())
+    seq = itertools.count()
+
+    async def req(client: httpx.AsyncClient, _: int) -> httpx.Response:
+        # 매 요청이 새 문서가 되도록 seed를 바꿔 생성 (중복 스킵 경로가 아닌 실제 적재 측정)
+        i = next(seq)
+        secs = list(generate_sections(per_doc, seed * 1_000_003 + run_id + i))
+        raw = render_markdown(secs)
+        payload = {
+            "document": {
+                "filename": f"bench_{run_id}_{i}.md",
+                "content_hash": sha256_hex(raw),
+                "raw_text": raw,
+            },
+            "meta": {"company": "벤치컴퍼니", "job": "벤치직무", "year": 2025},
+            "questions": [
+                {"title": s["title"], "question": s["question"], "answer": s["answer"]}
+                for s in secs
+            ],
+        }
+        return await client.post("/upload-md/commit", json=payload)
+
+    return req
+
+
+def draft_request(seed: int, question_ids: List[int]):
+    rnd = random.Random(seed)
+
+    async def req(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.post(
+            "/draft", json={"question_id": rnd.choice(question_ids), "top_k": 3}
+        )
+
+    return req
+
+
+async def sample_question_ids(client: httpx.AsyncClient, n: int = 200) -> List[int]:
+    """검색 결과에서 draft 대상 question_id 후보를 모은다."""
+    ids: set[int] = set()
+    for q in QUERIES:
+        r = await client.post("/search", json={"query": q, "top_k": 50})
+        if r.status_code < 400:
+            ids.update(h["question_id"] for h in r.json().get("hits", []))
+        if len(ids) >= n:
+            break
+    return sorted(ids)
+
+
+async def server_info(client: httpx.AsyncClient) -> Dict:
+    """/healthz의 워커 정보 (워커 수, 응답한 워커 pid 목록)."""
+    info: Dict = {}
+    pids: set[int] = set()
+    for _ in range(8):
+        try:
+            r = await client.get("/healthz", headers={"Connection": "close"})
+            worker = r.json().get("worker") or {}
+        except (httpx.HTTPError, ValueError):
+            break
+        info["workers"] = worker.get("workers")
+        if "pid" in worker:
+            pids.add(worker["pid"])
+    info["pids"] = sorted(pids)
+    return info
+
+
+def git_sha() -> str:
+    try:
+        return (
+            subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT)
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return "unknown"
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    scenarios = (
+        ["search", "search_uncached", "preview", "commit", "draft"]
+        if args.scenario == "all"
+        else [args.scenario]
+    )
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = []
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        server = await server_info(client)
+        for name in scenarios:
+            if name == "search":
+                make = search_request(args.seed, args.search_mode)
+            elif name == "search_uncached":
+                make = search_request(args.seed, args.search_mode, cache_bust=True)
+            elif name == "preview":
+                make = preview_request(args.seed, args.per_doc)
+            elif name == "commit":
+                make = commit_request(args.seed, args.per_doc)
+            else:
+                qids = await sample_question_ids(client)
+                if not qids:
+                    print("draft: question_id 후보가 없어 건너뜀 (seed-db 먼저 실행)")
+                    continue
+                make = draft_request(args.seed, qids)
+            # 워밍업 (커넥션/캐시) — 통계에서 제외
+            await run_scenario(name, make, client, args.concurrency, min(args.requests, args.concurrency * 2))
+            res = await run_scenario(name, make, client, args.concurrency, args.requests)
+            print(json.dumps(res, ensure_ascii=False))
+            results.append(res)
+    return {
+        "git_sha": git_sha(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "base_url": args.base_url,
+        "label": args.label,
+        "server": server,
+        "results": results,
+    }
+
+
+def compare(a_path: Path, b_path: Path) -> None:
+    """두 결과 파일의 시나리오별 처리량/p95 변화율."""
+    a = {r["scenario"]: r for r in json.loads(a_path.read_text())["results"]}
+    b = {r["scenario"]: r for r in json.loads(b_path.read_text())["results"]}
+    for name in sorted(set(a) & set(b)):
+        ra, rb = a[name], b[name]
+
+        def delta(x: float, y: float) -> str:
+            return f"{(y - x) / x * 100:+.1f}%" if x else "n/a"
+
+        print(
+            f"{name:8s} rps {ra['throughput_rps']:>8} → {rb['throughput_rps']:>8} "
+            f"({delta(ra['throughput_rps'], rb['throughput_rps'])})  "
+            f"p95 {ra['latency_ms']['p95']:>8} → {rb['latency_ms']['p95']:>8} ms "
+            f"({delta(ra['latency_ms']['p95'], rb['latency_ms']['p95'])})"
+        )
+
+
+def main() -> None:
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "compare":
+        cp = argparse.ArgumentParser(prog="bench.load compare")
+        cp.add_argument("a", type=Path)
+        cp.add_argument("b", type=Path)
+        cargs = cp.parse_args(sys.argv[2:])
+        compare(cargs.a, cargs.b)
+        return
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--base-url", default="http://127.0.0.1:8000")
+    ap.add_argument("--scenario", choices=["search", "search_uncached", "preview", "commit", "draft", "all"], default="search")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--requests", type=int, default=500)
+    ap.add_argument("--search-mode", choices=["chunk", "two_stage"], default="chunk")
+    ap.add_argument("--per-doc", type=int, default=4, help="preview/commit 문서당 문항 수")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--timeout", type=float, default=120.0)
+    ap.add_argument("--label", default="", help="결과 파일에 남길 메모")
+    ap.add_argument("--out", type=Path, default=ROOT / "bench" / "results")
+    args = ap.parse_args()
+
+    report = asyncio.run(run(args))
+    args.out.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = args.out / f"{stamp}-{report['git_sha']}.json"
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"→ {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# bench/md_parse.py
+"""
+Markdown 파서 벤치마크: 정규식 일괄 파서 vs 스트리밍 라인 파서.
+
+    python -m bench.md_parse [--mb 20] [--chunk-kb 64] [--repeat 3]
+
+sample.md를 반복해 --mb 크기의 문서를 만들고, 프리뷰가 하는 일
+(디코드 + sha256 + 연도 후보 + 섹션 파싱)을 두 방식으로 수행해
+처리량(MB/s)과 tracemalloc 기준 최대 메모리(MB)를 비교한다.
+"""
+from __future__ import annotations
+import argparse
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict
+
+from app.utils.hashing import sha256_hex
+from app.utils.md_parse import MdStreamParser, extract_year_candidates, parse_md_blocks
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def build_document(mb: float) -> bytes:
+    sample = (ROOT / "sample.md").read_text(encoding="utf-8").rstrip("\n") + "\n\n"
+    unit = sample.encode("utf-8")
+    reps = max(1, int(mb * 1024 * 1024 / len(unit)))
+    return unit * reps
+
+
+def regex_pass(data: bytes, chunk_size: int) -> int:
+    raw_text = data.decode("utf-8")
+    sha256_hex(raw_text)
+    extract_year_candidates(raw_text)
+    return len(parse_md_blocks(raw_text))
+
+
+def stream_pass(data: bytes, chunk_size: int) -> int:
+    parser = MdStreamParser()
+    n = 0
+    view = memoryview(data)
+    for i in range(0, len(data), chunk_size):
+        for _ in parser.feed(bytes(view[i : i + chunk_size])):
+            n += 1
+    for _ in parser.close():
+        n += 1
+    parser.content_hash
+    return n
+
+
+def measure(name: str, fn: Callable[[bytes, int], int], data: bytes, chunk_size: int, repeat: int) -> Dict:
+    best = float("inf")
+    sections = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        sections = fn(data, chunk_size)
+        best = min(best, time.perf_counter() - t0)
+
+    # 입력 바이트 자체는 제외하고 파서가 추가로 잡는 메모리만 측정
+    tracemalloc.start()
+    fn(data, chunk_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mb = len(data) / (1024 * 1024)
+    return {
+        "parser": name,
+        "input_mb": round(mb, 2),
+        "sections": sections,
+        "seconds": round(best, 4),
+        "mb_per_s": round(mb / best, 2),
+        "peak_mem_mb": round(peak / (1024 * 1024), 2),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--mb", type=float, default=20)
+    ap.add_argument("--chunk-kb", type=int, default=64)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    data = build_document(args.mb)
+    chunk_size = args.chunk_kb * 1024
+    results = [
+        measure("regex", regex_pass, data, chunk_size, args.repeat),
+        measure("stream", stream_pass, data, chunk_size, args.repeat),
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# bench/read_model.py
+"""
+검색 SQL 벤치마크: 조인 쿼리(embeddings ⋈ questions ⋈ companies ⋈ jobs) vs read model(search_chunks).
+
+    python -m bench.corpus seed-db --chunks 100000   # read model도 함께 적재됨
+    python -m bench.read_model [--queries 50] [--top-k 5]
+
+저장된 청크 벡터를 질의로 써서(OpenAI 호출 없음) 필터 조합별로 두 쿼리를 EXPLAIN ANALYZE 하고
+실행 시간(p50/p95), 읽은 버퍼 수(shared hit + read), 스캔한 테이블/파티션 수(rels)를 비교한다.
+조인 쿼리는 read model 도입 전 /search 와 같은 모양이다 (거리 연산자만 인덱스에 맞춰 <=>).
+파티션 테이블에서는 rels로 pruning을 확인한다: 모델+연도 필터는 해당 연도 파티션만 남아야 한다
+(embeddings에는 벡터 인덱스가 없으므로 조인 쪽은 순차 스캔 기준선).
+"""
+from __future__ import annotations
+import argparse
+import json
+import statistics
+from typing import Dict, List
+
+from app.db import engine, sql
+from app.routers.search import SearchRequest, build_filters, build_search_sql
+from app.settings import settings
+from app.tenants import TENANTS
+from bench.load import percentile
+
+JOIN_SQL = """
+    SELECT
+        q.id AS question_id, e.chunk_id, q.title, LEFT(e.chunk_text, 240) AS snippet,
+        c.name AS company, j.name AS job, q.year,
+        (e.embedding <=> CAST(:qvec AS vector)) AS distance
+    FROM embeddings e
+    JOIN questions q ON q.id = e.question_id
+    LEFT JOIN companies c ON c.id = q.company_id
+    LEFT JOIN jobs j ON j.id = q.job_id
+    WHERE e.model = :model
+      AND e.tenant_id = :tenant
+    {filters}
+    ORDER BY e.embedding <=> CAST(:qvec AS vector)
+    LIMIT :topk
+"""
+
+FILTER_SETS: Dict[str, Dict] = {
+    "none": {},
+    "year": {"year_min": 2024},
+    "company": {"company": "은행"},
+    "company+year": {"company": "은행", "year_min": 2024},
+}
+
+
+def _relations(node: Dict) -> set:
+    rels = {node["Relation Name"]} if "Relation Name" in node else set()
+    for child in node.get("Plans", []):
+        rels |= _relations(child)
+    return rels
+
+
+def _explain(conn, query_sql: str, params: Dict) -> tuple[float, int, int]:
+    plan = conn.execute(
+        sql("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query_sql), params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    top = plan[0]
+    node = top["Plan"]
+    buffers = node.get("Shared Hit Blocks", 0) + node.get("Shared Read Blocks", 0)
+    return top["Execution Time"], buffers, len(_relations(node))
+
+
+def run(queries: int, top_k: int) -> List[Dict]:
+    tenant = TENANTS.get(settings.tenant_default)
+    with engine.connect() as conn:
+        qvecs = conn.execute(
+            sql(
+                "SELECT CAST(embedding AS text) FROM embeddings "
+                "WHERE model = :model AND tenant_id = :tenant ORDER BY random() LIMIT :n"
+            ),
+            {"model": settings.embedding_model, "tenant": tenant.id, "n": queries},
+        ).scalars().all()
+        if not qvecs:
+            raise SystemExit("embeddings가 비어 있음 (bench.corpus seed-db 먼저 실행)")
+
+        results = []
+        for name, filters in FILTER_SETS.items():
+            req = SearchRequest(query="-", top_k=top_k, **filters)
+            join_filters, join_params = build_filters(
+                req.company, req.job, req.year_min, req.year_max
+            )
+            join_sql = JOIN_SQL.format(filters="".join(f"AND {f} " for f in join_filters))
+            stats: Dict[str, Dict[str, List[float]]] = {
+                "join": {"ms": [], "buffers": [], "rels": []},
+                "read_model": {"ms": [], "buffers": [], "rels": []},
+            }
+            for qvec in qvecs:
+                rm_sql, rm_params = build_search_sql(req, qvec, tenant)
+                params = {
+                    **join_params,
+                    "tenant": tenant.id,
+                    "qvec": qvec,
+                    "topk": top_k,
+                    "model": settings.embedding_model,
+                }
+                for variant, (q_sql, q_params) in (
+                    ("join", (join_sql, params)),
+                    ("read_model", (rm_sql, rm_params)),
+                ):
+                    ms, buffers, rels = _explain(conn, q_sql, q_params)
+                    stats[variant]["ms"].append(ms)
+                    stats[variant]["buffers"].append(buffers)
+                    stats[variant]["rels"].append(rels)
+            row = {"filters": name}
+            for variant, s in stats.items():
+                ms_sorted = sorted(s["ms"])
+                row[variant] = {
+                    "p50_ms": round(percentile(ms_sorted, 0.50), 3),
+                    "p95_ms": round(percentile(ms_sorted, 0.95), 3),
+                    "buffers": round(statistics.fmean(s["buffers"]), 1),
+                    "rels": max(s["rels"]),
+                }
+            results.append(row)
+            print(json.dumps(row, ensure_ascii=False))
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--queries", type=int, default=50, help="필터 조합당 질의 수")
+    ap.add_argument("--top-k", type=int, default=5)
+    args = ap.parse_args()
+    results = run(args.queries, args.top_k)
+    print()
+    print(
+        f"{'filters':14s} {'join p50':>10s} {'read p50':>10s} {'join buf':>10s} {'read buf':>10s} "
+        f"{'read rels':>10s}"
+    )
+    for r in results:
+        print(
+            f"{r['filters']:14s} {r['join']['p50_ms']:>10.3f} {r['read_model']['p50_ms']:>10.3f} "
+            f"{r['join']['buffers']:>10.1f} {r['read_model']['buffers']:>10.1f} "
+            f"{r['read_model']['rels']:>10d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
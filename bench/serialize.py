@@ -0,0 +1,96 @@
+# bench/serialize.py
+"""
+검색 응답 직렬화 벤치마크: Pydantic 경로 vs orjson vs MessagePack (+ gzip/brotli 크기).
+
+    python -m bench.serialize [--hits 50] [--repeat 2000]
+
+합성 검색 결과(hits개)를 응답 본문으로 만드는 시간(µs/응답)과 본문 크기(바이트)를 비교한다.
+  - pydantic : SearchHit(**row) → SearchResponse.model_dump_json()  (변경 전 경로)
+  - json     : hit_dict + 표준 json (orjson 미설치 시 기본값)
+  - orjson   : hit_dict + orjson     (변경 후 기본 JSON 경로)
+  - msgpack  : hit_dict + msgpack    (Accept: application/x-msgpack)
+"""
+from __future__ import annotations
+import argparse
+import gzip
+import json
+import random
+import time
+from typing import Callable, Dict, List
+
+from app.responses import JSON, MSGPACK, encode, msgpack, orjson
+from app.routers.search import SearchHit, SearchResponse, hit_dict
+from bench.corpus import COMPANIES, JOBS, YEARS, generate_sections
+
+try:
+    import brotli
+except Exception:  # pragma: no cover
+    brotli = None
+
+
+def make_rows(n: int, seed: int = 7) -> List[Dict]:
+    rnd = random.Random(seed)
+    rows = []
+    for i, s in enumerate(generate_sections(n, seed)):
+        d = rnd.uniform(0.2, 1.2)
+        rows.append(
+            {
+                "question_id": 1000 + i,
+                "chunk_id": rnd.randint(1, 3),
+                "title": s["title"],
+                "snippet": s["answer"][:240],
+                "company": rnd.choice(COMPANIES),
+                "job": rnd.choice(JOBS),
+                "year": rnd.choice(YEARS),
+                "distance": d,
+                "similarity": 1 - d,
+            }
+        )
+    return rows
+
+
+def measure(name: str, fn: Callable[[], bytes], repeat: int) -> Dict:
+    body = fn()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    us = (time.perf_counter() - t0) / repeat * 1e6
+    out = {
+        "format": name,
+        "us_per_response": round(us, 1),
+        "bytes": len(body),
+        "gzip_bytes": len(gzip.compress(body, 6)),
+    }
+    if brotli is not None:
+        out["br_bytes"] = len(brotli.compress(body, quality=4))
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--hits", type=int, default=50)
+    ap.add_argument("--repeat", type=int, default=2000)
+    args = ap.parse_args()
+
+    rows = make_rows(args.hits)
+    model = "text-embedding-3-small"
+
+    def payload() -> Dict:
+        return {"hits": [hit_dict(r) for r in rows], "model": model}
+
+    cases: Dict[str, Callable[[], bytes]] = {
+        "pydantic": lambda: SearchResponse(
+            hits=[SearchHit(**r) for r in rows], model=model
+        ).model_dump_json().encode("utf-8"),
+        "json": lambda: json.dumps(payload(), ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+    }
+    if orjson is not None:
+        cases["orjson"] = lambda: encode(payload(), JSON)
+    if msgpack is not None:
+        cases["msgpack"] = lambda: encode(payload(), MSGPACK)
+
+    print(json.dumps([measure(k, fn, args.repeat) for k, fn in cases.items()], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# bench/tenants.py
+"""
+테넌트 격리 벤치마크: 전체 코퍼스가 커질 때 작은 테넌트의 검색 비용이 변하는지.
+
+    python -m bench.tenants [--small-chunks 2000] [--steps 20000,100000,300000] [--queries 30]
+
+1) 작은 테넌트(bench-small, 전용 인덱스 없음)에 --small-chunks 청크를 한 번 적재
+2) 단계마다 큰 테넌트(TENANT_DEFAULT, 전용 partial hnsw)를 --steps 누적 크기까지 키우고
+   두 테넌트의 /search SQL(build_search_sql)을 EXPLAIN ANALYZE
+   → 실행 시간(p50/p95), 읽은 버퍼, 스캔한 테이블/파티션 수(rels), 전체 청크 수를 출력
+
+작은 테넌트의 p50/buffers가 전체 크기와 무관하게 평평하면 격리가 된 것이다
+(tenant_id 인덱스로 자기 행만 읽음). 큰 테넌트는 hnsw 특성상 로그 규모로만 늘어야 한다.
+"""
+from __future__ import annotations
+import argparse
+import json
+import statistics
+from typing import Dict, List
+
+from app.db import engine, sql
+from app.routers.search import SearchRequest, build_search_sql
+from app.settings import settings
+from app.tenants import TENANTS
+from bench.corpus import seed_db
+from bench.load import percentile
+from bench.read_model import _explain
+
+SMALL = "bench-small"
+
+
+def _chunks(conn, tenant_id: int) -> int:
+    return conn.execute(
+        sql("SELECT count(*) FROM search_chunks WHERE model = :m AND tenant_id = :t"),
+        {"m": settings.embedding_model, "t": tenant_id},
+    ).scalar()
+
+
+def _ensure_small() -> int:
+    with engine.begin() as conn:
+        conn.execute(
+            sql(
+                "INSERT INTO tenants (slug, name) VALUES (:s, :s) ON CONFLICT (slug) DO NOTHING"
+            ),
+            {"s": SMALL},
+        )
+        return conn.execute(sql("SELECT id FROM tenants WHERE slug = :s"), {"s": SMALL}).scalar()
+
+
+def _measure(conn, tenant, queries: int, top_k: int) -> Dict:
+    qvecs = conn.execute(
+        sql(
+            "SELECT CAST(embedding AS text) FROM search_chunks "
+            "WHERE model = :m AND tenant_id = :t ORDER BY random() LIMIT :n"
+        ),
+        {"m": settings.embedding_model, "t": tenant.id, "n": queries},
+    ).scalars().all()
+    req = SearchRequest(query="-", top_k=top_k)
+    ms: List[float] = []
+    buffers: List[int] = []
+    rels: List[int] = []
+    for qvec in qvecs:
+        m, b, r = _explain(conn, *build_search_sql(req, qvec, tenant))
+        ms.append(m)
+        buffers.append(b)
+        rels.append(r)
+    ms.sort()
+    return {
+        "chunks": _chunks(conn, tenant.id),
+        "p50_ms": round(percentile(ms, 0.50), 3),
+        "p95_ms": round(percentile(ms, 0.95), 3),
+        "buffers": round(statistics.fmean(buffers), 1),
+        "rels": max(rels),
+    }
+
+
+def run(small_chunks: int, steps: List[int], queries: int, top_k: int) -> List[Dict]:
+    small_id = _ensure_small()
+    large = TENANTS.get(settings.tenant_default)
+    with engine.connect() as conn:
+        have_small = _chunks(conn, small_id)
+    if have_small < small_chunks:
+        seed_db(small_chunks - have_small, 2000, 11, settings.embedding_model, small_id)
+
+    results = []
+    for i, target in enumerate(steps):
+        with engine.connect() as conn:
+            have = _chunks(conn, large.id)
+        if have < target:
+            seed_db(target - have, 2000, 100 + i, settings.embedding_model, large.id)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE search_chunks")
+        TENANTS.reload()
+        small, large = TENANTS.get(SMALL), TENANTS.get(settings.tenant_default)
+        with engine.connect() as conn:
+            total = conn.execute(
+                sql("SELECT count(*) FROM search_chunks WHERE model = :m"),
+                {"m": settings.embedding_model},
+            ).scalar()
+            row = {
+                "total_chunks": total,
+                "small": _measure(conn, small, queries, top_k),
+                "large": _measure(conn, large, queries, top_k),
+            }
+        results.append(row)
+        print(json.dumps(row, ensure_ascii=False))
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--small-chunks", type=int, default=2000)
+    ap.add_argument(
+        "--steps", default="20000,100000,300000", help="큰 테넌트 누적 청크 수 (쉼표 구분)"
+    )
+    ap.add_argument("--queries", type=int, default=30, help="단계/테넌트당 질의 수")
+    ap.add_argument("--top-k", type=int, default=5)
+    args = ap.parse_args()
+    steps = [int(s) for s in args.steps.split(",") if s]
+    results = run(args.small_chunks, steps, args.queries, args.top_k)
+    print()
+    print(
+        f"{'total':>10s} {'small p50':>10s} {'small buf':>10s} {'large p50':>10s} {'large buf':>10s}"
+    )
+    for r in results:
+        print(
+            f"{r['total_chunks']:>10d} {r['small']['p50_ms']:>10.3f} {r['small']['buffers']:>10.1f} "
+            f"{r['large']['p50_ms']:>10.3f} {r['large']['buffers']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,71 @@
 -- pgvector 확장
 CREATE EXTENSION IF NOT EXISTS vector;
 
+-- 문자열 포함 검색 (/search/live lexical 단계의 ILIKE '%..%')
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+
+-- ======================
+-- Tenants (데이터 소유자)
+-- ======================
+-- 요청은 X-Tenant 헤더(slug)로 테넌트를 고른다 (app/tenants.py). 기존 데이터는 모두 id 1 "default".
+CREATE TABLE
+    IF NOT EXISTS tenants (
+        id SERIAL PRIMARY KEY,
+        slug VARCHAR(64) UNIQUE NOT NULL,
+        name VARCHAR(120),
+        requests_per_minute INT, -- NULL이면 무제한
+        embedding_tokens_per_day BIGINT, -- NULL이면 무제한 (UTC 날짜 기준)
+        dedicated_index BOOLEAN NOT NULL DEFAULT false, -- 전용 partial hnsw 사용 (uv run tenants dedicate)
+        created_at TIMESTAMP DEFAULT now ()
+    );
+
+
+INSERT INTO
+    tenants (id, slug, name, dedicated_index)
+VALUES
+    (1, 'default', 'default', true)
+ON CONFLICT (id) DO NOTHING;
+
+
+SELECT
+    setval (
+        pg_get_serial_sequence ('tenants', 'id'),
+        GREATEST ((SELECT max(id) FROM tenants), 1)
+    );
+
+
+-- 일일 임베딩 토큰 사용량 (한도 확인용)
+CREATE TABLE
+    IF NOT EXISTS tenant_usage (
+        tenant_id INT NOT NULL REFERENCES tenants (id) ON DELETE CASCADE,
+        day DATE NOT NULL,
+        embedding_tokens BIGINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (tenant_id, day)
+    );
+
+
+-- OpenAI 사용량 장부 (app/usage.py가 배치로 기록, 같은 키는 flush마다 합쳐 1행)
+-- tenant_id/document_id는 FK 없음: 문서나 테넌트를 지워도 과금 기록은 남는다.
+CREATE TABLE
+    IF NOT EXISTS usage_ledger (
+        id BIGSERIAL PRIMARY KEY,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now (),
+        tenant_id INT,
+        endpoint VARCHAR(40) NOT NULL,
+        model VARCHAR(120) NOT NULL,
+        kind VARCHAR(16) NOT NULL, -- embedding | chat
+        document_id INT,
+        requests INT NOT NULL DEFAULT 1, -- OpenAI 호출 수
+        inputs INT NOT NULL DEFAULT 0, -- 임베딩 입력 수
+        estimated_tokens BIGINT NOT NULL DEFAULT 0, -- 호출 전 로컬 추정치
+        prompt_tokens BIGINT NOT NULL DEFAULT 0, -- 실제 (임베딩은 total_tokens)
+        completion_tokens BIGINT NOT NULL DEFAULT 0
+    );
+
+
+CREATE INDEX IF NOT EXISTS idx_usage_ledger_tenant_time ON usage_ledger (tenant_id, created_at);
+
 
 -- ======================
 -- Companies / Jobs
@@ -40,10 +105,35 @@ CREATE TABLE
         raw_text TEXT NOT NULL,
         source VARCHAR(40) DEFAULT 'upload-md',
         uploaded_at TIMESTAMP DEFAULT now (),
-        UNIQUE (content_hash)
+        previous_id INT REFERENCES documents (id) ON DELETE SET NULL, -- 버전 모드: 이전 버전 문서
+        tenant_id INT NOT NULL DEFAULT 1 REFERENCES tenants (id)
     );
 
 
+-- 기존 DB 마이그레이션용
+ALTER TABLE documents
+ADD COLUMN IF NOT EXISTS previous_id INT REFERENCES documents (id) ON DELETE SET NULL;
+
+
+ALTER TABLE documents
+ADD COLUMN IF NOT EXISTS tenant_id INT NOT NULL DEFAULT 1 REFERENCES tenants (id);
+
+
+-- 같은 문서라도 테넌트가 다르면 별개 (예전 전역 UNIQUE (content_hash) 제거)
+ALTER TABLE documents
+DROP CONSTRAINT IF EXISTS documents_content_hash_key;
+
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_documents_tenant_hash ON documents (tenant_id, content_hash);
+
+
+-- 버전 모드: 테넌트 안에서 filename 기준 최신 문서 탐색
+DROP INDEX IF EXISTS idx_documents_filename;
+
+
+CREATE INDEX IF NOT EXISTS idx_documents_tenant_filename ON documents (tenant_id, filename, uploaded_at DESC);
+
+
 -- ======================
 -- Questions
 -- ======================
@@ -57,12 +147,21 @@ CREATE TABLE
         created_at TIMESTAMP DEFAULT now (),
         title VARCHAR(200),
         YEAR INT,
-        content_hash_prefix CHAR(16) -- 문항 고유성 체크용
+        content_hash_prefix CHAR(16), -- 문항 고유성 체크용
+        tenant_id INT NOT NULL DEFAULT 1 REFERENCES tenants (id)
     );
 
 
--- 고유성 보장: 같은 회사/직무/연도에서 동일한 질문 hash는 중복 금지
-CREATE UNIQUE INDEX IF NOT EXISTS ux_question_identity ON questions (
+ALTER TABLE questions
+ADD COLUMN IF NOT EXISTS tenant_id INT NOT NULL DEFAULT 1 REFERENCES tenants (id);
+
+
+-- 고유성 보장: 같은 테넌트/회사/직무/연도에서 동일한 질문 hash는 중복 금지
+DROP INDEX IF EXISTS ux_question_identity;
+
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_question_identity_tenant ON questions (
+    tenant_id,
     COALESCE(company_id, -1),
     COALESCE(job_id, -1),
     COALESCE(YEAR, 0),
@@ -97,9 +196,13 @@ CREATE TABLE
 -- ======================
 -- Embeddings
 -- ======================
+-- 모델별 LIST 파티션 (app/partitions.py). 파티션은 `uv run db`/`uv run partitions ensure`가 만든다.
+-- 재임베딩 후 이전 모델은 `uv run partitions drop-model`로 파티션째 삭제.
+-- 벡터 검색은 search_chunks가 맡으므로 여기에는 벡터 인덱스를 두지 않는다.
+-- 기존(비파티션) 테이블은 `uv run partitions migrate`로 온라인 전환.
 CREATE TABLE
     IF NOT EXISTS embeddings (
-        id SERIAL PRIMARY KEY,
+        id SERIAL,
         question_id INT NOT NULL REFERENCES questions (id) ON DELETE CASCADE,
         chunk_id INT,
         chunk_text TEXT NOT NULL,
@@ -107,18 +210,180 @@ CREATE TABLE
         dim SMALLINT NOT NULL DEFAULT 1536,
         model VARCHAR(120) NOT NULL,
         created_at TIMESTAMP DEFAULT now (),
-        chunk_hash CHAR(16)
+        chunk_hash CHAR(16),
+        tenant_id INT NOT NULL DEFAULT 1, -- questions.tenant_id 복사 (FK 없음)
+        PRIMARY KEY (id, model)
+    )
+PARTITION BY
+    LIST (model);
+
+
+ALTER TABLE embeddings
+ADD COLUMN IF NOT EXISTS tenant_id INT NOT NULL DEFAULT 1;
+
+
+-- 고유성 보장: 같은 question에서 동일한 청크는 중복 금지 (모델별, 파티션 키 포함)
+CREATE UNIQUE INDEX IF NOT EXISTS ux_embedding_chunk_identity ON embeddings (question_id, chunk_hash, model);
+
+
+-- ======================
+-- Question centroids (문항 단위 대표 벡터)
+-- ======================
+-- 문항 청크 벡터의 평균을 L2 정규화한 값. 커밋 시 증분 갱신, 누락분은 `uv run centroids`로 백필.
+-- l2_normalize()는 pgvector 0.7 이상 필요
+CREATE TABLE
+    IF NOT EXISTS question_embeddings (
+        question_id INT NOT NULL REFERENCES questions (id) ON DELETE CASCADE,
+        model VARCHAR(120) NOT NULL,
+        embedding VECTOR (1536) NOT NULL,
+        chunks INT NOT NULL, -- 평균에 쓰인 청크 수
+        updated_at TIMESTAMP DEFAULT now (),
+        tenant_id INT NOT NULL DEFAULT 1, -- questions.tenant_id 복사 (FK 없음)
+        PRIMARY KEY (question_id, model)
+    );
+
+
+ALTER TABLE question_embeddings
+ADD COLUMN IF NOT EXISTS tenant_id INT NOT NULL DEFAULT 1;
+
+
+-- 컬럼 추가 전에 만들어진 다른 테넌트 문항의 centroid 보정 (이후에는 갱신 시 함께 복사)
+UPDATE question_embeddings qe
+SET
+    tenant_id = q.tenant_id
+FROM
+    questions q
+WHERE
+    q.id = qe.question_id
+    AND qe.tenant_id <> q.tenant_id;
+
+
+-- 1단계(문항 후보) 검색 인덱스: 청크 인덱스보다 문항당 청크 수만큼 작다.
+-- hnsw는 학습이 없어 빈 테이블에서 만들어도 recall이 유지된다
+-- (이전 ivfflat은 부트스트랩 시점의 빈 테이블로 lists를 학습해 백필 후 recall이 무너졌다).
+-- search_chunks와 같은 테넌트 규칙: 전용 인덱스 테넌트는 partial hnsw, 나머지는 tenant_id btree로
+-- 자기 문항만 정확 정렬 (공용 그래프를 훑고 나중에 거르면 작은 테넌트의 후보가 비기 쉽다).
+DROP INDEX IF EXISTS idx_question_embeddings_cosine;
+
+
+DROP INDEX IF EXISTS idx_question_embeddings_hnsw;
+
+
+CREATE INDEX IF NOT EXISTS idx_question_embeddings_cosine_t1 ON question_embeddings USING hnsw (embedding vector_cosine_ops)
+WHERE
+    tenant_id = 1;
+
+
+CREATE INDEX IF NOT EXISTS idx_question_embeddings_tenant ON question_embeddings (tenant_id, model);
+
+
+-- ======================
+-- Near-duplicate index (MinHash + LSH)
+-- ======================
+-- 답변 문자 3-gram MinHash 서명 (app/utils/minhash.py, 128개)
+CREATE TABLE
+    IF NOT EXISTS question_minhash (
+        question_id INT PRIMARY KEY REFERENCES questions (id) ON DELETE CASCADE,
+        signature BIGINT[] NOT NULL,
+        updated_at TIMESTAMP DEFAULT now ()
+    );
+
+
+-- 밴드(16개)별 버킷 → 문항. 같은 (band, bucket)이면 근사 중복 후보
+CREATE TABLE
+    IF NOT EXISTS question_lsh_bands (
+        band SMALLINT NOT NULL,
+        bucket BIGINT NOT NULL,
+        question_id INT NOT NULL REFERENCES questions (id) ON DELETE CASCADE,
+        PRIMARY KEY (band, bucket, question_id)
+    );
+
+
+CREATE INDEX IF NOT EXISTS idx_question_lsh_bands_qid ON question_lsh_bands (question_id);
+
+
+-- ======================
+-- Semantic duplicate clusters (uv run dedupe-cluster 결과)
+-- ======================
+-- 크기 2 이상 클러스터만 저장. id = 구성원 중 최소 question_id
+CREATE TABLE
+    IF NOT EXISTS question_clusters (
+        id INT PRIMARY KEY,
+        model VARCHAR(120) NOT NULL,
+        size INT NOT NULL,
+        threshold REAL NOT NULL, -- 생성 시 코사인 거리 상한
+        representative_id INT REFERENCES questions (id) ON DELETE SET NULL,
+        created_at TIMESTAMP DEFAULT now ()
     );
 
 
--- 벡터 검색 인덱스
-CREATE INDEX IF NOT EXISTS idx_embeddings_cosine ON embeddings USING ivfflat (embedding vector_cosine_ops)
-WITH
-    (lists = 100);
+CREATE TABLE
+    IF NOT EXISTS question_cluster_members (
+        question_id INT PRIMARY KEY REFERENCES questions (id) ON DELETE CASCADE,
+        cluster_id INT NOT NULL REFERENCES question_clusters (id) ON DELETE CASCADE,
+        distance REAL -- 클러스터 centroid와의 코사인 거리
+    );
+
+
+CREATE INDEX IF NOT EXISTS idx_question_cluster_members_cluster ON question_cluster_members (cluster_id);
+
+
+-- ======================
+-- Search read model (검색용 비정규화 청크)
+-- ======================
+-- embeddings + questions + companies + jobs 조인 결과를 청크당 1행으로 보관.
+-- 검색은 이 테이블 하나만 ANN 스캔하고 회사/직무/연도 필터도 같은 행에서 바로 거른다.
+-- 커밋/업로드 시 바뀐 문항만 증분 갱신, 기존 데이터는 `uv run search-chunks`로 백필.
+-- 모델 LIST → 연도 RANGE 파티션: 모델/연도 필터는 해당 파티션만 스캔한다.
+-- 파티션마다 학습이 필요 없는 hnsw (작은/빈 연도 파티션에서도 recall 유지).
+-- FK (embedding_id, model) → embeddings (id, model)은 여기서 만들지 않는다: 기존 DB의 embeddings가
+-- 아직 비파티션이면 (id, model) 키가 없어 부트스트랩이 실패하므로, uv run db / partitions migrate가
+-- embeddings 파티션을 확인한 뒤 붙인다 (partitions.ensure_search_chunks_fk).
+CREATE TABLE
+    IF NOT EXISTS search_chunks (
+        embedding_id INT NOT NULL,
+        question_id INT NOT NULL,
+        chunk_id INT,
+        model VARCHAR(120) NOT NULL,
+        embedding VECTOR (1536) NOT NULL,
+        snippet TEXT NOT NULL, -- LEFT(chunk_text, 240)
+        title VARCHAR(200),
+        company_id INT,
+        job_id INT,
+        year INT,
+        company VARCHAR(120),
+        job VARCHAR(120),
+        updated_at TIMESTAMP DEFAULT now (),
+        tenant_id INT NOT NULL DEFAULT 1
+    )
+PARTITION BY
+    LIST (model);
+
+
+ALTER TABLE search_chunks
+ADD COLUMN IF NOT EXISTS tenant_id INT NOT NULL DEFAULT 1;
+
+
+-- 테넌트 범위 검색: 모든 검색은 tenant_id = N 조건을 가진다.
+--   전용 인덱스 테넌트(dedicated_index)  → 아래 partial hnsw (WHERE tenant_id = N)
+--   나머지                               → tenant_id btree로 자기 행만 읽고 정확 정렬
+-- 공용 hnsw는 두지 않는다 (필터 후 결과가 비는 문제 + 큰 테넌트 그래프를 작은 테넌트가 훑음).
+-- 다른 테넌트의 전용 인덱스는 `uv run tenants dedicate <slug>`가 온라인으로 만든다.
+DROP INDEX IF EXISTS idx_search_chunks_cosine;
+
+
+CREATE INDEX IF NOT EXISTS idx_search_chunks_cosine_t1 ON search_chunks USING hnsw (embedding vector_cosine_ops)
+WHERE
+    tenant_id = 1;
+
 
+CREATE INDEX IF NOT EXISTS idx_search_chunks_tenant ON search_chunks (tenant_id);
 
--- 고유성 보장: 같은 question에서 동일한 청크는 중복 금지
-CREATE UNIQUE INDEX IF NOT EXISTS ux_embedding_chunk_identity ON embeddings (question_id, chunk_hash);
+
+CREATE INDEX IF NOT EXISTS idx_search_chunks_qid ON search_chunks (question_id);
+
+
+CREATE INDEX IF NOT EXISTS idx_search_chunks_embedding ON search_chunks (embedding_id);
 
 
 -- 보조 인덱스
@@ -128,7 +393,13 @@ CREATE INDEX IF NOT EXISTS idx_questions_company ON questions (company_id);
 CREATE INDEX IF NOT EXISTS idx_questions_job ON questions (job_id);
 
 
+CREATE INDEX IF NOT EXISTS idx_questions_document ON questions (document_id);
+
+
+CREATE INDEX IF NOT EXISTS idx_questions_tenant ON questions (tenant_id);
+
+
 CREATE INDEX IF NOT EXISTS idx_embeddings_qid ON embeddings (question_id);
 
 
-CREATE INDEX IF NOT EXISTS idx_embeddings_model ON embeddings (model);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_embeddings_chunk_trgm ON embeddings USING gin (chunk_text gin_trgm_ops);
@@ -0,0 +1,10 @@
+# tests/conftest.py
+# app.settings는 import 시 필수 값을 검증하므로 순수 함수 테스트용 자리값을 채운다.
+# DB 테스트는 TEST_DATABASE_URL만 쓴다 (설정된 DATABASE_URL/.env의 DB를 건드리지 않게 덮어씀)
+import os
+
+if os.environ.get("TEST_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+else:
+    os.environ.setdefault("DATABASE_URL", "postgresql://localhost/jargis_test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
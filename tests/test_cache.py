@@ -0,0 +1,146 @@
+# tests/test_cache.py
+import threading
+from array import array
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from app import cache  # noqa: E402
+from app.cache import SingleFlight, TTLCache, VectorCache, bump_generation  # noqa: E402
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(cache.time, "monotonic", c)
+    return c
+
+
+# ---------- single-flight ----------
+def _run_concurrently(flight, fn, n=8):
+    started, results, errors = threading.Barrier(n), [], []
+
+    def worker():
+        started.wait()
+        try:
+            results.append(flight.do("k", fn))
+        except Exception as e:  # noqa: BLE001
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+
+def test_singleflight_shares_one_call():
+    flight, release, calls = SingleFlight("test"), threading.Event(), []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return object()
+
+    threads, results, errors = _run_concurrently(flight, fn)
+    while not calls:  # 리더가 fn에 들어갈 때까지
+        pass
+    release.wait(0.2)  # 나머지가 합류할 시간
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert not errors and len(results) == 8
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    # 끝난 key는 다음 호출에서 다시 실행된다
+    assert flight.do("k", lambda: 42) == 42
+
+
+def test_singleflight_propagates_error_to_followers():
+    flight, release, calls = SingleFlight("test"), threading.Event(), []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        raise ValueError("boom")
+
+    threads, results, errors = _run_concurrently(flight, fn)
+    while not calls:
+        pass
+    release.wait(0.2)
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert not results and len(errors) == 8
+    assert len(calls) == 1
+    assert all(isinstance(e, ValueError) for e in errors)
+
+
+# ---------- TTLCache ----------
+def test_ttl_expiry(clock):
+    c = TTLCache("test", ttl=10, max_entries=10)
+    c.set("a", 1)
+    assert c.get("a") == 1
+    clock.now += 11
+    assert c.get("a") is None
+
+
+def test_generation_invalidates(clock):
+    c = TTLCache("test", ttl=10, max_entries=10)
+    stale_gen = cache.generation()
+    c.set("a", 1)
+    bump_generation()
+    assert c.get("a") is None
+    # 계산 도중 세대가 바뀐 값은 저장 즉시 무효
+    c.set("b", 2, gen=stale_gen)
+    assert c.get("b") is None
+    c.set("c", 3)
+    assert c.get("c") == 3
+
+
+def test_non_generational_ignores_bump(clock):
+    c = TTLCache("test", ttl=10, max_entries=10, generational=False)
+    c.set("a", 1)
+    bump_generation()
+    assert c.get("a") == 1
+
+
+def test_lru_max_entries(clock):
+    c = TTLCache("test", ttl=10, max_entries=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.get("a")
+    c.set("c", 3)
+    assert c.get("b") is None
+    assert c.get("a") == 1 and c.get("c") == 3
+
+
+def test_ttl_zero_disables(clock):
+    c = TTLCache("test", ttl=0, max_entries=10)
+    c.set("a", 1)
+    assert c.get("a") is None
+
+
+# ---------- VectorCache ----------
+def test_vector_cache_stores_float32(clock):
+    c = VectorCache("test", ttl=10, max_entries=10, max_bytes=1 << 20)
+    c.set("q", [0.5, 0.25, 1.0])
+    v = c.get("q")
+    assert isinstance(v, array) and v.typecode == "f"
+    assert list(v) == [0.5, 0.25, 1.0]
+
+
+def test_vector_cache_byte_limit(clock):
+    dim = 4
+    c = VectorCache("test", ttl=10, max_entries=100, max_bytes=3 * dim * 4)
+    for i in range(5):
+        c.set(i, [float(i)] * dim)
+    assert [i for i in range(5) if c.get(i) is not None] == [2, 3, 4]
@@ -0,0 +1,67 @@
+# tests/test_chunking.py
+import re
+
+import pytest
+
+from app.utils.chunking import _sentences, semantic_chunk
+from app.utils.tokens import chunk_tokens
+
+
+def _squash(text: str) -> str:
+    return re.sub(r"\s+", "", text)
+
+
+@pytest.mark.parametrize(
+    "paragraph",
+    [
+        '그는 "안녕하세요." 라고 말했다. (참고: 이것은 예시.) 다음 문장!',
+        "첫 문장입니다. 두 번째 문장’ 세 번째? 네 번째… 끝",
+        "말줄임... 그리고 a.b 처럼 공백 없는 마침표는 경계가 아니다.",
+        "[소제목] 괄호로 끝나는 문장.] 다음",
+    ],
+)
+def test_sentences_roundtrip(paragraph):
+    assert " ".join(_sentences(paragraph)) == paragraph
+
+
+def test_sentences_keep_closers():
+    assert _sentences('그는 "안녕하세요." 라고 말했다. (참고: 이것은 예시.) 다음 문장!') == [
+        '그는 "안녕하세요."',
+        "라고 말했다.",
+        "(참고: 이것은 예시.)",
+        "다음 문장!",
+    ]
+
+
+def test_chunks_keep_all_text():
+    text = (
+        "[신뢰를 주는 디지털 인재]\n"
+        "저는 \"고객 관점\"에서 문제를 봅니다. (예: 앱 개선.) 결과는 좋았습니다!\n\n"
+        + "협업 과정에서 갈등을 조율했습니다. " * 80
+    )
+    chunks = semantic_chunk(text, max_tokens=64)
+    assert len(chunks) > 1
+    assert _squash("".join(chunks)) == _squash(text)
+    assert chunks[0].startswith("[신뢰를 주는 디지털 인재]\n")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "가" * 3000,  # 공백 없는 한글
+        "https://example.com/" + "a" * 4000,  # 공백 없는 긴 토큰
+        "짧은 앞 문장. " + "x" * 2000 + " 뒤 문장.",
+    ],
+)
+def test_chunks_respect_budget(text):
+    chunks = semantic_chunk(text, max_tokens=50)
+    assert all(chunk_tokens(c) <= 50 for c in chunks)
+    assert _squash("".join(chunks)) == _squash(text)
+
+
+def test_deterministic_and_empty():
+    text = "문단 하나.\n\n문단 둘. 문장 셋!"
+    assert semantic_chunk(text) == semantic_chunk(text)
+    assert semantic_chunk(text) == ["문단 하나.\n\n문단 둘. 문장 셋!"]
+    assert semantic_chunk("") == []
+    assert semantic_chunk("   \n") == []
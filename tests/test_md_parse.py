@@ -0,0 +1,73 @@
+# tests/test_md_parse.py
+import hashlib
+
+import pytest
+
+from app.utils.md_parse import (
+    MdStreamParser,
+    extract_year_candidates,
+    iter_md_sections,
+    parse_md_blocks,
+)
+
+DOC = """머리말 2021 작성 (섹션 밖 텍스트)
+
+# 자기소개서 1 – [입행 목표 및 성장 계획]
+**질문**
+입행 후 목표를 서술하시오.
+
+**답변**
+2023년 디지털 전환 프로젝트에서 "고객 관점"을 배웠습니다.
+둘째 줄입니다.
+
+# 자기소개서 2 - [협업 경험]
+**답변**
+첫 답변
+**답변**
+같은 라벨이 반복되면 마지막 블록이 이긴다.
+# 자기소개서 3 – [라벨 없음]
+라벨이 없으면 전체가 답변입니다. 2024
+마지막 줄 (개행 없음)"""
+
+
+def _stream(raw: bytes, size: int):
+    parser = MdStreamParser()
+    sections = []
+    for i in range(0, len(raw), size):
+        sections.extend(parser.feed(raw[i : i + size]))
+    sections.extend(parser.close())
+    return parser, sections
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 4096])
+def test_stream_matches_parse_md_blocks(size):
+    # 1바이트 조각은 한글(3바이트)과 개행을 가운데에서 자른다
+    raw = DOC.encode("utf-8")
+    parser, sections = _stream(raw, size)
+    assert sections == parse_md_blocks(DOC)
+    assert parser.content_hash == hashlib.sha256(raw).hexdigest()
+    assert parser.bytes_read == len(raw)
+    assert parser.years == extract_year_candidates(DOC)
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_sections_fields(newline):
+    raw = DOC.replace("\n", newline).encode("utf-8")
+    _, sections = _stream(raw, 5)
+    assert [s["title"] for s in sections] == ["입행 목표 및 성장 계획", "협업 경험", "라벨 없음"]
+    assert sections[0]["question"] == "입행 후 목표를 서술하시오."
+    assert sections[1]["answer"] == "같은 라벨이 반복되면 마지막 블록이 이긴다."
+    assert sections[2]["question"] == ""
+    assert sections[2]["answer"].endswith("마지막 줄 (개행 없음)")
+
+
+def test_iter_md_sections_and_empty():
+    raw = DOC.encode("utf-8")
+    assert list(iter_md_sections([raw[:10], raw[10:]])) == parse_md_blocks(DOC)
+    assert list(iter_md_sections([])) == [] == parse_md_blocks("")
+
+
+def test_invalid_utf8():
+    parser = MdStreamParser()
+    with pytest.raises(UnicodeDecodeError):
+        list(parser.feed(b"# \xff\n"))
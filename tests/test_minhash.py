@@ -0,0 +1,53 @@
+# tests/test_minhash.py
+import pytest
+
+from app.utils import minhash
+from app.utils.minhash import (
+    BANDS,
+    NUM_PERM,
+    estimate_jaccard,
+    lsh_buckets,
+    minhash_signature,
+    shingles,
+)
+
+ANSWER = "저는 협업 과정에서 갈등을 조율하며 팀의 목표를 달성했습니다. Agile 방식으로 2주마다 회고했습니다."
+
+
+def test_signature_shape_and_short_text():
+    sig = minhash_signature(ANSWER)
+    assert len(sig) == NUM_PERM
+    assert all(0 <= v < (1 << 61) for v in sig)
+    assert minhash_signature("가나") is None
+    assert minhash_signature("") is None
+
+
+def test_normalization_ignores_spacing_case_punctuation():
+    variant = "저는  협업 과정에서, 갈등을 조율하며 팀의 목표를 달성했습니다!! agile 방식으로 2주마다 회고했습니다"
+    assert minhash_signature(variant) == minhash_signature(ANSWER)
+
+
+def test_estimate_tracks_true_jaccard():
+    other = ANSWER.replace("회고했습니다", "점검했고 문서로 남겼습니다")
+    a, b = shingles(ANSWER), shingles(other)
+    true_j = len(a & b) / len(a | b)
+    est = estimate_jaccard(minhash_signature(ANSWER), minhash_signature(other))
+    assert abs(est - true_j) < 0.15
+    assert estimate_jaccard(minhash_signature(ANSWER), minhash_signature(ANSWER)) == 1.0
+
+
+def test_lsh_buckets():
+    sig = minhash_signature(ANSWER)
+    buckets = lsh_buckets(sig)
+    assert [band for band, _ in buckets] == list(range(BANDS))
+    assert all(-(1 << 63) <= b < (1 << 63) for _, b in buckets)  # BIGINT
+    assert lsh_buckets(list(sig)) == buckets
+    unrelated = minhash_signature("완전히 다른 내용의 답변으로 겹치는 글자 조각이 거의 없어야 한다")
+    assert len(set(buckets) & set(lsh_buckets(unrelated))) == 0
+
+
+def test_pure_python_path_matches_numpy(monkeypatch):
+    pytest.importorskip("numpy")
+    with_numpy = minhash_signature(ANSWER)
+    monkeypatch.setattr(minhash, "_np", None)
+    assert minhash_signature(ANSWER) == with_numpy
@@ -0,0 +1,83 @@
+# tests/test_preview_store.py
+import os
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from app import preview_store  # noqa: E402
+from app.preview_store import PreviewStore, spool_path  # noqa: E402
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(preview_store.time, "monotonic", c)
+    return c
+
+
+def _session(tenant=1, h="h1", raw_path=None):
+    return {"tenant_id": tenant, "content_hash": h, "raw_path": raw_path, "sections": []}
+
+
+def test_put_get_pop(clock):
+    store = PreviewStore(ttl=60, max_entries=10, max_bytes=1000)
+    token = store.put(_session(), size=10)
+    assert store.get(token)["content_hash"] == "h1"
+    assert store.stats() == {"sessions": 1, "bytes": 10}
+    store.pop(token)
+    assert store.get(token) is None
+    assert store.stats() == {"sessions": 0, "bytes": 0}
+
+
+def test_ttl_expiry(clock):
+    store = PreviewStore(ttl=60, max_entries=10, max_bytes=1000)
+    token = store.put(_session(), size=10)
+    clock.now += 61
+    assert store.get(token) is None
+    assert store.stats()["bytes"] == 0
+
+
+def test_same_document_replaces_per_tenant(clock):
+    store = PreviewStore(ttl=60, max_entries=10, max_bytes=1000)
+    old = store.put(_session(tenant=1), size=10)
+    other_tenant = store.put(_session(tenant=2), size=10)
+    new = store.put(_session(tenant=1), size=10)
+    assert store.get(old) is None
+    assert store.get(new) is not None
+    assert store.get(other_tenant) is not None
+
+
+def test_lru_eviction_by_entries_and_bytes(clock):
+    store = PreviewStore(ttl=60, max_entries=2, max_bytes=100)
+    a = store.put(_session(h="a"), size=10)
+    b = store.put(_session(h="b"), size=10)
+    store.get(a)  # a가 최근 사용 → b가 먼저 축출
+    c = store.put(_session(h="c"), size=10)
+    assert store.get(b) is None
+    assert store.get(a) is not None and store.get(c) is not None
+    store.put(_session(h="d"), size=95)
+    assert store.stats()["sessions"] == 1
+
+
+def test_spool_file_removed_with_session(clock, tmp_path, monkeypatch):
+    monkeypatch.setattr(preview_store.settings, "preview_spool_dir", str(tmp_path))
+    store = PreviewStore(ttl=60, max_entries=10, max_bytes=1000)
+
+    popped, replaced, expired = spool_path(), spool_path(), spool_path()
+    assert os.path.dirname(popped) == str(tmp_path)
+    store.pop(store.put(_session(h="p", raw_path=popped), size=1))
+    store.put(_session(h="r", raw_path=replaced), size=1)
+    store.put(_session(h="r"), size=1)
+    token = store.put(_session(h="e", raw_path=expired), size=1)
+    clock.now += 61
+    store.get(token)
+    assert not any(os.path.exists(p) for p in (popped, replaced, expired))
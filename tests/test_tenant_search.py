@@ -0,0 +1,83 @@
+# tests/test_tenant_search.py
+"""
+테넌트 격리 검색: 큰 테넌트(1, 전용 partial hnsw) 옆의 작은 테넌트도 top_k를 다 채우는지.
+
+빈 스크래치 DB가 필요하다 (스키마 생성 + 가짜 임베딩 적재):
+    TEST_DATABASE_URL=postgresql://.../jargis_test uv run --with pytest pytest tests
+"""
+import os
+import uuid
+
+import pytest
+
+TEST_DB = os.environ.get("TEST_DATABASE_URL")
+pytestmark = pytest.mark.skipif(not TEST_DB, reason="TEST_DATABASE_URL 미설정")
+
+LARGE_CHUNKS = 3000
+SMALL_CHUNKS = 40
+TOP_K = 5
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    # DATABASE_URL은 conftest가 TEST_DATABASE_URL로 채운다 (app.settings import 전)
+    from app.bootstrap_db import main as bootstrap
+    from app.db import engine, sql
+    from app.settings import settings
+    from app.tenants import TENANTS
+    from bench.corpus import seed_db
+
+    bootstrap()
+    slug = f"test-small-{uuid.uuid4().hex[:8]}"
+    with engine.begin() as conn:
+        small_id = conn.execute(
+            sql("INSERT INTO tenants (slug, name) VALUES (:s, :s) RETURNING id"), {"s": slug}
+        ).scalar()
+    seed_db(LARGE_CHUNKS, 1000, 1, settings.embedding_model, 1)
+    seed_db(SMALL_CHUNKS, 1000, 2, settings.embedding_model, small_id)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE question_embeddings")
+        conn.exec_driver_sql("ANALYZE search_chunks")
+    TENANTS.reload()
+    return TENANTS.get(slug), TENANTS.get(settings.tenant_default)
+
+
+def _search(tenant, mode: str):
+    from app.db import engine, sql
+    from app.routers.search import SearchRequest, build_search_sql
+    from app.settings import settings
+
+    with engine.connect() as conn:
+        qvec = conn.execute(
+            sql(
+                "SELECT CAST(embedding AS text) FROM search_chunks "
+                "WHERE model = :m AND tenant_id = :t ORDER BY embedding_id LIMIT 1"
+            ),
+            {"m": settings.embedding_model, "t": tenant.id},
+        ).scalar()
+        req = SearchRequest(query="-", top_k=TOP_K, mode=mode)
+        query_sql, params = build_search_sql(req, qvec, tenant)
+        hits = conn.execute(sql(query_sql), params).mappings().all()
+        qids = [h["question_id"] for h in hits]
+        owners = set(
+            conn.execute(
+                sql("SELECT DISTINCT tenant_id FROM questions WHERE id = ANY(:ids)"), {"ids": qids}
+            ).scalars()
+        )
+    return hits, owners
+
+
+@pytest.mark.parametrize("mode", ["chunk", "two_stage"])
+def test_small_tenant_fills_top_k(corpus, mode):
+    small, _ = corpus
+    hits, owners = _search(small, mode)
+    assert len(hits) == TOP_K
+    assert owners == {small.id}
+
+
+@pytest.mark.parametrize("mode", ["chunk", "two_stage"])
+def test_large_tenant_stays_scoped(corpus, mode):
+    _, large = corpus
+    hits, owners = _search(large, mode)
+    assert len(hits) == TOP_K
+    assert owners == {large.id}
@@ -0,0 +1,46 @@
+# tests/test_tokens.py
+import pytest
+
+from app.utils.tokens import chunk_tokens, count_tokens, split_batches
+
+
+def _covers(batches, n):
+    flat = [i for s, e in batches for i in range(s, e)]
+    return flat == list(range(n))
+
+
+def test_split_by_max_inputs():
+    batches = split_batches([1] * 7, max_inputs=3, max_tokens=100)
+    assert batches == [(0, 3), (3, 6), (6, 7)]
+
+
+def test_split_by_max_tokens():
+    counts = [40, 40, 40, 10, 90]
+    batches = split_batches(counts, max_inputs=100, max_tokens=100)
+    assert batches == [(0, 2), (2, 4), (4, 5)]
+    assert all(sum(counts[s:e]) <= 100 for s, e in batches)
+
+
+def test_oversize_input_goes_alone():
+    batches = split_batches([10, 500, 10], max_inputs=100, max_tokens=100)
+    assert batches == [(0, 1), (1, 2), (2, 3)]
+
+
+@pytest.mark.parametrize("counts", [[], [5], [3] * 50, [99, 1, 1, 98, 2]])
+def test_batches_cover_all_inputs(counts):
+    batches = split_batches(counts, max_inputs=4, max_tokens=100)
+    assert _covers(batches, len(counts))
+    assert all(0 < e - s <= 4 for s, e in batches)
+
+
+def test_chunk_tokens_heuristic():
+    assert chunk_tokens("") == 0
+    assert chunk_tokens("가나다") == 3
+    assert chunk_tokens("abcdefgh 12345") == 2 + 2
+    assert chunk_tokens("안녕, world!") == 2 + 2 + 2
+    assert chunk_tokens("   ") == 0
+
+
+def test_count_tokens_empty():
+    assert count_tokens("") == 0
+    assert count_tokens("hello world") > 0
@@ -1,8 +1,8 @@
 # ui/Home.py
-import os
-import tempfile
+import time
+import httpx
 import streamlit as st
-from api_client import healthz, upload, search, draft, preview_md, commit_md
+from api_client import healthz, upload, search, draft, preview_md, commit_md_async
 
 # -----------------------------
 # Page setup (단 한 번만 설정)
@@ -19,12 +19,42 @@ if "last_query" not in st.session_state:
     st.session_state.last_query = ""
 if "preview" not in st.session_state:
     st.session_state.preview = None
-if "raw_text" not in st.session_state:
-    st.session_state.raw_text = None
 if "file_name" not in st.session_state:
     st.session_state.file_name = None
 if "_draft_target" not in st.session_state:
     st.session_state._draft_target = None
+if "commit_job" not in st.session_state:
+    st.session_state.commit_job = None  # {"future", "started"} — 백그라운드 커밋
+if "commit_result" not in st.session_state:
+    st.session_state.commit_result = None
+
+
+# -----------------------------
+# API 결과 캐시 (위젯 조작으로 스크립트가 다시 실행돼도 같은 요청은 재호출하지 않음)
+# -----------------------------
+@st.cache_data(ttl=60, max_entries=256, show_spinner=False)
+def cached_search(query, top_k, company, job, year_min, year_max, collapse):
+    return search(
+        query,
+        top_k=top_k,
+        company=company,
+        job=job,
+        year_min=year_min,
+        year_max=year_max,
+        collapse=collapse,
+    )
+
+
+# 서버 프리뷰 세션(기본 30분)보다 짧게. 커밋/만료 후에는 clear()
+@st.cache_data(ttl=600, max_entries=16, show_spinner=False)
+def cached_preview(filename, data, hint_company, hint_job, hint_year):
+    return preview_md(
+        filename,
+        data,
+        hint_company=hint_company,
+        hint_job=hint_job,
+        hint_year=hint_year,
+    )
 
 # -----------------------------
 # Sidebar
@@ -66,33 +96,34 @@ with tabs[0]:
     uploaded = st.file_uploader("Markdown 파일을 업로드하세요 (.md)", type=["md"])
     colA, colB = st.columns([1, 1])
 
-    def run_preview(temp_path: str):
-        res = preview_md(
-            temp_path,
-            hint_company=hint_company or None,
-            hint_job=hint_job or None,
-            hint_year=hint_year or None,
+    def run_preview():
+        res = cached_preview(
+            uploaded.name,
+            uploaded.getvalue(),
+            hint_company or None,
+            hint_job or None,
+            hint_year or None,
         )
+        # 원문/섹션은 서버 프리뷰 세션에 있으므로 commit은 preview_token + 수정분만 보낸다
         st.session_state.preview = res
-        # commit 시 필요하므로 업로드 원문 저장
-        st.session_state.raw_text = open(temp_path, "r", encoding="utf-8").read()
-        st.session_state.file_name = os.path.basename(temp_path)
+        st.session_state.file_name = uploaded.name
+        st.session_state.commit_result = None
 
     with colA:
         if st.button("🔍 프리뷰 실행", disabled=(uploaded is None)):
             if uploaded is None:
                 st.warning("먼저 파일을 업로드하세요.")
             else:
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".md") as tmp:
-                    tmp.write(uploaded.getvalue())
-                    tmp.flush()
-                    run_preview(tmp.name)
-                st.success("프리뷰 완료!")
+                try:
+                    with st.spinner("프리뷰 중..."):
+                        run_preview()
+                    st.success("프리뷰 완료!")
+                except Exception as e:
+                    st.error(f"프리뷰 실패: {e}")
 
     with colB:
         if st.button("프리뷰 초기화"):
             st.session_state.preview = None
-            st.session_state.raw_text = None
             st.session_state.file_name = None
 
     # Preview & Edit
@@ -118,7 +149,7 @@ with tabs[0]:
         )
 
         st.markdown("**문항 리스트**")
-        edited_questions = []
+        edits = []
         for idx, q in enumerate(prev.get("questions", []), start=1):
             with st.expander(f"{idx}. {q['title']}  |  duplicate: {q['duplicate']}"):
                 include = st.checkbox(
@@ -139,41 +170,89 @@ with tabs[0]:
                 st.caption(
                     f"hash_prefix: `{q.get('hash_prefix')}`  | exists_question_id: `{q.get('exists_question_id')}`"
                 )
-                edited_questions.append(
-                    {
-                        "title": title,
-                        "question": question,
-                        "answer": answer,
-                        "hash_prefix": q.get("hash_prefix"),
-                        "include": include,
-                    }
-                )
+                if q.get("near_duplicates"):
+                    st.caption(
+                        "근사 중복: "
+                        + ", ".join(
+                            f"QID {n['question_id']} (≈{n['jaccard']:.2f})"
+                            for n in q["near_duplicates"]
+                        )
+                    )
+                # 프리뷰 원본과 달라진 필드만 전송
+                edit = {
+                    k: v
+                    for k, v in (
+                        ("title", title),
+                        ("question", question),
+                        ("answer", answer),
+                    )
+                    if v != q.get(k, "")
+                }
+                if not include:
+                    edit["include"] = False
+                if edit:
+                    edits.append({"index": idx - 1, **edit})
 
         st.divider()
-        if st.button("✅ 저장(Commit) 실행"):
-            if not st.session_state.raw_text:
-                st.error("원본 raw_text가 없습니다. 프리뷰를 다시 실행해주세요.")
+        versioning = st.checkbox(
+            "버전 관리 모드 (같은 파일명의 이전 버전과 비교해 변경분만 임베딩)",
+            value=False,
+        )
+        committing = st.session_state.commit_job is not None
+        if st.button("✅ 저장(Commit) 실행", disabled=committing):
+            if not prev.get("preview_token"):
+                st.error("프리뷰 토큰이 없습니다. 프리뷰를 다시 실행해주세요.")
             else:
                 payload = {
-                    "document": {
-                        "filename": st.session_state.file_name or dc["filename"],
-                        "content_hash": dc["content_hash"],
-                        "raw_text": st.session_state.raw_text,  # 최초 저장이면 필요
-                    },
+                    "preview_token": prev["preview_token"],
+                    "edits": edits,
                     "meta": {
                         "company": meta_company or "Unknown Company",
                         "job": meta_job or "Unknown Job",
                         "year": int(meta_year) if meta_year else None,
                     },
-                    "questions": edited_questions,
+                    "versioning": versioning,
+                }
+                # 긴 커밋(임베딩 포함)은 백그라운드에서 → 아래 fragment가 1초마다 상태 확인
+                st.session_state.commit_job = {
+                    "future": commit_md_async(payload),
+                    "started": time.monotonic(),
                 }
+                st.session_state.commit_result = None
+
+        @st.fragment(run_every=1.0)
+        def commit_status():
+            job = st.session_state.commit_job
+            if job is not None:
+                if not job["future"].done():
+                    st.info(f"저장 중... ({time.monotonic() - job['started']:.0f}초)")
+                    return
+                st.session_state.commit_job = None
                 try:
-                    with st.spinner("저장 중..."):
-                        res = commit_md(payload)
-                    st.success("저장 완료!")
-                    st.json(res)
+                    st.session_state.commit_result = ("ok", job["future"].result())
+                    # 코퍼스가 바뀌었고 프리뷰 세션은 소비됨
+                    cached_search.clear()
+                    cached_preview.clear()
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code == 410:
+                        cached_preview.clear()
+                        msg = "프리뷰 세션이 만료되었습니다. 프리뷰를 다시 실행해주세요."
+                    else:
+                        msg = f"커밋 실패: {e}"
+                    st.session_state.commit_result = ("error", msg)
                 except Exception as e:
-                    st.error(f"커밋 실패: {e}")
+                    st.session_state.commit_result = ("error", f"커밋 실패: {e}")
+                st.rerun()  # 저장 버튼 활성화
+            result = st.session_state.commit_result
+            if result is not None:
+                kind, body = result
+                if kind == "ok":
+                    st.success("저장 완료!")
+                    st.json(body)
+                else:
+                    st.error(body)
+
+        commit_status()
 
     # -----------------------------
     # B. (선택) 문항/답변 텍스트 직접 업로드 & 임베딩
@@ -215,6 +294,7 @@ with tabs[0]:
                         title or None,
                         int(year) if year else None,
                     )
+                    cached_search.clear()
                     st.success(
                         f"업로드 완료! question_id={res['question_id']}, chunks={res['chunks']}, model={res['model']}"
                     )
@@ -246,19 +326,22 @@ with tabs[1]:
             "최대 연도", min_value=1990, max_value=2100, value=2030, step=1
         )
 
+    collapse = st.checkbox("중복 답변 묶기 (클러스터당 1건)", value=False)
+
     if st.button("검색"):
         if not q.strip():
             st.warning("검색어를 입력하세요.")
         else:
             with st.spinner("검색 중..."):
                 try:
-                    res = search(
-                        q,
-                        top_k=int(top_k),
-                        company=f_company or None,
-                        job=f_job or None,
-                        year_min=int(year_min) if year_min else None,
-                        year_max=int(year_max) if year_max else None,
+                    res = cached_search(
+                        q.strip(),
+                        int(top_k),
+                        f_company or None,
+                        f_job or None,
+                        int(year_min) if year_min else None,
+                        int(year_max) if year_max else None,
+                        collapse,
                     )
                     st.session_state.search_results = res.get("hits", [])
                     st.session_state.last_query = q
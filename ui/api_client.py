@@ -1,12 +1,67 @@
 # ui/api_client.py
+"""
+jargis API 클라이언트 (Streamlit UI용).
+
+- 프로세스당 httpx.Client 1개를 재사용 → keep-alive로 매 호출 TCP/TLS 연결을 새로 만들지 않는다.
+  (Streamlit은 위젯 조작마다 스크립트를 다시 실행하지만 import된 모듈은 유지된다)
+- h2 패키지가 있으면 HTTP/2 (API 앞단 프록시가 h2를 지원할 때 다중화), 없으면 HTTP/1.1
+- 오래 걸리는 커밋은 commit_md_async()로 백그라운드 스레드에서 실행 → Future를 폴링
+"""
 import os
-import requests
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import httpx
 
 API_BASE = os.getenv("JARGIS_API_BASE", "http://127.0.0.1:8000")
+TENANT = os.getenv("JARGIS_TENANT")  # 모든 요청에 X-Tenant로 붙인다 (없으면 서버 기본 테넌트)
+
+try:  # 있으면 검색 응답을 MessagePack으로 받는다 (본문 작고 디코드 빠름)
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:  # 선택 의존성: httpx[http2]
+    import h2  # noqa: F401
+
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+SEARCH_HEADERS = {"Accept": "application/x-msgpack, application/json"} if msgpack else {}
+
+# 호출별 타임아웃은 요청마다 지정, 연결 수립은 짧게
+_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=8, keepalive_expiry=60.0)
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="jargis-commit")
+
+
+def client() -> httpx.Client:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    base_url=API_BASE,
+                    http2=HTTP2,
+                    timeout=_TIMEOUT,
+                    limits=_LIMITS,
+                    headers={"X-Tenant": TENANT} if TENANT else None,
+                )
+    return _client
+
+
+def _decode(r: httpx.Response):
+    if r.headers.get("content-type", "").startswith("application/x-msgpack"):
+        return msgpack.unpackb(r.content, raw=False)
+    return r.json()
 
 
 def healthz():
-    r = requests.get(f"{API_BASE}/healthz", timeout=10)
+    r = client().get("/healthz", timeout=10)
     r.raise_for_status()
     return r.json()
 
@@ -25,7 +80,7 @@ def upload(
         "title": title or None,
         "year": year if year else None,
     }
-    r = requests.post(f"{API_BASE}/upload", json=payload, timeout=60)
+    r = client().post("/upload", json=payload, timeout=60)
     r.raise_for_status()
     return r.json()
 
@@ -37,6 +92,8 @@ def search(
     job: str | None = None,
     year_min: int | None = None,
     year_max: int | None = None,
+    mode: str = "chunk",
+    collapse: bool = False,
 ):
     payload = {
         "query": query,
@@ -45,36 +102,69 @@ def search(
         "job": job or None,
         "year_min": year_min,
         "year_max": year_max,
+        "mode": mode,
+        "collapse": collapse,
     }
-    r = requests.post(f"{API_BASE}/search", json=payload, timeout=30)
+    r = client().post("/search", json=payload, headers=SEARCH_HEADERS, timeout=30)
     r.raise_for_status()
-    return r.json()
+    return _decode(r)
+
+
+def search_batch(queries: list[dict]):
+    """queries: search()와 같은 키를 가진 dict 목록 (최대 256개)."""
+    r = client().post(
+        "/search/batch",
+        json={"queries": queries},
+        headers=SEARCH_HEADERS,
+        timeout=120,
+    )
+    r.raise_for_status()
+    return _decode(r)
+
+
+def similar(question_id: int, top_k: int = 5, pooling: str = "mean", **filters):
+    params = {"top_k": top_k, "pooling": pooling}
+    params.update({k: v for k, v in filters.items() if v is not None})
+    r = client().get(
+        f"/questions/{question_id}/similar",
+        params=params,
+        headers=SEARCH_HEADERS,
+        timeout=30,
+    )
+    r.raise_for_status()
+    return _decode(r)
 
 
 def draft(question_id: int, top_k: int = 3):
     payload = {"question_id": question_id, "top_k": top_k}
-    r = requests.post(f"{API_BASE}/draft", json=payload, timeout=60)
+    r = client().post("/draft", json=payload, timeout=60)
     r.raise_for_status()
     return r.json()
 
 
-def preview_md(file_path: str, hint_company=None, hint_job=None, hint_year=None):
-    files = {"file": open(file_path, "rb")}
-    data = {}
+def preview_md(
+    filename: str, data: bytes, hint_company=None, hint_job=None, hint_year=None
+):
+    """업로드된 파일 바이트를 그대로 전송 (임시 파일 없이)."""
+    files = {"file": (filename, data, "text/markdown")}
+    form = {}
     if hint_company:
-        data["hint_company"] = hint_company
+        form["hint_company"] = hint_company
     if hint_job:
-        data["hint_job"] = hint_job
+        form["hint_job"] = hint_job
     if hint_year:
-        data["hint_year"] = str(hint_year)
-    r = requests.post(
-        f"{API_BASE}/upload-md/preview", files=files, data=data, timeout=60
-    )
+        form["hint_year"] = str(hint_year)
+    r = client().post("/upload-md/preview", files=files, data=form, timeout=60)
     r.raise_for_status()
     return r.json()
 
 
 def commit_md(payload: dict):
-    r = requests.post(f"{API_BASE}/upload-md/commit", json=payload, timeout=120)
+    r = client().post("/upload-md/commit", json=payload, timeout=300)
     r.raise_for_status()
     return r.json()
+
+
+def commit_md_async(payload: dict) -> Future:
+    """커밋을 백그라운드에서 실행. UI는 Future.done()을 폴링한다."""
+    return _executor.submit(commit_md, payload)